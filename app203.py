@@ -4,13 +4,18 @@
 审核流程：社区提出 → 分级 → 专业分类 → 预算拆分 → 一线立项 → 项目部施工 → 总部运行保障协调招采/施工 → 总部督促验收
 """
 import streamlit as st
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import tempfile
 import io
 import os
 import json
+import re
+import gzip
+import base64
 import html as html_module
+from decimal import Decimal
 import urllib.request
 from datetime import datetime, date
 from functools import lru_cache
@@ -36,6 +41,28 @@ try:
 except ImportError:
     DEEPSEEK_CLIENT_AVAILABLE = False
 
+try:
+    import plotly.graph_objects as go
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# pandas 2.x 需显式开启 Copy-on-Write（3.0 起默认开启且该选项已弃用），派生列时不再需要整表 copy
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 # 图表配色：饼图用 20+ 种不重复颜色，避免多分类时颜色重复
 CHART_COLORS_PIE = [
     "#5470c6", "#91cc75", "#fac858", "#ee6666", "#73c0de",
@@ -112,6 +139,8 @@ def _ensure_db_secrets_in_env() -> None:
     "土建设施", "供配电系统", "暖通/供冷系统", "弱电系统", "供排水系统",
     "电梯系统", "其它系统", "消防系统", "安防系统"
 ]
+# 统计中不单独展示的「其它系统」写法
+其它专业_SET = frozenset({"其它系统", "其他系统"})
 
 # 下拉选项预设（用于新增/修改向导）
 OPT_所属业态 = ["独立", "护理", "其他"]
@@ -228,11 +257,11 @@ def _ensure_project_columns(df: pd.DataFrame) -> pd.DataFrame:
         "项目分级", "项目分类", "拟定承建组织", "总部重点关注项目",
         "专业", "专业分包", "项目名称", "备注说明", "拟定金额", "上传凭证",
     ]
-    out = df.copy()
-    for col in needed:
-        if col not in out.columns:
-            out[col] = "" if col not in ["序号", "拟定金额"] else 0
-    return out
+    missing = {col: ("" if col not in ("序号", "拟定金额") else 0) for col in needed if col not in df.columns}
+    if not missing:
+        return df
+    # assign 返回新表，不修改入参，也省去整表 copy
+    return df.assign(**missing)
 
 
 def _strip_empty_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -247,8 +276,8 @@ def _canonicalize_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     if df is None or df.empty:
         return df
-    out = df.copy()
-    out = _strip_empty_columns(out)
+    # _strip_empty_columns 已返回副本，无需再 copy 一次
+    out = _strip_empty_columns(df)
     if "社区" in out.columns and "园区" not in out.columns:
         out = out.rename(columns={"社区": "园区"})
     elif "社区" in out.columns and "园区" in out.columns:
@@ -275,14 +304,16 @@ def _canonicalize_df(df: pd.DataFrame) -> pd.DataFrame:
         "项目分级", "项目分类", "拟定承建组织", "总部重点关注项目",
         "专业", "专业分包", "项目名称", "备注说明", "拟定金额",
     ]
-    timeline_cols = [c for c in TIMELINE_COLS if c in out.columns]
-    extra = ["上传凭证"] if "上传凭证" in out.columns else []
-    want = base_order + timeline_cols + extra
     existing = list(out.columns)
-    ordered = [c for c in want if c in existing]
-    rest = [c for c in existing if c not in ordered]
-    out = out[ordered + rest].copy()
-    return out
+    existing_set = set(existing)
+    timeline_cols = [c for c in TIMELINE_COLS if c in existing_set]
+    extra = ["上传凭证"] if "上传凭证" in existing_set else []
+    want = base_order + timeline_cols + extra
+    ordered = [c for c in want if c in existing_set]
+    ordered_set = set(ordered)
+    rest = [c for c in existing if c not in ordered_set]
+    # 按标签列表选列：重复列名（如多个「验收」）会一并保留，reindex 遇重复标签会报错
+    return out[ordered + rest]
 
 
 def _get_next_序号(df: pd.DataFrame) -> int:
@@ -298,22 +329,34 @@ def _get_next_序号(df: pd.DataFrame) -> int:
 
 
 # ---------- 飞书推送（自定义机器人 Webhook）----------
+# 已解析到的 Webhook URL；未找到时不缓存，之后补配的 Secrets / 环境变量可即时生效
+_FEISHU_WEBHOOK_URL: str | None = None
+
+
 def _get_feishu_webhook_url() -> str | None:
-    """获取飞书 Webhook URL：Streamlit Secrets > 环境变量 FEISHU_WEBHOOK_URL。"""
+    """获取飞书 Webhook URL：Streamlit Secrets > 环境变量 FEISHU_WEBHOOK_URL。找到后缓存，避免每次推送都读取 secrets.toml。"""
+    global _FEISHU_WEBHOOK_URL
+    if _FEISHU_WEBHOOK_URL:
+        return _FEISHU_WEBHOOK_URL
+    url = None
     try:
         if hasattr(st, "secrets") and st.secrets:
             for key in ("FEISHU_WEBHOOK_URL", "feishu_webhook_url"):
                 try:
                     v = st.secrets[key]
                     if v and str(v).strip().startswith("https://"):
-                        return str(v).strip()
+                        url = str(v).strip()
+                        break
                 except (KeyError, AttributeError, TypeError):
                     continue
     except FileNotFoundError:
         pass
     except Exception:
         pass
-    return os.getenv("FEISHU_WEBHOOK_URL") or None
+    url = url or os.getenv("FEISHU_WEBHOOK_URL") or None
+    if url:
+        _FEISHU_WEBHOOK_URL = url
+    return url
 
 
 def _to_json_value(v):
@@ -530,29 +573,612 @@ def render_审核流程说明():
     st.divider()
 
 
+# 统计分析中反复作为分组键的低基数文本列
+_ANALYSIS_CATEGORY_COLS = ("园区", "所属区域", "专业", "专业分包", "专业细分", "项目分级", "总部重点关注项目")
+
+
+def _to_analysis_dtypes(sub: pd.DataFrame) -> pd.DataFrame:
+    """分组列转 category、序号压缩为整数，降低 groupby 哈希与内存开销（分组需配合 observed=True）。"""
+    conv = {
+        c: sub[c].astype("category")
+        for c in _ANALYSIS_CATEGORY_COLS
+        if c in sub.columns and not isinstance(sub[c].dtype, pd.CategoricalDtype)
+    }
+    if "序号" in sub.columns:
+        conv["序号"] = pd.to_numeric(sub["序号"], errors="coerce", downcast="integer")
+    return sub.assign(**conv) if conv else sub
+
+
+# 一级项目的分级写法：一级、1级、一级项目（另有纯数字 1）
+_一级项目_PATTERN = re.compile(r"一级|1级")
+
+
+def _按类别判断(series: pd.Series, func) -> pd.Series:
+    """低基数文本列：func 只作用于去重后的类别，再按类别编码映射回每一行（空值为 False）。"""
+    cat = series.astype("category")
+    # 末尾补一个 False，使空值编码 -1 直接取到它
+    lookup = np.append(np.asarray(func(cat.cat.categories), dtype=bool), False)
+    return pd.Series(lookup[cat.cat.codes.to_numpy()], index=series.index)
+
+
+def _一级项目_mask(分级: pd.Series) -> pd.Series:
+    """项目分级是否为一级：正则与数值判断只在去重后的取值上各做一次。"""
+    return _按类别判断(
+        分级,
+        lambda v: np.asarray(v.astype(str).str.contains(_一级项目_PATTERN, na=False))
+        | (np.asarray(pd.to_numeric(v, errors="coerce")) == 1),
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _compute_项目统计汇总(sub: pd.DataFrame) -> dict:
+    """项目统计分析中只依赖数据本身的分组汇总，按 sub 内容缓存，切换标签/展开面板时不再重算。"""
+    stats = {}
+    stats["park_stats"] = sub.groupby("园区", dropna=False, observed=True).agg(
+        项目数=("序号", "size"),
+        金额合计=("拟定金额", "sum"),
+    ).reset_index()
+    stats["park_stats"]["金额合计"] = stats["park_stats"]["金额合计"].round(2)
+
+    if "所属区域" in sub.columns:
+        region_stats = sub.groupby("所属区域", dropna=False, observed=True).agg(
+            项目数=("序号", "size"),
+            金额合计=("拟定金额", "sum"),
+            园区数=("园区", "nunique"),
+        ).reset_index()
+        region_stats = region_stats[region_stats["所属区域"] != "其他"].sort_values("项目数", ascending=False)
+        region_stats["金额合计"] = region_stats["金额合计"].round(2)
+        stats["region_stats"] = region_stats
+        # 区域×园区一次分组，选中区域时只需在这张小表上筛选
+        region_park = sub.groupby(["所属区域", "园区"], dropna=False, sort=False, observed=True).agg(
+            项目数=("序号", "size"),
+            金额合计=("拟定金额", "sum"),
+        ).reset_index()
+        region_park["金额合计"] = region_park["金额合计"].round(2)
+        stats["region_park"] = region_park
+
+    if "项目分级" in sub.columns:
+        # 映射：一级->一类，二级->二类，三级->三类
+        level_mapping = {"一级": "一类", "二级": "二类", "三级": "三类"}
+        # 分级列可能是 category，先转回 object 再映射，避免 fillna 写入新类别报错
+        分级 = sub["项目分级"].astype(object)
+        项目类别 = 分级.map(level_mapping).fillna(分级).rename("项目类别")
+        stats["level_stats"] = sub.groupby(项目类别, dropna=False, observed=True).agg(
+            项目数=("序号", "size"),
+            金额合计=("拟定金额", "sum"),
+        ).reset_index()
+
+    # 各园区分类统计：三类标记在 sub 上一次算好，再按园区单次 groupby 汇总，避免逐园区反复筛选
+    amount = sub["拟定金额"]
+    if "项目分级" in sub.columns:
+        is_level1 = _一级项目_mask(sub["项目分级"])
+    else:
+        is_level1 = pd.Series(False, index=sub.index)
+    # 总部项目：总部重点关注项目列为"是"
+    if "总部重点关注项目" in sub.columns:
+        is_hq = _按类别判断(sub["总部重点关注项目"], lambda v: v.astype(str).str.contains("是", na=False))
+    else:
+        is_hq = pd.Series(False, index=sub.index)
+    # 重大改造项目：单个 200 万以上
+    is_major = amount >= 200
+
+    # 园区编码上的加权 bincount：总额、三类门控金额与重大项目数各一次线性扫描
+    park_cat = sub["园区"].astype("category")
+    codes = park_cat.cat.codes.to_numpy()
+    keep = codes >= 0
+    codes = codes[keep]
+    n_parks = len(park_cat.cat.categories)
+    amt = np.nan_to_num(amount.to_numpy(dtype="float64"))[keep]
+    major = is_major.to_numpy()[keep]
+    weights = {
+        "一级项目金额": np.where(is_level1.to_numpy()[keep], amt, 0.0),
+        "总部项目金额": np.where(is_hq.to_numpy()[keep], amt, 0.0),
+        "重大改造项目数": major.astype("float64"),
+        "重大改造项目金额": np.where(major, amt, 0.0),
+        "总金额": amt,
+    }
+    present = np.bincount(codes, minlength=n_parks) > 0
+    sums = {k: np.bincount(codes, weights=w, minlength=n_parks)[present] for k, w in weights.items()}
+    total = sums["总金额"]
+    # 总金额为 0 的园区占比记 0
+    pct = np.divide(100.0, total, out=np.zeros_like(total), where=total > 0)
+    # 各列直接以 numpy 数组交给 DataFrame，dtype 一次确定
+    park_analysis_df = pd.DataFrame({
+        "园区": park_cat.cat.categories[present].to_numpy(dtype=object),
+        "一级项目金额": sums["一级项目金额"].round(2),
+        "一级项目占比": (sums["一级项目金额"] * pct).round(2),
+        "总部项目金额": sums["总部项目金额"].round(2),
+        "总部项目占比": (sums["总部项目金额"] * pct).round(2),
+        "重大改造项目数": sums["重大改造项目数"].astype(int),
+        "重大改造项目金额": sums["重大改造项目金额"].round(2),
+        "重大改造项目占比": (sums["重大改造项目金额"] * pct).round(2),
+        "总金额": total.round(2),
+    })
+    stats["park_analysis"] = park_analysis_df
+    return stats
+
+
+def _build_pie(labels, values, title: str, colors: list):
+    """饼图：直接把数组交给 go.Pie，省去 plotly.express 对 DataFrame 的规整与校验。"""
+    fig = go.Figure(go.Pie(
+        labels=labels,
+        values=values,
+        marker=dict(colors=colors),
+        textposition="outside",
+        textinfo="label+percent+value",
+    ))
+    fig.update_layout(title=title)
+    return fig
+
+
+def _sum_by_park_codes(parks: pd.Series, impl: np.ndarray, amount: np.ndarray) -> pd.DataFrame:
+    """按园区编码稳定排序后用 np.add.reduceat 分段求和，得到各园区实施情况（园区为空的行不计入）。"""
+    cat = parks.astype("category")
+    codes = cat.cat.codes.to_numpy()
+    keep = np.flatnonzero(codes >= 0)
+    cols = ["园区", "总项目数", "已实施数", "未实施数", "总金额", "已实施金额", "实施率"]
+    if keep.size == 0:
+        return pd.DataFrame(columns=cols)
+    order = keep[np.argsort(codes[keep], kind="stable")]
+    c_sorted = codes[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(c_sorted)) + 1]
+    impl_sorted = impl[order]
+    amt_sorted = amount[order]
+    总项目数 = np.diff(np.r_[starts, c_sorted.size])
+    已实施数 = np.add.reduceat(impl_sorted.astype(np.int64), starts)
+    总金额 = np.add.reduceat(amt_sorted, starts)
+    已实施金额 = np.add.reduceat(np.where(impl_sorted, amt_sorted, 0.0), starts)
+    return pd.DataFrame({
+        "园区": cat.cat.categories[c_sorted[starts]],
+        "总项目数": 总项目数,
+        "已实施数": 已实施数,
+        "未实施数": 总项目数 - 已实施数,
+        "总金额": 总金额.round(2),
+        "已实施金额": 已实施金额.round(2),
+        "实施率": (已实施数 / 总项目数 * 100).round(1),
+    }, columns=cols)
+
+
+@lru_cache(maxsize=32)
+def _find_timeline_cols(columns: tuple) -> tuple:
+    """按列名元组查找「实施」列与「立项」列，返回 (impl_col, 立项_col)，找不到为 None。"""
+    impl_col = 立项_col = None
+    for col in columns:
+        c = str(col).strip()
+        if impl_col is None and "实施" in c and "时间" not in c.lower():
+            impl_col = col
+        # 需求立项/项目立项/立项日期等均含「立项」，排除审核、决策、成本等其他节点
+        if 立项_col is None and "立项" in c and not any(x in c for x in ("审核", "决策", "成本")):
+            立项_col = col
+    return impl_col, 立项_col
+
+
+def _正值标签(values, suffix: str = "", empty=None, rounding: bool = False) -> list:
+    """柱/点文本标签：正值显示为整数（默认截断，rounding=True 时四舍五入）+ 后缀，其余为 empty；整列一次格式化。"""
+    v = np.nan_to_num(np.asarray(values, dtype="float64"))
+    ints = (np.round(v) if rounding else np.trunc(v)).astype(np.int64)
+    return np.where(v > 0, np.char.add(ints.astype(str), suffix), empty).tolist()
+
+
+# 各园区分类项目统计表的列顺序（图表缓存按行元组传入）
+_PARK_ANALYSIS_COLS = [
+    "园区", "一级项目金额", "一级项目占比", "总部项目金额", "总部项目占比",
+    "重大改造项目数", "重大改造项目金额", "重大改造项目占比", "总金额",
+]
+
+
+@st.cache_data(show_spinner=False)
+def _build_park_analysis_figs(records: tuple) -> tuple:
+    """各园区分类统计的整合图与对数刻度金额图，只依赖汇总表，按行元组缓存 figure dict。"""
+    # 按总金额排序，确保图表顺序一致
+    park_analysis_df_sorted = pd.DataFrame(list(records), columns=_PARK_ANALYSIS_COLS).sort_values("总金额", ascending=False)
+    # 各列只取一次 numpy 数组，所有 trace 直接引用
+    parks = park_analysis_df_sorted["园区"].to_numpy()
+    lvl1_amt = park_analysis_df_sorted["一级项目金额"].to_numpy()
+    lvl1_pct = park_analysis_df_sorted["一级项目占比"].to_numpy()
+    hq_amt = park_analysis_df_sorted["总部项目金额"].to_numpy()
+    hq_pct = park_analysis_df_sorted["总部项目占比"].to_numpy()
+    major_n = park_analysis_df_sorted["重大改造项目数"].to_numpy()
+    major_amt = park_analysis_df_sorted["重大改造项目金额"].to_numpy()
+    major_pct = park_analysis_df_sorted["重大改造项目占比"].to_numpy()
+    total_amt = park_analysis_df_sorted["总金额"].to_numpy()
+
+    # 创建单一图表，使用三Y轴（左Y轴：金额，中Y轴：项目数，右Y轴：占比）
+    fig = go.Figure()
+
+    # 左Y轴：金额（柱状图）
+    # 1. 一级项目金额
+    fig.add_trace(
+        go.Bar(
+            x=parks,
+            y=lvl1_amt,
+            name="一级项目金额（万元）",
+            marker=dict(
+                color="#5470c6",
+                line=dict(color="#3a5a9c", width=1)
+            ),
+            text=_正值标签(lvl1_amt, "万"),
+            textposition="outside",
+            textfont=dict(size=12, color="#5470c6"),
+            hovertemplate="<b>%{x}</b><br>一级项目金额: %{y:,.0f} 万元<extra></extra>",
+            yaxis="y",
+            cliponaxis=False
+        )
+    )
+
+    # 2. 总部项目金额
+    fig.add_trace(
+        go.Bar(
+            x=parks,
+            y=hq_amt,
+            name="总部项目金额（万元）",
+            marker=dict(
+                color="#91cc75",
+                line=dict(color="#6fa85a", width=1)
+            ),
+            text=_正值标签(hq_amt, "万"),
+            textposition="outside",
+            textfont=dict(size=12, color="#91cc75"),
+            hovertemplate="<b>%{x}</b><br>总部项目金额: %{y:,.0f} 万元<extra></extra>",
+            yaxis="y",
+            cliponaxis=False
+        )
+    )
+
+    # 3. 重大改造项目金额
+    fig.add_trace(
+        go.Bar(
+            x=parks,
+            y=major_amt,
+            name="重大改造项目金额（万元）",
+            marker=dict(
+                color="#fac858",
+                line=dict(color="#d4a84a", width=1)
+            ),
+            text=_正值标签(major_amt, "万"),
+            textposition="outside",
+            textfont=dict(size=12, color="#d4a84a"),
+            hovertemplate="<b>%{x}</b><br>重大改造项目金额: %{y:,.0f} 万元<extra></extra>",
+            yaxis="y",
+            cliponaxis=False
+        )
+    )
+
+    # 中Y轴：项目数量（使用独立的Y轴，避免缩放）
+    max_amount = max(lvl1_amt.max(initial=0), hq_amt.max(initial=0), major_amt.max(initial=0))
+    max_count = major_n.max(initial=0)
+    # 计算缩放因子，使项目数在视觉上与金额协调
+    if max_count > 0 and max_amount > 0:
+        scale_factor = max_amount / (max_count * 50)  # 调整缩放比例
+    else:
+        scale_factor = 1
+    scaled_count = major_n * scale_factor
+
+    # 4. 重大改造项目数量
+    fig.add_trace(
+        go.Bar(
+            x=parks,
+            y=scaled_count,
+            name="重大改造项目数（个）",
+            marker=dict(
+                color="#73c0de",
+                line=dict(color="#4a9bc0", width=1.5)
+            ),
+            text=_正值标签(major_n, "个"),
+            textposition="inside",
+            textfont=dict(size=11, color="#ffffff"),
+            customdata=np.column_stack((major_n, major_amt)),
+            hovertemplate="<b>%{x}</b><br>重大改造项目数: %{customdata[0]:.0f} 个<br>重大改造项目金额: %{customdata[1]:,.0f} 万元<extra></extra>",
+            yaxis="y",
+            opacity=0.85,
+            cliponaxis=False
+        )
+    )
+
+    # 右Y轴：占比（折线图）
+    # 5. 一级项目占比
+    fig.add_trace(
+        go.Scatter(
+            x=parks,
+            y=lvl1_pct,
+            name="一级项目占比（%）",
+            mode="lines+markers",
+            marker=dict(
+                color="#ee6666",
+                size=10,
+                line=dict(width=2, color="white"),
+                symbol="circle"
+            ),
+            line=dict(color="#ee6666", width=3),
+            text=_正值标签(lvl1_pct, "%", rounding=True),
+            textposition="top center",
+            textfont=dict(size=11, color="#ee6666"),
+            customdata=lvl1_amt,
+            hovertemplate="<b>%{x}</b><br>一级项目占比: %{y:.1f}%<br>一级项目金额: %{customdata:,.0f} 万元<extra></extra>",
+            yaxis="y2",
+            cliponaxis=False
+        )
+    )
+
+    # 6. 总部项目占比
+    fig.add_trace(
+        go.Scatter(
+            x=parks,
+            y=hq_pct,
+            name="总部项目占比（%）",
+            mode="lines+markers",
+            marker=dict(
+                color="#ff9800",
+                size=10,
+                line=dict(width=2, color="white"),
+                symbol="square"
+            ),
+            line=dict(color="#ff9800", width=3, dash="dash"),
+            text=_正值标签(hq_pct, "%", rounding=True),
+            textposition="top center",
+            textfont=dict(size=11, color="#ff9800"),
+            customdata=hq_amt,
+            hovertemplate="<b>%{x}</b><br>总部项目占比: %{y:.1f}%<br>总部项目金额: %{customdata:,.0f} 万元<extra></extra>",
+            yaxis="y2",
+            cliponaxis=False
+        )
+    )
+
+    # 7. 重大改造项目占比
+    fig.add_trace(
+        go.Scatter(
+            x=parks,
+            y=major_pct,
+            name="重大改造项目占比（%）",
+            mode="lines+markers",
+            marker=dict(
+                color="#9c27b0",
+                size=10,
+                line=dict(width=2, color="white"),
+                symbol="diamond"
+            ),
+            line=dict(color="#9c27b0", width=3, dash="dot"),
+            text=_正值标签(major_pct, "%", rounding=True),
+            textposition="top center",
+            textfont=dict(size=11, color="#9c27b0"),
+            customdata=major_amt,
+            hovertemplate="<b>%{x}</b><br>重大改造项目占比: %{y:.1f}%<br>重大改造项目金额: %{customdata:,.0f} 万元<extra></extra>",
+            yaxis="y2",
+            cliponaxis=False
+        )
+    )
+
+    # 更新X轴
+    fig.update_xaxes(
+        tickangle=-45,
+        tickfont=dict(size=11),
+        title_text="园区",
+        title_font=dict(size=13, color="#333"),
+        showgrid=True,
+        gridcolor="rgba(200,200,200,0.3)",
+        gridwidth=1,
+        showline=True,
+        linecolor="#ccc",
+        linewidth=1
+    )
+
+    # 更新左Y轴（金额）
+    fig.update_yaxes(
+        title_text="金额（万元）",
+        title_font=dict(size=13, color="#333"),
+        tickfont=dict(size=11),
+        side="left",
+        showgrid=True,
+        gridcolor="rgba(200,200,200,0.3)",
+        gridwidth=1,
+        showline=True,
+        linecolor="#5470c6",
+        linewidth=2,
+        zeroline=True,
+        zerolinecolor="rgba(200,200,200,0.5)",
+        zerolinewidth=1
+    )
+
+    # 更新右Y轴（占比）
+    fig.update_yaxes(
+        title_text="占比（%）",
+        title_font=dict(size=13, color="#333"),
+        tickfont=dict(size=11),
+        side="right",
+        overlaying="y",
+        range=[0, 105],
+        showgrid=False,
+        showline=True,
+        linecolor="#ee6666",
+        linewidth=2
+    )
+
+    # 更新整体布局
+    fig.update_layout(
+        height=700,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.18,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=11),
+            bgcolor="rgba(255,255,255,0.95)",
+            bordercolor="rgba(0,0,0,0.3)",
+            borderwidth=1,
+            itemwidth=30
+        ),
+        title=dict(
+            text="<b>各园区分类项目统计（金额、项目数与占比）</b>",
+            x=0.5,
+            xanchor="center",
+            y=0.97,
+            yanchor="top",
+            font=dict(size=18, family="Arial, sans-serif", color="#1f4788")
+        ),
+        margin=dict(t=100, b=160, l=90, r=90),
+        plot_bgcolor="rgba(255,255,255,1)",
+        paper_bgcolor="white",
+        barmode="group",
+        bargap=0.15,
+        bargroupgap=0.1,
+        hovermode="x unified",
+        hoverlabel=dict(
+            bgcolor="rgba(255,255,255,0.95)",
+            bordercolor="#333",
+            font_size=12,
+            font_family="Arial"
+        )
+    )
+
+
+    # 金额统计图：分组柱状图，使用对数刻度以保证小金额园区的可见性
+    fig_amount = go.Figure()
+
+    # 分组柱状图：一级项目金额、总部项目金额、重大改造项目金额
+    fig_amount.add_trace(
+        go.Bar(
+            x=parks,
+            y=lvl1_amt,
+            name="一级项目金额（万元）",
+            marker=dict(color="#5470c6", line=dict(color="#3a5a9c", width=1)),
+            text=_正值标签(lvl1_amt, empty=""),
+            textposition="outside",
+            textfont=dict(size=9, color="#5470c6"),
+            hovertemplate="<b>%{x}</b><br>一级项目金额: %{y:,.0f} 万元<extra></extra>"
+        )
+    )
+
+    fig_amount.add_trace(
+        go.Bar(
+            x=parks,
+            y=hq_amt,
+            name="总部项目金额（万元）",
+            marker=dict(color="#91cc75", line=dict(color="#6fa85a", width=1)),
+            text=_正值标签(hq_amt, empty=""),
+            textposition="outside",
+            textfont=dict(size=9, color="#91cc75"),
+            hovertemplate="<b>%{x}</b><br>总部项目金额: %{y:,.0f} 万元<extra></extra>"
+        )
+    )
+
+    fig_amount.add_trace(
+        go.Bar(
+            x=parks,
+            y=major_amt,
+            name="重大改造项目金额（万元）",
+            marker=dict(color="#fac858", line=dict(color="#d4a84a", width=1)),
+            text=_正值标签(major_amt, empty=""),
+            textposition="outside",
+            textfont=dict(size=9, color="#d4a84a"),
+            hovertemplate="<b>%{x}</b><br>重大改造项目金额: %{y:,.0f} 万元<extra></extra>"
+        )
+    )
+
+    fig_amount.update_xaxes(
+        tickangle=-45,
+        tickfont=dict(size=11),
+        title_text="园区",
+        title_font=dict(size=13, color="#333"),
+        showgrid=True,
+        gridcolor="rgba(200,200,200,0.3)"
+    )
+
+    # 计算Y轴范围，使用对数刻度以保证小金额园区的可见性
+    import math
+    max_amount = total_amt.max(initial=0)
+    # 无正值时取 nan，走下方不生成刻度的分支
+    min_amount = total_amt[total_amt > 0].min(initial=math.inf)
+    if math.isinf(min_amount):
+        min_amount = math.nan
+
+    # 生成对数刻度的不均匀标签
+    if max_amount > 0 and min_amount > 0 and not math.isnan(min_amount) and max_amount > min_amount * 2:
+        # 计算对数范围
+        log_min = math.log10(max(1, min_amount))  # 确保最小值至少为1
+        log_max = math.log10(max_amount)
+
+        # 生成主要刻度：1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000等
+        exps = np.arange(int(math.floor(log_min)), int(math.ceil(log_max)) + 1)
+        vals = (np.array([1, 2, 5], dtype=np.int64)[None, :] * (10 ** exps)[:, None]).ravel()
+        vals = np.unique(vals[(vals >= max(1, min_amount * 0.5)) & (vals <= max_amount * 1.5)])
+        # 刻度均为 1000 的整数倍时 val/1000 为整数，"{:.1f}" 即整数加 ".0"
+        tick_texts = np.where(
+            vals >= 1000,
+            np.char.add((vals // 1000).astype(str), ".0千"),
+            vals.astype(str),
+        ).tolist()
+        tick_vals = vals.tolist()
+    else:
+        tick_vals = None
+        tick_texts = None
+
+    fig_amount.update_yaxes(
+        title_text="金额（万元，对数刻度）",
+        title_font=dict(size=13, color="#333"),
+        tickfont=dict(size=10),
+        showgrid=True,
+        gridcolor="rgba(200,200,200,0.3)",
+        type="log",  # 使用对数刻度
+        tickvals=tick_vals if tick_vals else None,
+        ticktext=tick_texts if tick_texts else None,
+        dtick=1  # 对数刻度的步长
+    )
+
+    fig_amount.update_layout(
+        height=600,
+        barmode="group",  # 使用分组模式，支持对数刻度
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.15,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=11)
+        ),
+        title=dict(
+            text="<b>各园区分类项目金额统计（对数刻度，保证小金额园区可见性）</b>",
+            x=0.5,
+            xanchor="center",
+            y=0.97,
+            yanchor="top",
+            font=dict(size=16, color="#1f4788")
+        ),
+        margin=dict(t=80, b=140, l=80, r=40),
+        plot_bgcolor="rgba(255,255,255,1)",
+        paper_bgcolor="white",
+        hovermode="x unified"
+    )
+
+    return fig.to_dict(), fig_amount.to_dict()
+
+
+def _render_区域园区明细(region_park: pd.DataFrame, regions, key: str):
+    """区域下园区明细：下拉选择一个区域，只渲染该区域的园区表。"""
+    if len(regions) == 0:
+        return
+    region = st.selectbox("查看区域详情", options=list(regions), key=key)
+    parks_in_region = (
+        region_park[region_park["所属区域"] == region]
+        .drop(columns="所属区域")
+        .reset_index(drop=True)
+        .sort_values("项目数", ascending=False)
+    )
+    parks_in_region["金额合计"] = parks_in_region["金额合计"].round(2)
+    st.markdown(f"📌 **{region}**（{len(parks_in_region)}个园区，{int(parks_in_region['项目数'].sum())}个项目，{parks_in_region['金额合计'].sum():,.0f}万元）")
+    st.dataframe(parks_in_region, use_container_width=True, hide_index=True)
+
+
 def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
     """项目统计分析：数量费用统计、预算差值、确定/未确定项目分析、按月份统计立项。"""
     st.subheader("项目统计分析")
-    # 处理园区选择：如果为空或None，显示所有有园区信息的数据
-    if 园区选择 and len(园区选择) > 0:
-        valid_parks = [p for p in 园区选择 if p and pd.notna(p)]
-        if valid_parks:
-            sub = df[df["园区"].isin(valid_parks)]
-        else:
-            sub = df[df["园区"].notna()]
-    else:
-        sub = df[df["园区"].notna()]  # 只显示有园区信息的行
-    
-    # 过滤掉汇总行（序号为空或为"合计"等）
-    if "序号" in sub.columns:
-        sub = sub[sub["序号"].notna()]
-        # 过滤掉合计行
-        sub = sub[~sub["序号"].astype(str).str.strip().isin(["合计", "预算系统合计", "差", "差额", "小计"])]
-        # 确保序号是数字（过滤掉非数字的序号）
-        sub = sub[pd.to_numeric(sub["序号"], errors='coerce').notna()]
-    else:
+    if "序号" not in df.columns:
         st.warning("数据中未找到'序号'列，无法进行统计分析。")
         return
+    # 按园区筛选并过滤汇总行，与要点看板共用同一份缓存结果
+    sub = _prepare_要点分析子集(df, 园区选择)
     
     # 标签池：先选择需要分析的字段，再展示对应统计
     st.markdown("### 🔖 标签池（选择需要分析的字段）")
@@ -616,7 +1242,7 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
     selected_prof_subcontracts = []
 
     # 用于级联下钻的临时 DataFrame：每选择一层，就用该层结果作为下一层可选值的来源
-    sub_for_opts = sub.copy()
+    sub_for_opts = sub
 
     if show_region and "所属区域" in sub_for_opts.columns:
         with col_region:
@@ -815,6 +1441,11 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
         st.warning("根据当前标签筛选条件，未找到任何项目，请调整区域 / 项目分级或金额范围后重试。")
         return
 
+    sub = _to_analysis_dtypes(sub)
+
+    # 与控件无关的分组汇总按数据内容缓存（实施状态依赖当前日期，仍在下方实时计算）
+    stats = _compute_项目统计汇总(sub)
+
     # 1. 按数量和费用统计项目，计算与预算差值（只要选择了任意标签就展示整体概览）
     st.markdown("### 📊 项目数量与费用统计")
     total_count = len(sub)
@@ -869,37 +1500,18 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
     # 按园区统计（仅当在标签池中选择了“社区（园区）”时展示）
     if show_park:
         st.markdown("#### 按园区统计")
-        park_stats = sub.groupby("园区", dropna=False).agg(
-            项目数=("序号", "count"),
-            金额合计=("拟定金额", "sum"),
-        ).reset_index()
-        park_stats["金额合计"] = park_stats["金额合计"].round(2)
+        park_stats = stats["park_stats"]
         st.dataframe(park_stats, use_container_width=True, hide_index=True)
     
     # 按区域统计（仅当存在所属区域列且在标签池中勾选“所属区域”时展示）
     if show_region and "所属区域" in sub.columns:
         st.markdown("#### 按所属区域统计")
-        region_stats = sub.groupby("所属区域", dropna=False).agg(
-            项目数=("序号", "count"),
-            金额合计=("拟定金额", "sum"),
-            园区数=("园区", "nunique"),
-        ).reset_index()
-        region_stats = region_stats[region_stats["所属区域"] != "其他"].sort_values("项目数", ascending=False)
-        region_stats["金额合计"] = region_stats["金额合计"].round(2)
+        region_stats = stats["region_stats"]
         st.dataframe(region_stats, use_container_width=True, hide_index=True)
         
         # 区域下各园区明细
         st.markdown("##### 各区域下园区明细")
-        for region in region_stats["所属区域"].unique():
-            region_df = sub[sub["所属区域"] == region]
-            parks_in_region = region_df.groupby("园区", dropna=False).agg(
-                项目数=("序号", "count"),
-                金额合计=("拟定金额", "sum"),
-            ).reset_index().sort_values("项目数", ascending=False)
-            parks_in_region["金额合计"] = parks_in_region["金额合计"].round(2)
-            
-            with st.expander(f"📌 {region}（{len(parks_in_region)}个园区，{int(parks_in_region['项目数'].sum())}个项目，{parks_in_region['金额合计'].sum():,.0f}万元）"):
-                st.dataframe(parks_in_region, use_container_width=True, hide_index=True)
+        _render_区域园区明细(stats["region_park"], region_stats["所属区域"].unique(), key="stats_region_detail")
     
     st.markdown("---")
     
@@ -917,8 +1529,8 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
             st.info("当前数据的「专业分包/专业细分」为空，已自动改用「专业」进行统计。")
 
         st.markdown("### 📦 按专业分包统计" if effective_col == prof_subcontract_col else "### 📦 按专业统计（替代专业分包）")
-        by_prof_subcontract = sub.groupby(effective_col, dropna=False).agg(
-            项目数=("序号", "count"),
+        by_prof_subcontract = sub.groupby(effective_col, dropna=False, observed=True).agg(
+            项目数=("序号", "size"),
             金额合计=("拟定金额", "sum"),
         ).reset_index().sort_values("金额合计", ascending=False)
         by_prof_subcontract["金额合计"] = by_prof_subcontract["金额合计"].round(2)
@@ -934,43 +1546,39 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
             st.dataframe(by_prof_subcontract[[effective_col, "金额合计", "金额占比"]], use_container_width=True, hide_index=True)
         
         # 显示图表
-        try:
-            import plotly.express as px
+        if PLOTLY_AVAILABLE:
+            pie_labels = by_prof_subcontract[effective_col].to_numpy()
+            pie_colors = CHART_COLORS_PIE[:len(by_prof_subcontract)]
             col1, col2 = st.columns(2)
             with col1:
-                fig = px.pie(
-                    by_prof_subcontract, 
-                    values="项目数", 
-                    names=effective_col,
-                    title="专业分包项目数占比" if effective_col == prof_subcontract_col else "专业项目数占比",
-                    color_discrete_sequence=CHART_COLORS_PIE[:len(by_prof_subcontract)]
+                fig = _build_pie(
+                    pie_labels,
+                    by_prof_subcontract["项目数"].to_numpy(),
+                    "专业分包项目数占比" if effective_col == prof_subcontract_col else "专业项目数占比",
+                    pie_colors,
                 )
-                fig.update_traces(textposition="outside", textinfo="label+percent+value")
                 st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
             with col2:
-                fig = px.pie(
-                    by_prof_subcontract, 
-                    values="金额合计", 
-                    names=effective_col,
-                    title="专业分包金额占比" if effective_col == prof_subcontract_col else "专业金额占比",
-                    color_discrete_sequence=CHART_COLORS_PIE[:len(by_prof_subcontract)]
+                fig = _build_pie(
+                    pie_labels,
+                    by_prof_subcontract["金额合计"].to_numpy(),
+                    "专业分包金额占比" if effective_col == prof_subcontract_col else "专业金额占比",
+                    pie_colors,
                 )
-                fig.update_traces(textposition="outside", textinfo="label+percent+value")
                 st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
             
             # 专业与专业分包的交叉统计（仅当确实存在可用的专业分包/细分时展示）
             if effective_col == prof_subcontract_col and "专业" in sub.columns:
                 st.markdown("#### 专业与专业分包交叉统计")
-                cross_stats = sub.groupby(["专业", prof_subcontract_col], dropna=False).agg(
-                    项目数=("序号", "count"),
+                # 先过滤掉"其它系统"再分组，这些组不再参与哈希
+                cross_stats = sub[~sub["专业"].isin(其它专业_SET)].groupby(
+                    ["专业", prof_subcontract_col], dropna=False, observed=True
+                ).agg(
+                    项目数=("序号", "size"),
                     金额合计=("拟定金额", "sum"),
                 ).reset_index().sort_values("金额合计", ascending=False)
-                # 过滤掉"其它系统"分类
-                cross_stats = cross_stats[~cross_stats["专业"].isin(["其它系统", "其他系统"])]
                 cross_stats["金额合计"] = cross_stats["金额合计"].round(2)
                 st.dataframe(cross_stats, use_container_width=True, hide_index=True)
-        except ImportError:
-            pass
     
     st.markdown("---")
     
@@ -978,15 +1586,7 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
     if show_level_stats:
         st.markdown("### 📈 项目分级占比统计")
     if show_level_stats and "项目分级" in sub.columns:
-        # 映射：一级->一类，二级->二类，三级->三类
-        level_mapping = {"一级": "一类", "二级": "二类", "三级": "三类"}
-        sub_copy = sub.copy()
-        sub_copy["项目类别"] = sub_copy["项目分级"].map(level_mapping).fillna(sub_copy["项目分级"])
-        
-        level_stats = sub_copy.groupby("项目类别", dropna=False).agg(
-            项目数=("序号", "count"),
-            金额合计=("拟定金额", "sum"),
-        ).reset_index()
+        level_stats = stats["level_stats"]
         
         total_projects = level_stats["项目数"].sum()
         total_amount_level = level_stats["金额合计"].sum()
@@ -1005,27 +1605,16 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
                 st.dataframe(level_stats[["项目类别", "金额合计", "金额占比"]], use_container_width=True, hide_index=True)
             
             # 显示饼图
-            try:
-                import plotly.express as px
+            if PLOTLY_AVAILABLE:
+                level_labels = level_stats["项目类别"].to_numpy()
+                level_colors = ["#FF6B6B", "#4ECDC4", "#45B7D1"]
                 col1, col2 = st.columns(2)
                 with col1:
-                    fig = px.pie(
-                        level_stats, values="项目数", names="项目类别",
-                        title="项目数量占比",
-                        color_discrete_sequence=["#FF6B6B", "#4ECDC4", "#45B7D1"]
-                    )
-                    fig.update_traces(textposition="outside", textinfo="label+percent+value")
+                    fig = _build_pie(level_labels, level_stats["项目数"].to_numpy(), "项目数量占比", level_colors)
                     st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
                 with col2:
-                    fig = px.pie(
-                        level_stats, values="金额合计", names="项目类别",
-                        title="项目金额占比",
-                        color_discrete_sequence=["#FF6B6B", "#4ECDC4", "#45B7D1"]
-                    )
-                    fig.update_traces(textposition="outside", textinfo="label+percent+value")
+                    fig = _build_pie(level_labels, level_stats["金额合计"].to_numpy(), "项目金额占比", level_colors)
                     st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-            except ImportError:
-                pass
         else:
             st.info("暂无项目分级数据。")
     else:
@@ -1035,55 +1624,18 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
     
     # 3. 是否已实施判断
     st.markdown("### 🔧 项目实施状态分析")
-    impl_col = None
-    for col in sub.columns:
-        col_str = str(col).strip()
-        if "实施" in col_str and "时间" not in col_str.lower():
-            impl_col = col
-            break
+    impl_col, 立项_col = _find_timeline_cols(tuple(sub.columns))
     
     if impl_col:
-        # 解析实施日期
-        def parse_impl_date(series):
-            """解析实施日期，支持Excel日期序列号、datetime、字符串格式"""
-            result = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
-            
-            if pd.api.types.is_datetime64_any_dtype(series):
-                result = pd.to_datetime(series, errors='coerce')
-                result = result.mask(result.dt.year == 1900, pd.NaT)
-                return result
-            
-            numeric = pd.to_numeric(series, errors='coerce')
-            excel_mask = pd.Series(False, index=series.index)
-            if numeric.notna().any():
-                excel_mask = (numeric >= 1) & (numeric <= 100000) & numeric.notna()
-                if excel_mask.any():
-                    result.loc[excel_mask] = pd.to_datetime(
-                        numeric[excel_mask].astype(int),
-                        unit='D',
-                        origin='1899-12-30'
-                    )
-                    result = result.mask(result.dt.year == 1900, pd.NaT)
-            
-            str_mask = ~excel_mask & result.isna()
-            if str_mask.any():
-                str_series = series[str_mask].astype(str).str.strip()
-                str_series = str_series.replace(['', 'nan', 'None', 'NaT'], pd.NA)
-                str_mask2 = ~str_series.str.startswith('1900', na=False)
-                str_parse = pd.to_datetime(str_series[str_mask2], format='mixed', errors='coerce')
-                result.loc[str_mask] = str_parse
-            
-            return result
-        
-        sub_copy = sub.copy()
-        sub_copy["_实施日期_parsed"] = parse_impl_date(sub_copy[impl_col])
+        实施日期 = _parse_timeline_dates_cached(sub[impl_col])
         
         # 获取当前时间
         current_time = datetime.now()
-        sub_copy["已实施"] = sub_copy["_实施日期_parsed"].notna() & (sub_copy["_实施日期_parsed"] <= pd.Timestamp(current_time))
+        # numpy 中 NaT 与任何日期比较均为 False，一次比较即可，无需再与 notna 相与
+        已实施 = 实施日期.to_numpy() <= np.datetime64(current_time, "ns")
         
-        已实施项目 = sub_copy[sub_copy["已实施"]]
-        未实施项目 = sub_copy[~sub_copy["已实施"]]
+        已实施项目 = sub[已实施]
+        未实施项目 = sub[~已实施]
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1093,7 +1645,7 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
             st.metric("未实施项目数", len(未实施项目))
             st.metric("未实施金额（万元）", f"{未实施项目['拟定金额'].sum():,.0f}" if len(未实施项目) > 0 else "0")
         with col3:
-            total_impl = len(sub_copy)
+            total_impl = len(sub)
             if total_impl > 0:
                 impl_rate = len(已实施项目) / total_impl * 100
                 st.metric("实施率", f"{impl_rate:.1f}%")
@@ -1102,23 +1654,8 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
         
         # 按园区统计实施情况
         st.markdown("#### 各园区实施情况统计")
-        park_impl_list = []
-        for park in sub_copy["园区"].dropna().unique():
-            park_df = sub_copy[sub_copy["园区"] == park]
-            总项目数 = len(park_df)
-            已实施数 = park_df["已实施"].sum()
-            总金额 = park_df["拟定金额"].sum()
-            已实施金额 = park_df[park_df["已实施"]]["拟定金额"].sum()
-            park_impl_list.append({
-                "园区": park,
-                "总项目数": 总项目数,
-                "已实施数": int(已实施数),
-                "未实施数": int(总项目数 - 已实施数),
-                "总金额": round(总金额, 2),
-                "已实施金额": round(已实施金额, 2),
-                "实施率": round(已实施数 / 总项目数 * 100, 1) if 总项目数 > 0 else 0,
-            })
-        park_impl_stats = pd.DataFrame(park_impl_list).sort_values("总金额", ascending=False)
+        park_impl_stats = _sum_by_park_codes(sub["园区"], 已实施, sub["拟定金额"].to_numpy(dtype="float64"))
+        park_impl_stats = park_impl_stats.sort_values("总金额", ascending=False)
         st.dataframe(park_impl_stats, use_container_width=True, hide_index=True)
     else:
         st.info("未找到实施日期列，无法进行实施状态分析。")
@@ -1128,59 +1665,7 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
     # 4. 各园区的分类统计：一级项目、总部项目、重大改造项目（200万以上）
     st.markdown("### 🏢 各园区分类项目统计")
     
-    # 准备数据
-    park_analysis = []
-    for park in sub["园区"].dropna().unique():
-        park_df = sub[sub["园区"] == park]
-        
-        # 一级项目金额（支持多种格式：一级、1级、一级项目、1等）
-        if "项目分级" in park_df.columns:
-            # 将项目分级转换为字符串并去除空格，然后匹配包含"一级"、"1级"或数字"1"的值
-            # 先尝试字符串匹配
-            一级项目_str = park_df[
-                park_df["项目分级"].astype(str).str.strip().str.contains("一级|1级", na=False, regex=True)
-            ]
-            # 再尝试数字匹配（如果是数字1）
-            try:
-                一级项目_num = park_df[pd.to_numeric(park_df["项目分级"], errors='coerce') == 1]
-            except:
-                一级项目_num = pd.DataFrame()
-            # 合并两种匹配结果
-            一级项目 = pd.concat([一级项目_str, 一级项目_num]).drop_duplicates()
-        else:
-            一级项目 = pd.DataFrame()
-        一级项目金额 = 一级项目["拟定金额"].sum() if len(一级项目) > 0 else 0
-        
-        # 总部项目金额（总部重点关注项目列为"是"的项目）
-        if "总部重点关注项目" in park_df.columns:
-            总部项目 = park_df[
-                park_df["总部重点关注项目"].astype(str).str.strip().str.contains("是", na=False, case=False)
-            ]
-        else:
-            总部项目 = pd.DataFrame()
-        总部项目金额 = 总部项目["拟定金额"].sum() if len(总部项目) > 0 else 0
-        
-        # 重大改造项目（单个200万以上）
-        重大改造项目 = park_df[park_df["拟定金额"] >= 200]
-        重大改造项目金额 = 重大改造项目["拟定金额"].sum() if len(重大改造项目) > 0 else 0
-        重大改造项目数 = len(重大改造项目)
-        
-        # 总金额
-        总金额 = park_df["拟定金额"].sum()
-        
-        park_analysis.append({
-            "园区": park,
-            "一级项目金额": round(一级项目金额, 2),
-            "一级项目占比": round(一级项目金额 / 总金额 * 100, 2) if 总金额 > 0 else 0,
-            "总部项目金额": round(总部项目金额, 2),
-            "总部项目占比": round(总部项目金额 / 总金额 * 100, 2) if 总金额 > 0 else 0,
-            "重大改造项目数": 重大改造项目数,
-            "重大改造项目金额": round(重大改造项目金额, 2),
-            "重大改造项目占比": round(重大改造项目金额 / 总金额 * 100, 2) if 总金额 > 0 else 0,
-            "总金额": round(总金额, 2),
-        })
-    
-    park_analysis_df = pd.DataFrame(park_analysis)
+    park_analysis_df = stats["park_analysis"]
     park_analysis_df = park_analysis_df.sort_values("总金额", ascending=False)
     
     st.dataframe(park_analysis_df, use_container_width=True, hide_index=True)
@@ -1204,474 +1689,35 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
     st.markdown("---")
     
     # 显示整合图表（合并到同一个坐标轴下，优化版）
-    try:
-        import plotly.graph_objects as go
-        
-        # 按总金额排序，确保图表顺序一致
-        park_analysis_df_sorted = park_analysis_df.sort_values("总金额", ascending=False)
-        
-        # 创建单一图表，使用三Y轴（左Y轴：金额，中Y轴：项目数，右Y轴：占比）
-        fig = go.Figure()
-        
-        # 左Y轴：金额（柱状图）
-        # 1. 一级项目金额
-        fig.add_trace(
-            go.Bar(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["一级项目金额"],
-                name="一级项目金额（万元）",
-                marker=dict(
-                    color="#5470c6",
-                    line=dict(color="#3a5a9c", width=1)
-                ),
-                text=park_analysis_df_sorted["一级项目金额"].apply(lambda x: f"{int(x)}万" if x > 0 else None),
-                textposition="outside",
-                textfont=dict(size=12, color="#5470c6"),
-                hovertemplate="<b>%{x}</b><br>一级项目金额: %{y:,.0f} 万元<extra></extra>",
-                yaxis="y",
-                cliponaxis=False
-            )
-        )
-        
-        # 2. 总部项目金额
-        fig.add_trace(
-            go.Bar(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["总部项目金额"],
-                name="总部项目金额（万元）",
-                marker=dict(
-                    color="#91cc75",
-                    line=dict(color="#6fa85a", width=1)
-                ),
-                text=park_analysis_df_sorted["总部项目金额"].apply(lambda x: f"{int(x)}万" if x > 0 else None),
-                textposition="outside",
-                textfont=dict(size=12, color="#91cc75"),
-                hovertemplate="<b>%{x}</b><br>总部项目金额: %{y:,.0f} 万元<extra></extra>",
-                yaxis="y",
-                cliponaxis=False
-            )
-        )
-        
-        # 3. 重大改造项目金额
-        fig.add_trace(
-            go.Bar(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["重大改造项目金额"],
-                name="重大改造项目金额（万元）",
-                marker=dict(
-                    color="#fac858",
-                    line=dict(color="#d4a84a", width=1)
-                ),
-                text=park_analysis_df_sorted["重大改造项目金额"].apply(lambda x: f"{int(x)}万" if x > 0 else None),
-                textposition="outside",
-                textfont=dict(size=12, color="#d4a84a"),
-                hovertemplate="<b>%{x}</b><br>重大改造项目金额: %{y:,.0f} 万元<extra></extra>",
-                yaxis="y",
-                cliponaxis=False
-            )
-        )
-        
-        # 中Y轴：项目数量（使用独立的Y轴，避免缩放）
-        max_amount = max(
-            park_analysis_df_sorted["一级项目金额"].max(),
-            park_analysis_df_sorted["总部项目金额"].max(),
-            park_analysis_df_sorted["重大改造项目金额"].max()
-        )
-        max_count = park_analysis_df_sorted["重大改造项目数"].max()
-        # 计算缩放因子，使项目数在视觉上与金额协调
-        if max_count > 0 and max_amount > 0:
-            scale_factor = max_amount / (max_count * 50)  # 调整缩放比例
-        else:
-            scale_factor = 1
-        scaled_count = park_analysis_df_sorted["重大改造项目数"] * scale_factor
-        
-        # 4. 重大改造项目数量
-        fig.add_trace(
-            go.Bar(
-                x=park_analysis_df_sorted["园区"],
-                y=scaled_count,
-                name="重大改造项目数（个）",
-                marker=dict(
-                    color="#73c0de",
-                    line=dict(color="#4a9bc0", width=1.5)
-                ),
-                text=park_analysis_df_sorted["重大改造项目数"].apply(lambda x: f"{int(x)}个" if x > 0 else None),
-                textposition="inside",
-                textfont=dict(size=11, color="#ffffff"),
-                customdata=list(zip(
-                    park_analysis_df_sorted["重大改造项目数"],
-                    park_analysis_df_sorted["重大改造项目金额"]
-                )),
-                hovertemplate="<b>%{x}</b><br>重大改造项目数: %{customdata[0]:.0f} 个<br>重大改造项目金额: %{customdata[1]:,.0f} 万元<extra></extra>",
-                yaxis="y",
-                opacity=0.85,
-                cliponaxis=False
-            )
-        )
-        
-        # 右Y轴：占比（折线图）
-        # 5. 一级项目占比
-        fig.add_trace(
-            go.Scatter(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["一级项目占比"],
-                name="一级项目占比（%）",
-                mode="lines+markers",
-                marker=dict(
-                    color="#ee6666",
-                    size=10,
-                    line=dict(width=2, color="white"),
-                    symbol="circle"
-                ),
-                line=dict(color="#ee6666", width=3),
-                text=park_analysis_df_sorted["一级项目占比"].apply(lambda x: f"{x:.0f}%" if x > 0 else None),
-                textposition="top center",
-                textfont=dict(size=11, color="#ee6666"),
-                customdata=park_analysis_df_sorted["一级项目金额"],
-                hovertemplate="<b>%{x}</b><br>一级项目占比: %{y:.1f}%<br>一级项目金额: %{customdata:,.0f} 万元<extra></extra>",
-                yaxis="y2",
-                cliponaxis=False
-            )
-        )
-        
-        # 6. 总部项目占比
-        fig.add_trace(
-            go.Scatter(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["总部项目占比"],
-                name="总部项目占比（%）",
-                mode="lines+markers",
-                marker=dict(
-                    color="#ff9800",
-                    size=10,
-                    line=dict(width=2, color="white"),
-                    symbol="square"
-                ),
-                line=dict(color="#ff9800", width=3, dash="dash"),
-                text=park_analysis_df_sorted["总部项目占比"].apply(lambda x: f"{x:.0f}%" if x > 0 else None),
-                textposition="top center",
-                textfont=dict(size=11, color="#ff9800"),
-                customdata=park_analysis_df_sorted["总部项目金额"],
-                hovertemplate="<b>%{x}</b><br>总部项目占比: %{y:.1f}%<br>总部项目金额: %{customdata:,.0f} 万元<extra></extra>",
-                yaxis="y2",
-                cliponaxis=False
-            )
-        )
-        
-        # 7. 重大改造项目占比
-        fig.add_trace(
-            go.Scatter(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["重大改造项目占比"],
-                name="重大改造项目占比（%）",
-                mode="lines+markers",
-                marker=dict(
-                    color="#9c27b0",
-                    size=10,
-                    line=dict(width=2, color="white"),
-                    symbol="diamond"
-                ),
-                line=dict(color="#9c27b0", width=3, dash="dot"),
-                text=park_analysis_df_sorted["重大改造项目占比"].apply(lambda x: f"{x:.0f}%" if x > 0 else None),
-                textposition="top center",
-                textfont=dict(size=11, color="#9c27b0"),
-                customdata=park_analysis_df_sorted["重大改造项目金额"],
-                hovertemplate="<b>%{x}</b><br>重大改造项目占比: %{y:.1f}%<br>重大改造项目金额: %{customdata:,.0f} 万元<extra></extra>",
-                yaxis="y2",
-                cliponaxis=False
-            )
-        )
-        
-        # 更新X轴
-        fig.update_xaxes(
-            tickangle=-45,
-            tickfont=dict(size=11),
-            title_text="园区",
-            title_font=dict(size=13, color="#333"),
-            showgrid=True,
-            gridcolor="rgba(200,200,200,0.3)",
-            gridwidth=1,
-            showline=True,
-            linecolor="#ccc",
-            linewidth=1
-        )
-        
-        # 更新左Y轴（金额）
-        fig.update_yaxes(
-            title_text="金额（万元）",
-            title_font=dict(size=13, color="#333"),
-            tickfont=dict(size=11),
-            side="left",
-            showgrid=True,
-            gridcolor="rgba(200,200,200,0.3)",
-            gridwidth=1,
-            showline=True,
-            linecolor="#5470c6",
-            linewidth=2,
-            zeroline=True,
-            zerolinecolor="rgba(200,200,200,0.5)",
-            zerolinewidth=1
-        )
-        
-        # 更新右Y轴（占比）
-        fig.update_yaxes(
-            title_text="占比（%）",
-            title_font=dict(size=13, color="#333"),
-            tickfont=dict(size=11),
-            side="right",
-            overlaying="y",
-            range=[0, 105],
-            showgrid=False,
-            showline=True,
-            linecolor="#ee6666",
-            linewidth=2
-        )
-        
-        # 更新整体布局
-        fig.update_layout(
-            height=700,
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=-0.18,
-                xanchor="center",
-                x=0.5,
-                font=dict(size=11),
-                bgcolor="rgba(255,255,255,0.95)",
-                bordercolor="rgba(0,0,0,0.3)",
-                borderwidth=1,
-                itemwidth=30
-            ),
-            title=dict(
-                text="<b>各园区分类项目统计（金额、项目数与占比）</b>",
-                x=0.5,
-                xanchor="center",
-                y=0.97,
-                yanchor="top",
-                font=dict(size=18, family="Arial, sans-serif", color="#1f4788")
-            ),
-            margin=dict(t=100, b=160, l=90, r=90),
-            plot_bgcolor="rgba(255,255,255,1)",
-            paper_bgcolor="white",
-            barmode="group",
-            bargap=0.15,
-            bargroupgap=0.1,
-            hovermode="x unified",
-            hoverlabel=dict(
-                bgcolor="rgba(255,255,255,0.95)",
-                bordercolor="#333",
-                font_size=12,
-                font_family="Arial"
-            )
-        )
-        
-        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-        
-        # 添加一个新的金额统计图表：分组柱状图，使用对数刻度以保证小金额园区的可见性
-        st.markdown("#### 📊 各园区分类项目金额统计（对数刻度）")
-        fig_amount = go.Figure()
-        
-        # 分组柱状图：一级项目金额、总部项目金额、重大改造项目金额
-        fig_amount.add_trace(
-            go.Bar(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["一级项目金额"],
-                name="一级项目金额（万元）",
-                marker=dict(color="#5470c6", line=dict(color="#3a5a9c", width=1)),
-                text=park_analysis_df_sorted["一级项目金额"].apply(lambda x: f"{int(x)}" if x > 0 else ""),
-                textposition="outside",
-                textfont=dict(size=9, color="#5470c6"),
-                hovertemplate="<b>%{x}</b><br>一级项目金额: %{y:,.0f} 万元<extra></extra>"
-            )
-        )
-        
-        fig_amount.add_trace(
-            go.Bar(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["总部项目金额"],
-                name="总部项目金额（万元）",
-                marker=dict(color="#91cc75", line=dict(color="#6fa85a", width=1)),
-                text=park_analysis_df_sorted["总部项目金额"].apply(lambda x: f"{int(x)}" if x > 0 else ""),
-                textposition="outside",
-                textfont=dict(size=9, color="#91cc75"),
-                hovertemplate="<b>%{x}</b><br>总部项目金额: %{y:,.0f} 万元<extra></extra>"
-            )
-        )
-        
-        fig_amount.add_trace(
-            go.Bar(
-                x=park_analysis_df_sorted["园区"],
-                y=park_analysis_df_sorted["重大改造项目金额"],
-                name="重大改造项目金额（万元）",
-                marker=dict(color="#fac858", line=dict(color="#d4a84a", width=1)),
-                text=park_analysis_df_sorted["重大改造项目金额"].apply(lambda x: f"{int(x)}" if x > 0 else ""),
-                textposition="outside",
-                textfont=dict(size=9, color="#d4a84a"),
-                hovertemplate="<b>%{x}</b><br>重大改造项目金额: %{y:,.0f} 万元<extra></extra>"
+    if PLOTLY_AVAILABLE:
+        try:
+            fig_dict, fig_amount_dict = _build_park_analysis_figs(
+                tuple(park_analysis_df[_PARK_ANALYSIS_COLS].itertuples(index=False, name=None))
             )
-        )
-        
-        fig_amount.update_xaxes(
-            tickangle=-45,
-            tickfont=dict(size=11),
-            title_text="园区",
-            title_font=dict(size=13, color="#333"),
-            showgrid=True,
-            gridcolor="rgba(200,200,200,0.3)"
-        )
-        
-        # 计算Y轴范围，使用对数刻度以保证小金额园区的可见性
-        import math
-        max_amount = park_analysis_df_sorted["总金额"].max()
-        min_amount = park_analysis_df_sorted[park_analysis_df_sorted["总金额"] > 0]["总金额"].min()
-        
-        # 生成对数刻度的不均匀标签
-        if max_amount > 0 and min_amount > 0 and not math.isnan(min_amount) and max_amount > min_amount * 2:
-            # 计算对数范围
-            log_min = math.log10(max(1, min_amount))  # 确保最小值至少为1
-            log_max = math.log10(max_amount)
-            
-            # 生成不均匀的刻度值（对数间隔）
-            tick_vals = []
-            tick_texts = []
-            
-            # 生成主要刻度：1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000等
-            for exp in range(int(math.floor(log_min)), int(math.ceil(log_max)) + 1):
-                for multiplier in [1, 2, 5]:
-                    val = multiplier * (10 ** exp)
-                    if val >= max(1, min_amount * 0.5) and val <= max_amount * 1.5:
-                        tick_vals.append(val)
-                        if val >= 1000:
-                            tick_texts.append(f"{val/1000:.1f}千")
-                        elif val >= 100:
-                            tick_texts.append(f"{int(val)}")
-                        else:
-                            tick_texts.append(f"{val}")
-            
-            # 去重并排序
-            tick_pairs = sorted(set(zip(tick_vals, tick_texts)), key=lambda x: x[0])
-            tick_vals = [v for v, _ in tick_pairs]
-            tick_texts = [t for _, t in tick_pairs]
-        else:
-            tick_vals = None
-            tick_texts = None
-        
-        fig_amount.update_yaxes(
-            title_text="金额（万元，对数刻度）",
-            title_font=dict(size=13, color="#333"),
-            tickfont=dict(size=10),
-            showgrid=True,
-            gridcolor="rgba(200,200,200,0.3)",
-            type="log",  # 使用对数刻度
-            tickvals=tick_vals if tick_vals else None,
-            ticktext=tick_texts if tick_texts else None,
-            dtick=1  # 对数刻度的步长
-        )
-        
-        fig_amount.update_layout(
-            height=600,
-            barmode="group",  # 使用分组模式，支持对数刻度
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=-0.15,
-                xanchor="center",
-                x=0.5,
-                font=dict(size=11)
-            ),
-            title=dict(
-                text="<b>各园区分类项目金额统计（对数刻度，保证小金额园区可见性）</b>",
-                x=0.5,
-                xanchor="center",
-                y=0.97,
-                yanchor="top",
-                font=dict(size=16, color="#1f4788")
-            ),
-            margin=dict(t=80, b=140, l=80, r=40),
-            plot_bgcolor="rgba(255,255,255,1)",
-            paper_bgcolor="white",
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig_amount, use_container_width=True, config={"displayModeBar": False})
-        
-    except ImportError:
+            # theme=None：图表已自带完整配色与背景，跳过 Streamlit 主题的二次处理
+            st.plotly_chart(go.Figure(fig_dict), use_container_width=True, theme=None, config={"displayModeBar": False})
+
+            # 添加一个新的金额统计图表：分组柱状图，使用对数刻度以保证小金额园区的可见性
+            st.markdown("#### 📊 各园区分类项目金额统计（对数刻度）")
+            st.plotly_chart(go.Figure(fig_amount_dict), use_container_width=True, theme=None, config={"displayModeBar": False})
+        except Exception as e:
+            st.warning(f"图表生成出错：{str(e)}")
+    else:
         # 如果plotly不可用，回退到简单的表格显示
         st.info("图表库不可用，仅显示数据表格。")
-    except Exception as e:
-        st.warning(f"图表生成出错：{str(e)}")
     
     st.markdown("---")
     
     # 2. 确定项目（有立项日期）和未确定项目（无立项日期）分析
     st.markdown("### ✅ 项目确定状态分析")
     
-    # 查找立项日期列（支持多种可能的列名）
-    立项_col = None
-    for col in sub.columns:
-        col_str = str(col).strip()
-        # 支持多种列名格式
-        if any(keyword in col_str for keyword in ["需求立项", "项目立项", "立项日期", "立项"]):
-            # 排除包含"审核"、"决策"等其他时间节点的列
-            if "审核" not in col_str and "决策" not in col_str and "成本" not in col_str:
-                立项_col = col
-                break
-    
+    # 立项日期列已在上方与实施列一并查找（_find_timeline_cols）
     if 立项_col:
-        # 创建数据副本，避免修改原始数据
-        sub = sub.copy()
-        
-        # 解析日期列：支持Excel日期序列号、datetime对象、字符串等多种格式
-        def parse_date_series(series):
-            """解析日期序列，支持Excel日期序列号、datetime、字符串格式"""
-            result = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
-            
-            # 1. 如果已经是datetime类型，直接使用
-            if pd.api.types.is_datetime64_any_dtype(series):
-                result = pd.to_datetime(series, errors='coerce')
-                # 过滤1900年的日期（Excel占位符）
-                result = result.mask(result.dt.year == 1900, pd.NaT)
-                return result
-            
-            # 2. 尝试解析为数值（Excel日期序列号）
-            numeric = pd.to_numeric(series, errors='coerce')
-            excel_mask = pd.Series(False, index=series.index)
-            if numeric.notna().any():
-                # Excel日期序列号范围：1-100000（约1900-2100年）
-                excel_mask = (numeric >= 1) & (numeric <= 100000) & numeric.notna()
-                if excel_mask.any():
-                    # Excel基准日期：1899-12-30
-                    result.loc[excel_mask] = pd.to_datetime(
-                        numeric[excel_mask].astype(int), 
-                        unit='D', 
-                        origin='1899-12-30'
-                    )
-                    # 过滤1900年的日期
-                    result = result.mask(result.dt.year == 1900, pd.NaT)
-            
-            # 3. 解析字符串格式的日期（仅对未成功解析为Excel序列号的部分）
-            str_mask = ~excel_mask & result.isna()
-            if str_mask.any():
-                str_series = series[str_mask].astype(str).str.strip()
-                str_series = str_series.replace(['', 'nan', 'None', 'NaT'], pd.NA)
-                # 过滤以1900开头的字符串
-                str_mask2 = ~str_series.str.startswith('1900', na=False)
-                str_parse = pd.to_datetime(str_series[str_mask2], format='mixed', errors='coerce')
-                result.loc[str_mask] = str_parse
-            
-            return result
-        
         # 处理合并单元格：按园区向下填充空值
-        sub[立项_col] = sub[立项_col].replace('', pd.NA)
-        # 按园区和序号排序
-        sorted_idx = sub.sort_values(['园区', '序号']).index
-        # 按园区分组向下填充
-        sub.loc[sorted_idx, 立项_col] = sub.loc[sorted_idx].groupby('园区', sort=False)[立项_col].ffill()
+        sub[立项_col] = _按园区向下填充(sub, 立项_col)
         
         # 解析日期
-        sub["_立项日期_parsed"] = parse_date_series(sub[立项_col])
+        sub["_立项日期_parsed"] = _parse_timeline_dates_cached(sub[立项_col]).to_numpy()
         
         # 判断是否有有效立项日期
         sub["有立项日期"] = sub["_立项日期_parsed"].notna()
@@ -1711,8 +1757,8 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
         
         # 确定率统计
         st.markdown("#### 确定率统计")
-        park_determination = sub.groupby("园区", dropna=False).agg(
-            总项目数=("序号", "count"),
+        park_determination = sub.groupby("园区", dropna=False, observed=True).agg(
+            总项目数=("序号", "size"),
             已确定数=("有立项日期", "sum"),
         ).reset_index()
         park_determination["未确定数"] = park_determination["总项目数"] - park_determination["已确定数"]
@@ -1727,12 +1773,12 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
     st.markdown("### 📅 按月份统计立项")
     if 立项_col and "_立项日期_parsed" in sub.columns:
         # 从已解析的日期列提取月份
-        sub["立项月份"] = sub["_立项日期_parsed"].dt.to_period('M').astype(str)
+        sub["立项月份"] = _年月字符串(sub["_立项日期_parsed"])
         有月份的项目 = sub[sub["立项月份"].notna()]
         
         if not 有月份的项目.empty:
-            monthly_stats = 有月份的项目.groupby("立项月份", dropna=False).agg(
-                立项项目数=("序号", "count"),
+            monthly_stats = 有月份的项目.groupby("立项月份", dropna=False, observed=True).agg(
+                立项项目数=("序号", "size"),
                 立项金额=("拟定金额", "sum"),
             ).reset_index().sort_values("立项月份")
             monthly_stats["立项金额"] = monthly_stats["立项金额"].round(2)
@@ -1769,8 +1815,15 @@ def render_项目统计分析(df: pd.DataFrame, 园区选择: list):
         st.info("未找到立项日期列，无法进行月份统计。")
 
 
+def _去除汇总行(df: pd.DataFrame) -> pd.DataFrame:
+    """去掉序号为空、为合计/差额等汇总标记或非数字的行，只保留项目明细行。"""
+    # 「合计」「小计」「差额」等标记与空值转数值后均为 NaN，一次 to_numeric 即可全部排除
+    return df[pd.to_numeric(df["序号"], errors="coerce").notna()]
+
+
+@st.cache_data(show_spinner=False)
 def _prepare_要点分析子集(df: pd.DataFrame, 园区选择: list) -> pd.DataFrame:
-    """过滤汇总行、按园区筛选，供「改良改造要点看板」复用。"""
+    """过滤汇总行、按园区筛选，供「项目统计分析」与「改良改造要点看板」共用；数据与园区选择不变时重跑直接命中缓存。"""
     if 园区选择 and len(园区选择) > 0:
         valid_parks = [p for p in 园区选择 if p and pd.notna(p)]
         sub = df[df["园区"].isin(valid_parks)] if valid_parks else df[df["园区"].notna()]
@@ -1778,30 +1831,88 @@ def _prepare_要点分析子集(df: pd.DataFrame, 园区选择: list) -> pd.Data
         sub = df[df["园区"].notna()]
     if "序号" not in sub.columns:
         return pd.DataFrame()
-    sub = sub[sub["序号"].notna()]
-    sub = sub[~sub["序号"].astype(str).str.strip().isin(["合计", "预算系统合计", "差", "差额", "小计"])]
-    sub = sub[pd.to_numeric(sub["序号"], errors="coerce").notna()]
-    return sub
+    return _去除汇总行(sub)
+
+
+# Excel 日期序列号：1899-12-30 为第 0 天，距 1970-01-01 共 25569 天
+_EXCEL_EPOCH_OFFSET_DAYS = 25569
+_NS_PER_DAY = 86_400_000_000_000
+# 1900 年为 Excel 占位日期，解析结果落在该区间内视为无效
+_YEAR_1900_NS = (pd.Timestamp("1900-01-01").value, pd.Timestamp("1901-01-01").value)
+
+
+def _parse_date_strings(values) -> pd.DatetimeIndex:
+    """解析去重后的日期字符串：装有 ciso8601 时先走 ISO 快速路径，其余再交给 pd.to_datetime。"""
+    if not CISO8601_AVAILABLE:
+        return pd.to_datetime(values, format="mixed", errors="coerce")
+    parsed = []
+    for v in values:
+        try:
+            dt = ciso8601.parse_datetime(v)
+        except (ValueError, TypeError):
+            dt = None
+        # 带时区的结果与原有解析口径不同，一并回退
+        parsed.append(dt if dt is not None and dt.tzinfo is None else None)
+    fallback = [i for i, dt in enumerate(parsed) if dt is None]
+    if fallback:
+        slow = pd.to_datetime([values[i] for i in fallback], format="mixed", errors="coerce")
+        for i, dt in zip(fallback, slow):
+            parsed[i] = dt
+    return pd.DatetimeIndex(pd.to_datetime(parsed, errors="coerce"))
 
 
 def _parse_timeline_dates(series: pd.Series) -> pd.Series:
-    """解析进度表中的日期列（与项目统计分析中立项/实施解析逻辑一致）。"""
-    result = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    """解析进度表中的日期列：支持 Excel 日期序列号、datetime、字符串格式，1900 年占位日期视为空。"""
     if pd.api.types.is_datetime64_any_dtype(series):
         result = pd.to_datetime(series, errors="coerce")
         return result.mask(result.dt.year == 1900, pd.NaT)
-    numeric = pd.to_numeric(series, errors="coerce")
-    excel_mask = (numeric >= 1) & (numeric <= 100000) & numeric.notna()
+    out = np.full(len(series), np.datetime64("NaT"), dtype="datetime64[ns]")
+    numeric = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    # Excel 日期序列号范围：1-100000（约 1900-2100 年），NaN 比较结果为 False
+    excel_mask = (numeric >= 1) & (numeric <= 100000)
     if excel_mask.any():
-        result.loc[excel_mask] = pd.to_datetime(numeric[excel_mask].astype(int), unit="D", origin="1899-12-30")
-        result = result.mask(result.dt.year == 1900, pd.NaT)
-    str_mask = ~excel_mask & result.isna()
-    if str_mask.any():
-        str_series = series[str_mask].astype(str).str.strip().replace(["", "nan", "None", "NaT"], pd.NA)
-        str_mask2 = ~str_series.str.startswith("1900", na=False)
-        str_parse = pd.to_datetime(str_series[str_mask2], format="mixed", errors="coerce")
-        result.loc[str_mask] = str_parse
-    return result
+        ns = (numeric[excel_mask].astype("int64") - _EXCEL_EPOCH_OFFSET_DAYS) * _NS_PER_DAY
+        ns[(ns >= _YEAR_1900_NS[0]) & (ns < _YEAR_1900_NS[1])] = np.iinfo("int64").min
+        out[excel_mask] = ns.view("datetime64[ns]")
+    # 其余部分按字符串解析，只对剩余行调用一次 to_datetime
+    rest = np.flatnonzero(~excel_mask)
+    if rest.size:
+        str_series = series.iloc[rest].astype(str).str.strip()
+        str_series = str_series.mask(
+            str_series.isin(["", "nan", "None", "NaT"]) | str_series.str.startswith("1900")
+        )
+        # 日期字符串重复度高：只解析去重后的取值，再按编码映射回各行
+        codes, uniq = pd.factorize(str_series)
+        parsed = _parse_date_strings(uniq)
+        # pandas 3 会按需推断为 us 精度，超出 ns 可表示范围的日期（如误录的 2999 年）视为空，避免转换溢出
+        parsed = parsed.where((parsed >= pd.Timestamp.min) & (parsed <= pd.Timestamp.max))
+        # 末尾补一个 NaT，编码 -1（空值）取到它
+        lookup = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))
+        out[rest] = lookup[codes]
+    return pd.Series(out, index=series.index)
+
+
+def _按园区向下填充(df: pd.DataFrame, col: str) -> pd.Series:
+    """处理合并单元格：col 的空值在同一园区内按序号顺序向下填充。"""
+    s = df[col].mask(df[col].eq(""))
+    # 常见情形各园区行本就按序号排列，此时直接分组填充，省去整表排序
+    if df.groupby("园区", sort=False, observed=True)["序号"].is_monotonic_increasing.all():
+        return s.groupby(df["园区"], sort=False, observed=True).ffill()
+    order = df.sort_values(["园区", "序号"]).index
+    return s.loc[order].groupby(df["园区"].loc[order], sort=False, observed=True).ffill().reindex(df.index)
+
+
+def _年月字符串(dates: pd.Series) -> pd.Series:
+    """日期列转「YYYY-MM」：只格式化去重后的月份，再按编码映射回各行（空日期为空值）。"""
+    codes, months = pd.factorize(dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]"))
+    lookup = np.append(np.datetime_as_string(np.asarray(months, dtype="datetime64[M]")).astype(object), np.nan)
+    return pd.Series(lookup[codes], index=dates.index)
+
+
+@st.cache_data(show_spinner=False)
+def _parse_timeline_dates_cached(series: pd.Series) -> pd.Series:
+    """按列内容缓存的日期解析：数据未变时，控件触发的重跑直接复用上次结果。"""
+    return _parse_timeline_dates(series)
 
 
 def _extract_budget_total_万元(df: pd.DataFrame) -> float:
@@ -1893,7 +2004,7 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
         diff = total_amount - budget_total
         st.metric("金额 − 预算（万元）", f"{diff:,.0f}" if budget_total > 0 else "—")
     if "园区" in sub.columns and "拟定金额" in sub.columns:
-        park_amt = sub.groupby("园区", dropna=False)["拟定金额"].sum().reset_index()
+        park_amt = sub.groupby("园区", dropna=False, observed=True)["拟定金额"].sum().reset_index()
         park_amt["占筛选金额%"] = (park_amt["拟定金额"] / total_amount * 100).round(1) if total_amount > 0 else 0
         park_amt = park_amt.sort_values("拟定金额", ascending=False)
         st.dataframe(park_amt, use_container_width=True, hide_index=True)
@@ -1909,8 +2020,8 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
     if "项目分级" in sub.columns and "所属区域" in sub.columns:
         lv_reg = (
             sub[sub["所属区域"].isin(四大区域)]
-            .groupby(["所属区域", "项目分级"], dropna=False)
-            .agg(项目数=("序号", "count"), 金额万元=("拟定金额", "sum"))
+            .groupby(["所属区域", "项目分级"], dropna=False, observed=True)
+            .agg(项目数=("序号", "size"), 金额万元=("拟定金额", "sum"))
             .reset_index()
         )
         try:
@@ -1934,8 +2045,8 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
     if "项目分类" in sub.columns and "所属区域" in sub.columns:
         cat_reg = (
             sub[sub["所属区域"].isin(四大区域)]
-            .groupby(["所属区域", "项目分类"], dropna=False)
-            .agg(项目数=("序号", "count"), 金额万元=("拟定金额", "sum"))
+            .groupby(["所属区域", "项目分类"], dropna=False, observed=True)
+            .agg(项目数=("序号", "size"), 金额万元=("拟定金额", "sum"))
             .reset_index()
         )
         cr = cat_reg.sort_values(["所属区域", "项目分类"])
@@ -1986,15 +2097,14 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
     st.markdown("### 5）每周各园区 — 改良改造「方案」执行情况（按规划设计方案填表周）")
     scheme_col = "规划设计方案" if "规划设计方案" in sub.columns else None
     if scheme_col:
-        s2 = sub.copy()
-        s2["_方案日期"] = _parse_timeline_dates(s2[scheme_col])
+        s2 = sub.assign(_方案日期=_parse_timeline_dates_cached(sub[scheme_col]).to_numpy())
         ok = s2[s2["_方案日期"].notna()]
         if not ok.empty:
             ok = ok.copy()
             ok["年周"] = ok["_方案日期"].dt.strftime("%G-W%V")
             wk = (
-                ok.groupby(["园区", "年周"], dropna=False)
-                .agg(方案已填项数=("序号", "count"), 金额万元=("拟定金额", "sum"))
+                ok.groupby(["园区", "年周"], dropna=False, observed=True)
+                .agg(方案已填项数=("序号", "size"), 金额万元=("拟定金额", "sum"))
                 .reset_index()
                 .sort_values(["年周", "园区"])
             )
@@ -2005,21 +2115,15 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
         st.warning("未找到「规划设计方案」列。")
 
     st.markdown("### 6）每月四大区域 — 改良改造执行情况（按「实施」日期汇总）")
-    impl_col = None
-    for col in sub.columns:
-        c = str(col).strip()
-        if "实施" in c and "时间" not in c.lower():
-            impl_col = col
-            break
+    impl_col = _find_timeline_cols(tuple(sub.columns))[0]
     if impl_col and "所属区域" in sub.columns:
-        s3 = sub.copy()
-        s3["_实施日期"] = _parse_timeline_dates(s3[impl_col])
+        s3 = sub.assign(_实施日期=_parse_timeline_dates_cached(sub[impl_col]).to_numpy())
         mreg = s3[s3["_实施日期"].notna() & s3["所属区域"].isin(四大区域)].copy()
         if not mreg.empty:
-            mreg["年月"] = mreg["_实施日期"].dt.to_period("M").astype(str)
+            mreg["年月"] = _年月字符串(mreg["_实施日期"])
             mon_r = (
-                mreg.groupby(["年月", "所属区域"], dropna=False)
-                .agg(实施项数=("序号", "count"), 金额万元=("拟定金额", "sum"))
+                mreg.groupby(["年月", "所属区域"], dropna=False, observed=True)
+                .agg(实施项数=("序号", "size"), 金额万元=("拟定金额", "sum"))
                 .reset_index()
                 .sort_values(["年月", "所属区域"])
             )
@@ -2028,15 +2132,15 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
                 from plotly.subplots import make_subplots
                 import plotly.graph_objects as go
 
-                regions_ord = sorted(mon_r["所属区域"].unique().tolist())
                 fig2 = make_subplots(specs=[[{"secondary_y": True}]])
-                for i, reg in enumerate(regions_ord):
-                    d = mon_r[mon_r["所属区域"] == reg].sort_values("年月")
+                # mon_r 已按年月排序：按区域分组一次切出各区域的数组，不再逐区域筛选与排序
+                for i, (reg, d) in enumerate(mon_r.groupby("所属区域", sort=True, observed=True)):
+                    months = d["年月"].to_numpy()
                     color = CHART_COLORS_PIE[i % len(CHART_COLORS_PIE)]
                     fig2.add_trace(
                         go.Bar(
-                            x=d["年月"],
-                            y=d["金额万元"],
+                            x=months,
+                            y=d["金额万元"].to_numpy(),
                             name=f"{reg}·金额（万元）",
                             marker_color=color,
                             legendgroup=reg,
@@ -2045,8 +2149,8 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
                     )
                     fig2.add_trace(
                         go.Scatter(
-                            x=d["年月"],
-                            y=d["实施项数"],
+                            x=months,
+                            y=d["实施项数"].to_numpy(),
                             name=f"{reg}·实施项数",
                             mode="lines+markers",
                             line=dict(color=color, width=2.5, dash="dot"),
@@ -2075,9 +2179,10 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
 
     st.markdown("### 7）改造方案与施工「卡点」（招采已完成而实施未启动）")
     if "招采" in sub.columns and impl_col:
-        s5 = sub.copy()
-        s5["_招采日期"] = _parse_timeline_dates(s5["招采"])
-        s5["_实施日期"] = _parse_timeline_dates(s5[impl_col])
+        s5 = sub.assign(
+            _招采日期=_parse_timeline_dates_cached(sub["招采"]).to_numpy(),
+            _实施日期=_parse_timeline_dates_cached(sub[impl_col]).to_numpy(),
+        )
         stuck = s5[s5["_招采日期"].notna() & s5["_实施日期"].isna()]
         st.metric("招采已填日期但未实施", len(stuck))
         if not stuck.empty:
@@ -2112,16 +2217,14 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
             break
     if 立项_col:
         s6 = sub.copy()
-        s6[立项_col] = s6[立项_col].replace("", pd.NA)
-        idx = s6.sort_values(["园区", "序号"]).index
-        s6.loc[idx, 立项_col] = s6.loc[idx].groupby("园区", sort=False)[立项_col].ffill()
-        s6["_立项_p"] = _parse_timeline_dates(s6[立项_col])
+        s6[立项_col] = _按园区向下填充(s6, 立项_col)
+        s6["_立项_p"] = _parse_timeline_dates_cached(s6[立项_col]).to_numpy()
         s6["已立项"] = s6["_立项_p"].notna()
         undet = s6[~s6["已立项"]]
         st.metric("未立项（无有效立项日期）条数", len(undet))
         st.metric("未立项金额合计（万元）", f"{undet['拟定金额'].sum():,.0f}" if "拟定金额" in undet.columns else "—")
-        det = s6.groupby("园区", dropna=False).agg(
-            总项=("序号", "count"),
+        det = s6.groupby("园区", dropna=False, observed=True).agg(
+            总项=("序号", "size"),
             已立项项=("已立项", "sum"),
         ).reset_index()
         det["确定率%"] = (det["已立项项"] / det["总项"] * 100).round(1)
@@ -2173,11 +2276,10 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
         st.info("未找到立项日期列，跳过确定率预警。")
 
     if impl_col:
-        s7 = sub.copy()
-        s7["_实施日期"] = _parse_timeline_dates(s7[impl_col])
+        s7 = sub.assign(_实施日期=_parse_timeline_dates_cached(sub[impl_col]).to_numpy())
         not_impl = s7[s7["_实施日期"].isna()]
         park_ni = (
-            not_impl.groupby("园区", dropna=False)["拟定金额"].sum().reset_index().rename(columns={"拟定金额": "未实施金额"})
+            not_impl.groupby("园区", dropna=False, observed=True)["拟定金额"].sum().reset_index().rename(columns={"拟定金额": "未实施金额"})
             if "园区" in not_impl.columns and "拟定金额" in not_impl.columns
             else pd.DataFrame()
         )
@@ -2212,12 +2314,20 @@ def render_改良改造要点看板(df: pd.DataFrame, 园区选择: list):
                 pass
 
 
+def _按园区查表(codes: np.ndarray, parks: pd.Index, mapping: dict) -> np.ndarray:
+    """每个去重园区只查一次字典，再按编码取回各行；编码 -1（空园区）落到末尾的「其他」。"""
+    lut = np.array([mapping.get(p, "其他") for p in parks] + ["其他"], dtype=object)
+    return lut[codes]
+
+
 def _add_城市和区域列(df: pd.DataFrame) -> pd.DataFrame:
     """为 df 同时增加「城市」和「所属区域」列，不修改原表。"""
-    out = df.copy()
-    out["城市"] = out["园区"].map(园区_TO_城市).fillna("其他")
-    out["所属区域"] = out["园区"].map(园区_TO_区域).fillna("其他")
-    return out
+    codes, parks = pd.factorize(df["园区"])
+    # assign 只新增两列，其余列沿用原表数据块，不整表复制
+    return df.assign(
+        城市=_按园区查表(codes, parks, 园区_TO_城市),
+        所属区域=_按园区查表(codes, parks, 园区_TO_区域),
+    )
 
 
 def _compute_园区施工安全摘要(df: pd.DataFrame) -> dict:
@@ -2243,14 +2353,10 @@ def _compute_园区施工安全摘要(df: pd.DataFrame) -> dict:
                 tags.append(name)
         return tags
 
-    sub = df.copy()
-    if "序号" in sub.columns:
-        sub = sub[sub["序号"].notna()]
-        sub = sub[~sub["序号"].astype(str).str.strip().isin(["合计", "预算系统合计", "差", "差额", "小计"])]
-        sub = sub[pd.to_numeric(sub["序号"], errors="coerce").notna()]
+    sub = _去除汇总行(df) if "序号" in df.columns else df
 
     out = {}
-    for park, g in sub.groupby("园区", dropna=False):
+    for park, g in sub.groupby("园区", dropna=False, observed=True):
         pk = str(park).strip()
         if not pk or pk.lower() == "nan":
             continue
@@ -2313,82 +2419,41 @@ def _build_城市_园区明细(df: pd.DataFrame, safety_by_park: dict | None = N
     sub = df[df["城市"].notna() & (df["城市"] != "其他")]
     if sub.empty:
         return {}
-    by_city_park = sub.groupby(["城市", "园区"], dropna=False).agg(
+    by_city_park = sub.groupby(["城市", "园区"], dropna=False, observed=True).agg(
         项目数=("序号", "count"),
         金额合计=("拟定金额", "sum"),
     ).reset_index()
+    safety_by_park = safety_by_park or {}
     out = {}
-    for city in by_city_park["城市"].unique():
-        rows = by_city_park[by_city_park["城市"] == city]
-        parks = []
-        total_n = 0
-        total_a = 0
-        for _, r in rows.iterrows():
-            n = int(r["项目数"])
-            a = int(r["金额合计"])
-            pname = str(r["园区"])
-            item = {"园区名称": pname, "项目数": n, "预算万元": int(round(a))}
-            if safety_by_park and pname in safety_by_park:
-                item["安全关注条数"] = int(safety_by_park[pname].get("安全关注条数", 0))
-            else:
-                item["安全关注条数"] = 0
-            parks.append(item)
-            total_n += n
-            total_a += a
-        out[str(city)] = {"项目总数": total_n, "总预算万元": int(round(total_a)), "园区列表": parks}
+    # 按列取出数组后单次遍历；表已按城市、园区排序，城市首次出现的顺序即输出顺序
+    for city, park, n, amt in zip(
+        by_city_park["城市"].to_numpy(),
+        by_city_park["园区"].to_numpy(),
+        by_city_park["项目数"].to_numpy(),
+        by_city_park["金额合计"].to_numpy(),
+    ):
+        n = int(n)
+        a = int(amt)
+        pname = str(park)
+        entry = out.setdefault(str(city), {"项目总数": 0, "总预算万元": 0, "园区列表": []})
+        entry["园区列表"].append({
+            "园区名称": pname,
+            "项目数": n,
+            "预算万元": a,
+            "安全关注条数": int(safety_by_park.get(pname, {}).get("安全关注条数", 0)),
+        })
+        entry["项目总数"] += n
+        entry["总预算万元"] += a
     return out
 
 
-def _render_中国地图(df: pd.DataFrame, city_tooltip_data: dict, park_map_info: dict | None = None):
-    """中国地图：悬浮显示城市下各园区详情；园区散点悬浮显示施工安全关注；点击城市后通过 URL 参数筛选并跳转下方详情。"""
-    try:
-        from pyecharts.charts import Geo
-        from pyecharts import options as opts
-        from pyecharts.commons.utils import JsCode
-    except ImportError:
-        st.warning("请安装 pyecharts：pip install pyecharts")
-        st.info("如果已安装，请尝试：pip install pyecharts -U")
-        st.info("地图显示还需要安装地图数据包：pip install echarts-china-provinces-pypkg echarts-china-cities-pypkg")
-        return
-    
-    # 检查数据是否为空
-    if df.empty:
-        st.warning("数据为空，无法显示地图。")
-        return
-    
-    # 检查是否有城市列
-    if "城市" not in df.columns:
-        st.warning("数据中缺少'城市'列，无法显示地图。")
-        return
-    
-    by_city = df.groupby("城市", dropna=False).agg(
-        项目数=("序号", "count"),
-        金额合计=("拟定金额", "sum"),
-    ).reset_index()
-    
-    data = []
-    for _, row in by_city.iterrows():
-        city = row["城市"]
-        if city in 城市_COORDS and city != "其他":
-            data.append((city, int(row["项目数"])))
-    
-    if not data:
-        st.info("当前数据中暂无已配置区位的城市，或请先在侧边栏选择园区。")
-        st.info(f"数据中的城市列表：{by_city['城市'].unique().tolist()}")
-        st.info(f"已配置区位的城市：{list(城市_COORDS.keys())[:10]}...")
-        return
-    
-    # 准备园区地点数据：收集所有园区的位置信息（在创建图表之前）
-    park_locations = []
-    for park in df["园区"].dropna().unique():
-        if park in 园区_TO_城市:
-            city = 园区_TO_城市[park]
-            if city in 城市_COORDS:
-                lon, lat = 城市_COORDS[city]
-                # 统计该园区的项目数
-                park_count = len(df[df["园区"] == park])
-                park_locations.append((park, lon, lat, park_count))
-    
+@st.cache_data(show_spinner=False)
+def _build_中国地图_html(data: tuple, park_locations: tuple) -> str:
+    """构建 pyecharts 地图并在内存中渲染为 HTML；入参为元组以便按内容缓存。"""
+    from pyecharts.charts import Geo
+    from pyecharts import options as opts
+    from pyecharts.commons.utils import JsCode
+
     # 悬浮：① 园区散点 → PARK_MAP_INFO（施工安全）；② 城市圆点 → MAP_TOOLTIP_DATA（各园区+安全条数）
     tooltip_js = JsCode(
         """
@@ -2477,6 +2542,58 @@ def _render_中国地图(df: pd.DataFrame, city_tooltip_data: dict, park_map_inf
             range_color=["#e0f3f8", "#0868ac"],
         ),
     )
+    # 直接在内存中渲染为 HTML 字符串，不经临时文件
+    return geo.render_embed()
+
+
+def _render_中国地图(df: pd.DataFrame, city_tooltip_data: dict, park_map_info: dict | None = None):
+    """中国地图：悬浮显示城市下各园区详情；园区散点悬浮显示施工安全关注；点击城市后通过 URL 参数筛选并跳转下方详情。"""
+    try:
+        # 仅检查可用性，图表构建在 _build_中国地图_html 中完成
+        from pyecharts.charts import Geo  # noqa: F401
+    except ImportError:
+        st.warning("请安装 pyecharts：pip install pyecharts")
+        st.info("如果已安装，请尝试：pip install pyecharts -U")
+        st.info("地图显示还需要安装地图数据包：pip install echarts-china-provinces-pypkg echarts-china-cities-pypkg")
+        return
+    
+    # 检查数据是否为空
+    if df.empty:
+        st.warning("数据为空，无法显示地图。")
+        return
+    
+    # 检查是否有城市列
+    if "城市" not in df.columns:
+        st.warning("数据中缺少'城市'列，无法显示地图。")
+        return
+    
+    by_city = df.groupby("城市", dropna=False, observed=True).agg(
+        项目数=("序号", "count"),
+        金额合计=("拟定金额", "sum"),
+    ).reset_index()
+    
+    data = []
+    for _, row in by_city.iterrows():
+        city = row["城市"]
+        if city in 城市_COORDS and city != "其他":
+            data.append((city, int(row["项目数"])))
+    
+    if not data:
+        st.info("当前数据中暂无已配置区位的城市，或请先在侧边栏选择园区。")
+        st.info(f"数据中的城市列表：{by_city['城市'].unique().tolist()}")
+        st.info(f"已配置区位的城市：{list(城市_COORDS.keys())[:10]}...")
+        return
+    
+    # 准备园区地点数据：收集所有园区的位置信息（在创建图表之前）
+    park_locations = []
+    for park in df["园区"].dropna().unique():
+        if park in 园区_TO_城市:
+            city = 园区_TO_城市[park]
+            if city in 城市_COORDS:
+                lon, lat = 城市_COORDS[city]
+                # 统计该园区的项目数
+                park_count = len(df[df["园区"] == park])
+                park_locations.append((park, lon, lat, park_count))
     
     # 如果数据为空，显示备用信息
     if not data:
@@ -2488,12 +2605,8 @@ def _render_中国地图(df: pd.DataFrame, city_tooltip_data: dict, park_map_inf
     
     # 尝试使用pyecharts
     try:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".html", delete=False, encoding="utf-8") as f:
-            geo.render(f.name)
-            html_path = f.name
-        
-        with open(html_path, "r", encoding="utf-8") as f:
-            html = f.read()
+        # 地图数据不变时重跑直接复用缓存的 HTML
+        html = _build_中国地图_html(tuple(data), tuple(park_locations))
         
         # 检查HTML是否生成成功
         if not html or len(html) < 100:
@@ -2568,140 +2681,138 @@ def _render_中国地图(df: pd.DataFrame, city_tooltip_data: dict, park_map_inf
             st.markdown("### 城市项目统计（表格视图）")
             st.dataframe(by_city[["城市", "项目数", "金额合计"]].sort_values("项目数", ascending=False), 
                         use_container_width=True, hide_index=True)
-    finally:
-        try:
-            if 'html_path' in locals():
-                Path(html_path).unlink(missing_ok=True)
-        except Exception:
-            pass
 
 
 def _render_图表_简易(sub: pd.DataFrame):
     """无 plotly 时的简易柱状图回退。"""
     c1, c2 = st.columns(2)
     with c1:
-        by_prof = sub.groupby("专业", dropna=False).agg(项目数=("序号", "count")).reset_index().sort_values("项目数", ascending=False)
+        by_prof = sub.groupby("专业", dropna=False, observed=True).agg(项目数=("序号", "count")).reset_index().sort_values("项目数", ascending=False)
         if not by_prof.empty:
             st.bar_chart(by_prof.set_index("专业")["项目数"])
     with c2:
-        by_level = sub.groupby("项目分级", dropna=False).agg(项目数=("序号", "count")).reset_index().sort_values("项目数", ascending=False)
+        by_level = sub.groupby("项目分级", dropna=False, observed=True).agg(项目数=("序号", "count")).reset_index().sort_values("项目数", ascending=False)
         if not by_level.empty:
             st.bar_chart(by_level.set_index("项目分级")["项目数"])
-    by_park = sub.groupby("园区", dropna=False).agg(项目数=("序号", "count")).reset_index().sort_values("项目数", ascending=False).head(20)
+    by_park = sub.groupby("园区", dropna=False, observed=True).agg(项目数=("序号", "count")).reset_index().sort_values("项目数", ascending=False).head(20)
     if not by_park.empty:
         st.bar_chart(by_park.set_index("园区")["项目数"])
-    by_prof_m = sub.groupby("专业", dropna=False).agg(金额=("拟定金额", "sum")).reset_index().sort_values("金额", ascending=False)
+    by_prof_m = sub.groupby("专业", dropna=False, observed=True).agg(金额=("拟定金额", "sum")).reset_index().sort_values("金额", ascending=False)
     if not by_prof_m.empty:
         st.bar_chart(by_prof_m.set_index("专业")["金额"])
 
 
-def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
-    """生成完全交互式的HTML文件，包含所有数据和交互功能，效果与运行程序一致"""
-    import json
-    
-    # 准备数据：将DataFrame转换为JSON格式
-    # 过滤汇总行
-    df_clean = df.copy()
-    if "序号" in df_clean.columns:
-        df_clean = df_clean[df_clean["序号"].notna()]
-        df_clean = df_clean[~df_clean["序号"].astype(str).str.strip().isin(["合计", "预算系统合计", "差", "差额", "小计"])]
-        df_clean = df_clean[pd.to_numeric(df_clean["序号"], errors='coerce').notna()]
-    
-    # 添加城市和区域列
-    df_with_location = _add_城市和区域列(df_clean)
-    
-    # 转换为JSON（处理NaN值）
-    def convert_to_json_serializable(obj):
-        if pd.isna(obj):
-            return None
-        if isinstance(obj, (pd.Timestamp, datetime)):
-            return obj.strftime('%Y-%m-%d')
-        if isinstance(obj, (int, float)):
-            return float(obj) if not pd.isna(obj) else None
-        return str(obj)
-    
-    data_records = []
-    for _, row in df_with_location.iterrows():
-        record = {}
-        for col in df_with_location.columns:
-            val = row[col]
-            record[col] = convert_to_json_serializable(val)
-        data_records.append(record)
-    
-    # 获取所有园区列表
-    parks_list = sorted([p for p in df_with_location["园区"].dropna().unique().tolist() 
-                        if p and str(p).strip() and str(p) != "未知园区"])
-    
-    # 默认选中的园区
-    default_parks = 园区选择 if 园区选择 and len(园区选择) > 0 else parks_list
-    
-    # 序列化JSON数据
-    # 将JSON对象序列化为字符串，然后再次转义以便在JavaScript中作为字符串字面量使用
-    data_json_raw = json.dumps(data_records, ensure_ascii=False)
-    parks_json_raw = json.dumps(parks_list, ensure_ascii=False)
-    
-    # 将JSON字符串转换为JavaScript字符串字面量（转义引号、反斜杠等特殊字符）
-    # 使用json.dumps再次转义，确保在JavaScript中可以安全使用
-    data_json = json.dumps(data_json_raw)
-    parks_json = json.dumps(parks_json_raw)
-    
-    # 生成HTML
-    html_content = f'''<!DOCTYPE html>
+def _json_dumps(obj) -> str:
+    """序列化大体量数据：装有 orjson 时用 orjson（输出 UTF-8 原文，NaN/Inf 记为 null），否则回退标准库。"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _js_safe(json_text: str) -> str:
+    """JSON 文本转为可直接写进 <script> 的 JS 字面量：转义「</」（防止提前结束脚本块）及 U+2028/U+2029 行分隔符。"""
+    return json_text.replace("</", "<\\/").replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+
+
+def _js_embed(obj) -> str:
+    """对象序列化为可直接嵌入脚本的 JS 字面量，页面端无需再 JSON.parse。"""
+    return _js_safe(_json_dumps(obj))
+
+
+def _html_cell_value(obj):
+    """导出 HTML 的单元格取值：空值为 None，日期为 YYYY-MM-DD，数字为 float，其余转字符串。"""
+    if pd.isna(obj):
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.strftime('%Y-%m-%d')
+    if isinstance(obj, (int, float)):
+        return float(obj)
+    return str(obj)
+
+
+def _column_json_values(s: pd.Series) -> list:
+    """按列类型一次性转换为 JSON 值列表，口径与 _html_cell_value 逐格转换一致。"""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.dt.strftime('%Y-%m-%d').astype(object).where(s.notna(), None).tolist()
+    if pd.api.types.is_numeric_dtype(s):
+        vals = s.to_numpy(dtype="float64", na_value=np.nan)
+        return np.where(np.isnan(vals), None, vals.astype(object)).tolist()
+    if isinstance(s.dtype, pd.StringDtype):
+        return s.astype(object).where(s.notna(), None).tolist()
+    # object 列：非空值全为字符串（或全空）时整列转换，混合类型才逐格判断
+    kind = pd.api.types.infer_dtype(s, skipna=True)
+    if kind in ("string", "empty"):
+        return np.where(s.isna().to_numpy(), None, s.to_numpy(dtype=object)).tolist()
+    return [_html_cell_value(v) for v in s.astype(object).tolist()]
+
+
+def _df_to_json_columns(df: pd.DataFrame) -> dict:
+    """DataFrame 转为按列结构 {columns: 列名, data: 各列取值数组}，列名不随每行重复。"""
+    return {
+        "columns": [str(c) for c in df.columns],
+        "data": [_column_json_values(df.iloc[:, i]) for i in range(df.shape[1])],
+    }
+
+
+# 交互式 HTML 的静态外壳（样式、页面结构与脚本）：模块加载时切分一次，
+# 生成时只拼入园区选项与各段数据，不再每次格式化整段 f-string。
+# 页面只用到 bar / pie / scatter 三类图表，引用 plotly-basic 分发包（约为完整包的三分之一）
+_INTERACTIVE_HTML_TEMPLATE = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>养老社区改良改造进度管理看板</title>
-    <script src="https://cdn.plot.ly/plotly-2.26.0.min.js"></script>
+    <script src="https://cdn.plot.ly/plotly-basic-2.26.0.min.js"></script>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        body {{
+        }
+        body {
             font-family: "Microsoft YaHei", "SimSun", "SimHei", Arial, sans-serif;
             font-size: 14px;
             line-height: 1.6;
             color: #333;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             padding: 20px;
             background-color: white;
             min-height: 100vh;
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #1f4788 0%, #4a7bc8 100%);
             color: white;
             padding: 20px;
             border-radius: 8px;
             margin-bottom: 20px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             font-size: 28px;
             margin-bottom: 10px;
-        }}
-        .header .caption {{
+        }
+        .header .caption {
             font-size: 14px;
             opacity: 0.9;
-        }}
-        .sidebar {{
+        }
+        .sidebar {
             background-color: #f8f9fa;
             padding: 20px;
             border-radius: 8px;
             margin-bottom: 20px;
             border: 1px solid #e0e0e0;
-        }}
-        .sidebar h3 {{
+        }
+        .sidebar h3 {
             color: #1f4788;
             margin-bottom: 15px;
             font-size: 18px;
-        }}
-        .multiselect {{
+        }
+        .multiselect {
             width: 100%;
             padding: 8px;
             border: 1px solid #ddd;
@@ -2710,21 +2821,21 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
             background-color: white;
             max-height: 200px;
             overflow-y: auto;
-        }}
-        .multiselect option {{
+        }
+        .multiselect option {
             padding: 5px;
-        }}
-        .multiselect option:checked {{
+        }
+        .multiselect option:checked {
             background-color: #4a7bc8;
             color: white;
-        }}
-        .tabs {{
+        }
+        .tabs {
             display: flex;
             border-bottom: 2px solid #e0e0e0;
             margin-bottom: 20px;
             overflow-x: auto;
-        }}
-        .tab-button {{
+        }
+        .tab-button {
             padding: 12px 24px;
             background-color: #f8f9fa;
             border: none;
@@ -2734,76 +2845,76 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
             color: #666;
             transition: all 0.3s;
             white-space: nowrap;
-        }}
-        .tab-button:hover {{
+        }
+        .tab-button:hover {
             background-color: #e9ecef;
             color: #1f4788;
-        }}
-        .tab-button.active {{
+        }
+        .tab-button.active {
             background-color: white;
             color: #1f4788;
             border-bottom-color: #4a7bc8;
             font-weight: bold;
-        }}
-        .tab-content {{
+        }
+        .tab-content {
             display: none;
             padding: 20px 0;
-        }}
-        .tab-content.active {{
+        }
+        .tab-content.active {
             display: block;
-        }}
-        .section {{
+        }
+        .section {
             margin-bottom: 30px;
-        }}
-        .section h2 {{
+        }
+        .section h2 {
             font-size: 22px;
             color: #1f4788;
             margin-bottom: 15px;
             padding-bottom: 10px;
             border-bottom: 2px solid #4a7bc8;
-        }}
-        .section h3 {{
+        }
+        .section h3 {
             font-size: 18px;
             color: #2c5aa0;
             margin: 20px 0 10px 0;
-        }}
-        .section h4 {{
+        }
+        .section h4 {
             font-size: 16px;
             color: #4a7bc8;
             margin: 15px 0 8px 0;
-        }}
-        .metrics {{
+        }
+        .metrics {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
             margin: 20px 0;
-        }}
-        .metric {{
+        }
+        .metric {
             background: linear-gradient(135deg, #f0f8ff 0%, #e6f3ff 100%);
             padding: 20px;
             border-radius: 8px;
             border-left: 4px solid #4a7bc8;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .metric-label {{
+        }
+        .metric-label {
             font-size: 13px;
             color: #666;
             margin-bottom: 8px;
-        }}
-        .metric-value {{
+        }
+        .metric-value {
             font-size: 24px;
             font-weight: bold;
             color: #1f4788;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 15px 0;
             font-size: 13px;
             background-color: white;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        th {{
+        }
+        th {
             background-color: #4a7bc8;
             color: white;
             padding: 12px;
@@ -2811,42 +2922,42 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
             font-weight: bold;
             position: sticky;
             top: 0;
-        }}
-        td {{
+        }
+        td {
             padding: 10px 12px;
             border-bottom: 1px solid #e0e0e0;
-        }}
-        tr:hover {{
+        }
+        tr:hover {
             background-color: #f5f5f5;
-        }}
-        tr:nth-child(even) {{
+        }
+        tr:nth-child(even) {
             background-color: #fafafa;
-        }}
-        .chart-container {{
+        }
+        .chart-container {
             margin: 20px 0;
             background-color: white;
             padding: 15px;
             border-radius: 8px;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .info-box {{
+        }
+        .info-box {
             background-color: #e7f3ff;
             border-left: 4px solid #4a7bc8;
             padding: 15px;
             margin: 15px 0;
             border-radius: 4px;
-        }}
-        .warning-box {{
+        }
+        .warning-box {
             background-color: #fff3cd;
             border-left: 4px solid #ffc107;
             padding: 15px;
             margin: 15px 0;
             border-radius: 4px;
-        }}
-        .expander {{
+        }
+        .expander {
             margin: 10px 0;
-        }}
-        .expander-header {{
+        }
+        .expander-header {
             background-color: #f8f9fa;
             padding: 12px;
             cursor: pointer;
@@ -2855,37 +2966,37 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
-        .expander-header:hover {{
+        }
+        .expander-header:hover {
             background-color: #e9ecef;
-        }}
-        .expander-content {{
+        }
+        .expander-content {
             display: none;
             padding: 15px;
             border: 1px solid #e0e0e0;
             border-top: none;
             border-radius: 0 0 4px 4px;
-        }}
-        .expander-content.active {{
+        }
+        .expander-content.active {
             display: block;
-        }}
-        .expander-icon {{
+        }
+        .expander-icon {
             transition: transform 0.3s;
-        }}
-        .expander-header.active .expander-icon {{
+        }
+        .expander-header.active .expander-icon {
             transform: rotate(90deg);
-        }}
-        ul {{
+        }
+        ul {
             padding-left: 25px;
             margin: 10px 0;
-        }}
-        li {{
+        }
+        li {
             margin: 8px 0;
-        }}
-        .data-table-container {{
+        }
+        .data-table-container {
             overflow-x: auto;
             margin: 15px 0;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -2899,7 +3010,7 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
             <h3>📊 数据筛选</h3>
             <label for="park-select" style="display: block; margin-bottom: 8px; font-weight: bold;">筛选园区：</label>
             <select id="park-select" class="multiselect" multiple size="8">
-                {''.join([f'<option value="{p}" {"selected" if p in default_parks else ""}>{p}</option>' for p in parks_list])}
+                __PARK_OPTIONS__
             </select>
             <div style="margin-top: 10px; font-size: 12px; color: #666;">
                 💡 提示：按住 Ctrl (Windows) 或 Cmd (Mac) 键可多选
@@ -2945,362 +3056,626 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
     </div>
     
     <script>
-        // 数据存储
-        const allData = JSON.parse({data_json});
-        const parksList = JSON.parse({parks_json});
-        let filteredData = [...allData];
+        // 数据存储：数据量大时以 gzip+base64 嵌入，载入时用浏览器原生 DecompressionStream 解压
+        async function inflateJSON(b64) {
+            const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+            const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return JSON.parse(await new Response(stream).text());
+        }
+        // 拟定金额载入时按 parseFloat 口径整列解析一次，以 Symbol 键挂在记录上：
+        // 不出现在 Object.keys / for...in 中，各标签页汇总直接读数值，不再逐行重复解析
+        const AMOUNT = Symbol('拟定金额');
+        // 语义日期列（实施、立项、需求立项、验收）由生成端解析为 1970-01-01 起的天数（无效为 -1），同样以 Symbol 键挂载；
+        // 立项列为按园区向下填充后的结果
+        const DAYS = {impl: Symbol('impl'), 立项: Symbol('立项'), 需求立项: Symbol('需求立项'), accept: Symbol('accept')};
+        // 专业为「其它系统」的记录在各专业统计中不单独展示，载入时判断一次并以 Symbol 键标记
+        const OTHER_PROF = Symbol('其它系统');
+        const OTHER_PROF_NAMES = new Set(['其它系统', '其他系统']);
+        // 分组键（园区、所属区域、专业）载入时按统计口径（空值取默认名）编号一次，以 Symbol 键挂在记录上；
+        // 汇总按编号写入定长数组，不再逐行以字符串为对象键散列
+        const GROUP_FALLBACK = {园区: '未知', 所属区域: '其他', 专业: '未分类'};
+        const GROUP_ID = {园区: Symbol('园区'), 所属区域: Symbol('所属区域'), 专业: Symbol('专业')};
+        // 编号 -> 分组名
+        const groupNames = {园区: [], 所属区域: [], 专业: []};
+        // 数据按列嵌入（列名只出现一次），载入后一次性还原为逐行对象供各标签页使用
+        function rowsFromColumns(payload) {
+            const cols = payload.columns;
+            const arrays = payload.data;
+            const n = arrays.length ? arrays[0].length : 0;
+            const amounts = new Float64Array(n);
+            const amountIdx = cols.indexOf('拟定金额');
+            if (amountIdx >= 0) {
+                const src = arrays[amountIdx];
+                for (let i = 0; i < n; i++) amounts[i] = parseFloat(src[i]) || 0;
+            }
+            const dayRoles = Object.keys(payload.days || {});
+            const groups = Object.keys(GROUP_ID);
+            const groupIdx = groups.map(() => new Map());
+            const rows = new Array(n);
+            for (let i = 0; i < n; i++) {
+                const row = {};
+                for (let j = 0; j < cols.length; j++) row[cols[j]] = arrays[j][i];
+                row[AMOUNT] = amounts[i];
+                row[OTHER_PROF] = OTHER_PROF_NAMES.has(row.专业);
+                for (let g = 0; g < groups.length; g++) {
+                    const name = row[groups[g]] || GROUP_FALLBACK[groups[g]];
+                    let id = groupIdx[g].get(name);
+                    if (id === undefined) {
+                        id = groupNames[groups[g]].push(name) - 1;
+                        groupIdx[g].set(name, id);
+                    }
+                    row[GROUP_ID[groups[g]]] = id;
+                }
+                for (const role of dayRoles) row[DAYS[role]] = payload.days[role][i];
+                rows[i] = row;
+            }
+            return rows;
+        }
+        const dataReady = __DATA_SOURCE__.then(rowsFromColumns);
+        let allData = [];
+        const parksList = __PARKS_JSON__;
+        // 各园区有效项目汇总（生成时按园区预先聚合），筛选变化后按园区合并即可，无需逐行累加
+        const parkAgg = __PARK_AGG__;
+        // 语义列名（实施、立项、需求立项、验收）：生成时按列名扫描一次，缺失为 null
+        const COLS = __COLS__;
+        let filteredData = [];
+        // 当前园区筛选条件，与 filteredData 同步；初始为全部记录
+        let parkFilter = () => true;
+        // 园区 -> 记录下标，载入后建立一次；筛选时按所选园区取下标，不再逐行判断
+        const byPark = new Map();
+        // 上次筛选命中的记录下标（升序）；园区选择变了但命中记录不变时（如增减没有记录的园区）不必重算各标签页
+        let filteredIdx = null;
+        
+        function sameIndices(a, b) {
+            if (!a || a.length !== b.length) return false;
+            for (let i = 0; i < a.length; i++) {
+                if (a[i] !== b[i]) return false;
+            }
+            return true;
+        }
         let currentTab = 0;
         
         // 园区筛选
-        document.getElementById('park-select').addEventListener('change', function() {{
+        document.getElementById('park-select').addEventListener('change', function() {
             const selectedParks = Array.from(this.selectedOptions).map(opt => opt.value);
-            if (selectedParks.length === 0) {{
-                filteredData = allData.filter(d => d.园区 && d.园区 !== null && d.园区 !== '');
-            }} else {{
-                filteredData = allData.filter(d => selectedParks.includes(d.园区));
-            }}
-            renderAllTabs();
-        }});
+            if (selectedParks.length === 0) {
+                parkFilter = park => !!park;
+            } else {
+                parkFilter = park => selectedParks.includes(park);
+            }
+            const parts = [];
+            let total = 0;
+            byPark.forEach((idxs, park) => {
+                if (parkFilter(park)) {
+                    parts.push(idxs);
+                    total += idxs.length;
+                }
+            });
+            // 合并各园区下标后按原顺序排列，表格与图表中的记录次序不变
+            const picked = new Int32Array(total);
+            let offset = 0;
+            parts.forEach(idxs => {
+                picked.set(idxs, offset);
+                offset += idxs.length;
+            });
+            picked.sort();
+            if (sameIndices(filteredIdx, picked)) return;
+            filteredIdx = picked;
+            filteredData = Array.from(picked, i => allData[i]);
+            scheduleRender();
+        });
+        
+        // 重绘放到下一帧：事件处理立即返回、下拉框先完成自身刷新，连续多次选择只重绘一次
+        let renderPending = false;
+        function scheduleRender() {
+            if (renderPending) return;
+            renderPending = true;
+            requestAnimationFrame(() => {
+                renderPending = false;
+                renderAllTabs();
+            });
+        }
         
         // 标签页切换
-        function switchTab(index) {{
+        function switchTab(index) {
             currentTab = index;
-            document.querySelectorAll('.tab-button').forEach((btn, i) => {{
+            renderTabIfDirty(index);
+            document.querySelectorAll('.tab-button').forEach((btn, i) => {
                 btn.classList.toggle('active', i === index);
-            }});
-            document.querySelectorAll('.tab-content').forEach((content, i) => {{
+            });
+            document.querySelectorAll('.tab-content').forEach((content, i) => {
                 content.classList.toggle('active', i === index);
-            }});
-        }}
+            });
+        }
         
         // 工具函数
-        function formatNumber(num) {{
+        function formatNumber(num) {
             if (num === null || num === undefined || isNaN(num)) return '0';
-            return parseFloat(num).toLocaleString('zh-CN', {{maximumFractionDigits: 2}});
-        }}
+            return parseFloat(num).toLocaleString('zh-CN', {maximumFractionDigits: 2});
+        }
         
-        function formatCurrency(num) {{
-            if (num === null || num === undefined || isNaN(num)) return '0';
-            return parseFloat(num).toLocaleString('zh-CN', {{maximumFractionDigits: 0}});
-        }}
+        // 金额格式化：复用同一个 NumberFormat，结果按入参缓存（各表格与指标卡中重复的金额很多）
+        const currencyFormat = new Intl.NumberFormat('zh-CN', {maximumFractionDigits: 0});
+        const currencyCache = new Map();
+        function formatCurrency(num) {
+            let text = currencyCache.get(num);
+            if (text === undefined) {
+                text = (num === null || num === undefined || isNaN(num)) ? '0' : currencyFormat.format(parseFloat(num));
+                currencyCache.set(num, text);
+            }
+            return text;
+        }
         
-        function getValue(row, col) {{
+        function getValue(row, col) {
             return row[col] !== null && row[col] !== undefined ? row[col] : '';
-        }}
+        }
         
-        function isValidNumber(val) {{
+        function isValidNumber(val) {
             return val !== null && val !== undefined && !isNaN(val) && val !== '';
-        }}
+        }
         
         // 过滤有效项目（有序号且为数字）
-        function getValidProjects(data) {{
-            return data.filter(d => {{
+        // 「合计」「小计」「差额」等汇总标记 parseFloat 后均为 NaN，一次数值判断即可排除
+        function getValidProjects(data) {
+            return data.filter(d => {
                 const seq = d.序号;
-                if (!seq || seq === null || seq === '') return false;
-                const seqStr = String(seq).trim();
-                if (['合计', '预算系统合计', '差', '差额', '小计'].includes(seqStr)) return false;
-                return !isNaN(parseFloat(seq));
-            }});
-        }}
+                return !!seq && !isNaN(parseFloat(seq));
+            });
+        }
         
-        // 渲染所有标签页
-        function renderAllTabs() {{
-            renderTab0(); // 项目统计分析
-            renderTab1(); // 统计
-            renderTab2(); // 地区分析
-            renderTab3(); // 各园区分级分类
-            renderTab4(); // 总部视图
-            renderTab5(); // 全部项目
-        }}
+        // 各标签页渲染函数，下标与标签页一致
+        const tabRenderers = [
+            renderTab0, // 项目统计分析
+            renderTab1, // 统计
+            renderTab2, // 地区分析
+            renderTab3, // 各园区分级分类
+            renderTab4, // 总部视图
+            renderTab5, // 全部项目
+        ];
+        // 数据变化后尚未重绘的标签页
+        const dirtyTabs = new Set();
         
-        // 日期解析工具函数
-        function parseDate(dateStr) {{
-            if (!dateStr || dateStr === null || dateStr === undefined || dateStr === '') return null;
-            const str = String(dateStr).trim();
-            if (str === '' || str === 'nan' || str === 'None' || str.startsWith('1900')) return null;
-            
-            // 尝试解析为日期
-            const date = new Date(str);
-            if (!isNaN(date.getTime()) && date.getFullYear() >= 2000) {{
-                return date;
-            }}
-            
-            // 尝试解析Excel日期序列号
-            const num = parseFloat(str);
-            if (!isNaN(num) && num >= 1 && num <= 100000) {{
-                const excelDate = new Date(1899, 11, 30);
-                excelDate.setDate(excelDate.getDate() + num);
-                if (excelDate.getFullYear() >= 2000) {{
-                    return excelDate;
-                }}
-            }}
-            
-            return null;
-        }}
+        function renderTabIfDirty(index) {
+            if (dirtyTabs.delete(index)) tabRenderers[index]();
+        }
+        
+        // 渲染所有标签页：只重绘当前可见的一页，其余标记待重绘，切换过去时再渲染
+        function renderAllTabs() {
+            tabRenderers.forEach((_, i) => dirtyTabs.add(i));
+            renderTabIfDirty(currentTab);
+        }
         
         // 稳定需求判断：需求已立项（需求立项日期有效）且非无效日期
-        function isStableRequirement(d) {{
-            // 查找需求立项列
-            let 立项Col = null;
-            for (let key in d) {{
-                if (key.includes('需求立项')) {{
-                    立项Col = key;
-                    break;
-                }}
-            }}
-            if (!立项Col) return false;
-            
-            const date = parseDate(d[立项Col]);
-            return date !== null && date.getFullYear() >= 2000;
-        }}
+        function isStableRequirement(d) {
+            return d[DAYS.需求立项] >= 0;
+        }
+        
+        // 天数转月序号（年 * 12 + 月份下标），同一天数只换算一次；序号大小即月份先后
+        const monthIndexCache = new Map();
+        function monthIndex(day) {
+            let idx = monthIndexCache.get(day);
+            if (idx === undefined) {
+                const date = new Date(day * 864e5);
+                idx = date.getUTCFullYear() * 12 + date.getUTCMonth();
+                monthIndexCache.set(day, idx);
+            }
+            return idx;
+        }
+        
+        // 月序号转「YYYY-MM」
+        function monthKeyOf(idx) {
+            return Math.floor(idx / 12) + '-' + String(idx % 12 + 1).padStart(2, '0');
+        }
+        
+        // 合并当前筛选下各园区的预聚合结果：按园区统计与各园区分类金额
+        function aggregateParks() {
+            const parkStats = {};
+            const parkAnalysis = {};
+            Object.keys(parkAgg).forEach(key => {
+                if (!parkFilter(key)) return;
+                const agg = parkAgg[key];
+                const park = key || '未知';
+                if (!parkStats[park]) {
+                    parkStats[park] = {count: 0, amount: 0};
+                    parkAnalysis[park] = {total: 0, level1: 0, hq: 0, major: 0, majorCount: 0};
+                }
+                parkStats[park].count += agg.count;
+                parkStats[park].amount += agg.amount;
+                parkAnalysis[park].total += agg.amount;
+                parkAnalysis[park].level1 += agg.level1;
+                parkAnalysis[park].hq += agg.hq;
+                parkAnalysis[park].major += agg.major;
+                parkAnalysis[park].majorCount += agg.majorCount;
+            });
+            return {parkStats, parkAnalysis};
+        }
+        
+        // 合并当前筛选下各园区预聚合的 {键: [项目数, 金额, 首行行号]}，结果按键首次出现顺序排列
+        function mergeParkGroups(parkKeys, field) {
+            const merged = new Map();
+            parkKeys.forEach(key => {
+                const groups = parkAgg[key][field];
+                Object.keys(groups).forEach(name => {
+                    const [count, amount, first] = groups[name];
+                    const stats = merged.get(name);
+                    if (stats) {
+                        stats.count += count;
+                        stats.amount += amount;
+                        if (first < stats.first) stats.first = first;
+                    } else {
+                        merged.set(name, {count, amount, first});
+                    }
+                });
+            });
+            return Array.from(merged.entries()).sort((a, b) => a[1].first - b[1].first);
+        }
+        
+        // 统计页各分组：专业、分级、园区、城市、区域及区域下园区，均由各园区预聚合结果合并，不再逐行累加
+        function aggregateParkDetails() {
+            const parkKeys = Object.keys(parkAgg).filter(key => parkFilter(key)).sort((a, b) => parkAgg[a].first - parkAgg[b].first);
+            const profStats = {};
+            mergeParkGroups(parkKeys, 'profs').forEach(([prof, stats]) => {
+                profStats[prof] = {count: stats.count, amount: stats.amount};
+            });
+            const levelAmountStats = {};
+            mergeParkGroups(parkKeys, 'levels').forEach(([level, stats]) => {
+                levelAmountStats[level] = stats.amount;
+            });
+            const parkAmountStats = {};
+            const cityAmountStats = {};
+            const regionDetailedStats = {};
+            const regionParkDetails = {};
+            parkKeys.forEach(key => {
+                const agg = parkAgg[key];
+                const park = key || '未知';
+                parkAmountStats[park] = (parkAmountStats[park] || 0) + agg.amount;
+                const city = agg.city || '其他';
+                if (city !== '其他') cityAmountStats[city] = (cityAmountStats[city] || 0) + agg.amount;
+                const region = agg.region || '其他';
+                if (region === '其他') return;
+                if (!regionDetailedStats[region]) {
+                    regionDetailedStats[region] = {count: 0, amount: 0, parkCount: 0};
+                    regionParkDetails[region] = {};
+                }
+                regionDetailedStats[region].count += agg.count;
+                regionDetailedStats[region].amount += agg.amount;
+                if (key) regionDetailedStats[region].parkCount++;
+                const parkDetails = regionParkDetails[region];
+                if (!parkDetails[park]) parkDetails[park] = {count: 0, amount: 0};
+                parkDetails[park].count += agg.count;
+                parkDetails[park].amount += agg.amount;
+            });
+            const regionAmountStats = {};
+            Object.keys(regionDetailedStats).forEach(region => {
+                regionAmountStats[region] = regionDetailedStats[region].amount;
+            });
+            return {profStats, levelAmountStats, parkAmountStats, cityAmountStats, regionAmountStats, regionDetailedStats, regionParkDetails};
+        }
+        
+        // 按分组编号汇总项目数与金额（skip 为真的记录不计），返回以分组名为键、按首次出现顺序排列的对象
+        function groupStats(rows, group, skip) {
+            const names = groupNames[group];
+            const idKey = GROUP_ID[group];
+            const counts = new Int32Array(names.length);
+            const amounts = new Float64Array(names.length);
+            const order = [];
+            for (let i = 0; i < rows.length; i++) {
+                const d = rows[i];
+                if (skip && skip(d)) continue;
+                const id = d[idKey];
+                if (counts[id]++ === 0) order.push(id);
+                amounts[id] += d[AMOUNT];
+            }
+            const stats = {};
+            for (const id of order) stats[names[id]] = {count: counts[id], amount: amounts[id]};
+            return stats;
+        }
+        
+        // 去掉「其它系统」记录
+        const skipOtherProf = d => d[OTHER_PROF];
+        
+        // 类目较多的柱形图不逐点绘制标注文字（每个点一个 SVG 文本节点），标注改在悬停提示中显示
+        const BAR_TEXT_MAX_CATEGORIES = 30;
+        function hoverOnlyBarText(traces) {
+            traces.forEach(trace => {
+                if (trace.type !== 'bar' || !trace.text || trace.x.length <= BAR_TEXT_MAX_CATEGORIES) return;
+                trace.hovertext = trace.text;
+                trace.hoverinfo = trace.name ? 'x+name+text' : 'x+text';
+                delete trace.text;
+                delete trace.textposition;
+            });
+            return traces;
+        }
+        
+        // 图表按需绘制：charts 为 [容器 id, 绘制函数] 列表。容器进入视口（含 200px 预留）时才排队，
+        // 队列每个空闲回调只画一个（不支持时退回 setTimeout），不会有多个 Plotly 绘制挤在一个长任务里；
+        // 同一标签页再次渲染时，旧的监听与队列作废
+        const chartQueues = {};
+        function drawChartsWhenVisible(tab, charts) {
+            const prev = chartQueues[tab];
+            if (prev && prev.observer) prev.observer.disconnect();
+            const state = {queue: [], running: false, observer: null};
+            chartQueues[tab] = state;
+            const schedule = window.requestIdleCallback
+                ? cb => requestIdleCallback(cb, {timeout: 500})
+                : cb => setTimeout(cb, 0);
+            const pump = () => {
+                if (chartQueues[tab] !== state) return;
+                const job = state.queue.shift();
+                if (!job) {
+                    state.running = false;
+                    return;
+                }
+                job();
+                schedule(pump);
+            };
+            const enqueue = job => {
+                state.queue.push(job);
+                if (!state.running) {
+                    state.running = true;
+                    schedule(pump);
+                }
+            };
+            const pending = new Map(charts.map(([id, draw]) => [id, () => draw(id)]));
+            if (!window.IntersectionObserver) {
+                pending.forEach(enqueue);
+                return;
+            }
+            state.observer = new IntersectionObserver(entries => {
+                entries.forEach(entry => {
+                    const job = entry.isIntersecting && pending.get(entry.target.id);
+                    if (!job) return;
+                    pending.delete(entry.target.id);
+                    state.observer.unobserve(entry.target);
+                    enqueue(job);
+                });
+            }, {rootMargin: '200px'});
+            pending.forEach((_, id) => {
+                const el = document.getElementById(id);
+                if (el) state.observer.observe(el);
+            });
+        }
+        
+        // 标签页分区：sections 为按顺序排列的 {分区名: HTML}。外壳只建一次，之后只替换 HTML 有变化的分区，
+        // 未变的分区不再重新解析，其中的图表容器得以保留，供 Plotly.react 增量更新
+        const sectionShells = {};
+        function renderSections(tab, container, sections) {
+            const names = Object.keys(sections);
+            let shell = sectionShells[tab];
+            if (!shell || shell.names.join() !== names.join() || !shell.refs[names[0]].isConnected) {
+                container.innerHTML = '<div class="section">' + names.map(name => `<div id="tab${tab}-${name}"></div>`).join('') + '</div>';
+                shell = sectionShells[tab] = {names, refs: {}, html: {}};
+                names.forEach(name => { shell.refs[name] = document.getElementById(`tab${tab}-${name}`); });
+            }
+            names.forEach(name => {
+                if (shell.html[name] === sections[name]) return;
+                shell.refs[name].innerHTML = sections[name];
+                shell.html[name] = sections[name];
+            });
+        }
         
         // 标签页0: 项目统计分析
-        function renderTab0() {{
+        function renderTab0() {
             const validData = getValidProjects(filteredData);
             const container = document.getElementById('tab-0');
             
-            if (validData.length === 0) {{
+            if (validData.length === 0) {
                 container.innerHTML = '<div class="warning-box">当前筛选条件下暂无数据。</div>';
                 return;
-            }}
+            }
             
             // 计算统计数据
             const totalCount = validData.length;
-            const totalAmount = validData.reduce((sum, d) => sum + (parseFloat(d.拟定金额) || 0), 0);
             
             // 尝试提取预算系统合计（从原始数据中查找汇总行）
             let budgetTotal = 0;
             const allDataForBudget = getValidProjects(allData);
-            for (let d of allDataForBudget) {{
+            for (let d of allDataForBudget) {
                 const seq = String(d.序号 || '').trim();
-                if (seq === '预算系统合计' || seq === '合计') {{
-                    const amt = parseFloat(d.拟定金额) || parseFloat(d.金额) || parseFloat(d.预算) || 0;
-                    if (amt > 0) {{
+                if (seq === '预算系统合计' || seq === '合计') {
+                    const amt = d[AMOUNT] || parseFloat(d.金额) || parseFloat(d.预算) || 0;
+                    if (amt > 0) {
                         budgetTotal = amt;
                         break;
-                    }}
-                }}
-            }}
-            const diff = totalAmount - budgetTotal;
-            
-            // 按园区统计
-            const parkStats = {{}};
-            validData.forEach(d => {{
-                const park = d.园区 || '未知';
-                if (!parkStats[park]) {{
-                    parkStats[park] = {{count: 0, amount: 0}};
-                }}
-                parkStats[park].count++;
-                parkStats[park].amount += parseFloat(d.拟定金额) || 0;
-            }});
-            
-            // 按所属区域统计
-            const regionStats = {{}};
-            validData.forEach(d => {{
-                const region = d.所属区域 || '其他';
-                if (region !== '其他') {{
-                    if (!regionStats[region]) {{
-                        regionStats[region] = {{count: 0, amount: 0, parks: new Set()}};
-                    }}
-                    regionStats[region].count++;
-                    regionStats[region].amount += parseFloat(d.拟定金额) || 0;
-                    if (d.园区) regionStats[region].parks.add(d.园区);
-                }}
-            }});
+                    }
+                }
+            }
             
-            // 按项目分级统计
-            const levelStats = {{}};
-            validData.forEach(d => {{
-                const level = d.项目分级 || '未分类';
-                if (!levelStats[level]) {{
-                    levelStats[level] = {{count: 0, amount: 0}};
-                }}
-                levelStats[level].count++;
-                levelStats[level].amount += parseFloat(d.拟定金额) || 0;
-            }});
+            // 按园区统计、各园区分类项目统计
+            const {parkStats, parkAnalysis} = aggregateParks();
             
-            // 映射：一级->一类，二级->二类，三级->三类
-            const levelMapping = {{'一级': '一类', '二级': '二类', '三级': '三类'}};
-            const levelStatsMapped = {{}};
-            Object.keys(levelStats).forEach(level => {{
-                const mappedLevel = levelMapping[level] || level;
-                if (!levelStatsMapped[mappedLevel]) {{
-                    levelStatsMapped[mappedLevel] = {{count: 0, amount: 0}};
-                }}
-                levelStatsMapped[mappedLevel].count += levelStats[level].count;
-                levelStatsMapped[mappedLevel].amount += levelStats[level].amount;
-            }});
+            // 实施列、立项列与专业分包列（各记录字段相同，看首条即可）：渲染开始时确定一次，表格、交叉统计与图表共用
+            const implCol = COLS.impl;
+            const 立项Col = COLS.立项;
+            const hasProfSubcontract = !!(validData[0].专业分包 || validData[0].专业细分);
+            const profSubcontractCol = validData[0].专业分包 ? '专业分包' : '专业细分';
             
-            // 项目实施状态分析
-            let implCol = null;
-            for (let key in validData[0]) {{
-                if (key.includes('实施') && !key.toLowerCase().includes('时间')) {{
-                    implCol = key;
-                    break;
-                }}
-            }}
+            // 其余汇总在一遍遍历中完成：总金额、所属区域（含区域下园区）、项目分级、
+            // 实施状态、确定状态与月度（立项日期天数已在生成端按园区向下填充）、专业分包及交叉统计
+            let totalAmount = 0;
+            const regionStats = {};
+            const regionParkStats = {};
+            const levelStats = {};
+            // 各分组只用到项目数与金额，随分组同时计数、累加，不再收集记录数组
+            let 已实施项目数 = 0;
+            let 未实施项目数 = 0;
+            let 确定项目数 = 0;
+            let 未确定项目数 = 0;
+            let 已实施金额 = 0;
+            let 未实施金额 = 0;
+            let 确定金额 = 0;
+            let 未确定金额 = 0;
+            const parkImplStats = {};
+            const parkDeterminationStats = {};
+            const monthlyStats = {};
+            // 立项月份按月序号累加，循环后自最小月份到最大月份顺序取出，无需再按字符串排序
+            const monthlyByIdx = new Map();
+            let minMonth = Infinity;
+            let maxMonth = -Infinity;
+            const profSubcontractStats = {};
+            const crossStats = {};
+            const nowDays = Date.now() / 864e5;
             
-            let 已实施项目 = [];
-            let 未实施项目 = [];
-            let parkImplStats = {{}};
+            // 区域及区域内园区按分组编号累加，循环后再按首次出现顺序还原为对象
+            const otherRegionId = groupNames.所属区域.indexOf('其他');
+            const parkGroupCount = groupNames.园区.length;
+            const regionCounts = new Int32Array(groupNames.所属区域.length);
+            const regionAmounts = new Float64Array(groupNames.所属区域.length);
+            const regionParkCounts = new Int32Array(groupNames.所属区域.length);
+            const regionOrder = [];
+            // 区域编号 * 园区数 + 园区编号 -> 区域内园区统计
+            const regionParkCells = new Map();
             
-            if (implCol) {{
-                const now = new Date();
-                validData.forEach(d => {{
-                    const implDate = parseDate(d[implCol]);
-                    const isImplemented = implDate !== null && implDate <= now;
-                    
-                    if (isImplemented) {{
-                        已实施项目.push(d);
-                    }} else {{
-                        未实施项目.push(d);
-                    }}
-                    
-                    const park = d.园区 || '未知';
-                    if (!parkImplStats[park]) {{
-                        parkImplStats[park] = {{total: 0, implemented: 0, amount: 0, implAmount: 0}};
-                    }}
+            validData.forEach(d => {
+                const amount = d[AMOUNT];
+                const park = d.园区 || '未知';
+                totalAmount += amount;
+                
+                const regionId = d[GROUP_ID.所属区域];
+                if (regionId !== otherRegionId) {
+                    if (regionCounts[regionId]++ === 0) regionOrder.push(regionId);
+                    regionAmounts[regionId] += amount;
+                    // 园区数随区域内园区明细首次出现时计数，无需另建 Set
+                    const cellKey = regionId * parkGroupCount + d[GROUP_ID.园区];
+                    let cell = regionParkCells.get(cellKey);
+                    if (!cell) {
+                        cell = {count: 0, amount: 0};
+                        regionParkCells.set(cellKey, cell);
+                        if (d.园区) regionParkCounts[regionId]++;
+                    }
+                    cell.count++;
+                    cell.amount += amount;
+                }
+                
+                const level = d.项目分级 || '未分类';
+                if (!levelStats[level]) {
+                    levelStats[level] = {count: 0, amount: 0};
+                }
+                levelStats[level].count++;
+                levelStats[level].amount += amount;
+                
+                if (implCol) {
+                    const implDay = d[DAYS.impl];
+                    const isImplemented = implDay >= 0 && implDay <= nowDays;
+                    if (isImplemented) {
+                        已实施项目数++;
+                        已实施金额 += amount;
+                    } else {
+                        未实施项目数++;
+                        未实施金额 += amount;
+                    }
+                    if (!parkImplStats[park]) {
+                        parkImplStats[park] = {total: 0, implemented: 0, amount: 0, implAmount: 0};
+                    }
                     parkImplStats[park].total++;
-                    parkImplStats[park].amount += parseFloat(d.拟定金额) || 0;
-                    if (isImplemented) {{
+                    parkImplStats[park].amount += amount;
+                    if (isImplemented) {
                         parkImplStats[park].implemented++;
-                        parkImplStats[park].implAmount += parseFloat(d.拟定金额) || 0;
-                    }}
-                }});
-            }}
-            
-            // 项目确定状态分析（有立项日期）
-            let 立项Col = null;
-            for (let key in validData[0]) {{
-                if ((key.includes('需求立项') || key.includes('项目立项') || key.includes('立项日期') || key.includes('立项')) &&
-                    !key.includes('审核') && !key.includes('决策') && !key.includes('成本')) {{
-                    立项Col = key;
-                    break;
-                }}
-            }}
-            
-            let 确定项目 = [];
-            let 未确定项目 = [];
-            let parkDeterminationStats = {{}};
-            let monthlyStats = {{}};
-            
-            if (立项Col) {{
-                // 按园区分组，向下填充空值（模拟合并单元格）
-                const parkGroups = {{}};
-                validData.forEach(d => {{
-                    const park = d.园区 || '未知';
-                    if (!parkGroups[park]) parkGroups[park] = [];
-                    parkGroups[park].push(d);
-                }});
-                
-                Object.keys(parkGroups).forEach(park => {{
-                    let lastDate = null;
-                    parkGroups[park].forEach(d => {{
-                        const dateVal = d[立项Col];
-                        if (dateVal && dateVal !== null && dateVal !== '') {{
-                            lastDate = dateVal;
-                        }} else if (lastDate) {{
-                            d[立项Col + '_filled'] = lastDate;
-                        }} else {{
-                            d[立项Col + '_filled'] = dateVal;
-                        }}
-                    }});
-                }});
+                        parkImplStats[park].implAmount += amount;
+                    }
+                }
                 
-                validData.forEach(d => {{
-                    const dateVal = d[立项Col + '_filled'] || d[立项Col];
-                    const hasDate = parseDate(dateVal) !== null;
-                    
-                    if (hasDate) {{
-                        确定项目.push(d);
-                        
-                        // 按月统计
-                        const date = parseDate(dateVal);
-                        if (date) {{
-                            const month = date.getFullYear() + '-' + String(date.getMonth() + 1).padStart(2, '0');
-                            if (!monthlyStats[month]) {{
-                                monthlyStats[month] = {{count: 0, amount: 0}};
-                            }}
-                            monthlyStats[month].count++;
-                            monthlyStats[month].amount += parseFloat(d.拟定金额) || 0;
-                        }}
-                    }} else {{
-                        未确定项目.push(d);
-                    }}
-                    
-                    const park = d.园区 || '未知';
-                    if (!parkDeterminationStats[park]) {{
-                        parkDeterminationStats[park] = {{total: 0, determined: 0}};
-                    }}
+                if (立项Col) {
+                    const day = d[DAYS.立项];
+                    const hasDate = day >= 0;
+                    if (hasDate) {
+                        确定项目数++;
+                        确定金额 += amount;
+                        const monthIdx = monthIndex(day);
+                        let monthStats = monthlyByIdx.get(monthIdx);
+                        if (!monthStats) {
+                            monthStats = {count: 0, amount: 0};
+                            monthlyByIdx.set(monthIdx, monthStats);
+                            if (monthIdx < minMonth) minMonth = monthIdx;
+                            if (monthIdx > maxMonth) maxMonth = monthIdx;
+                        }
+                        monthStats.count++;
+                        monthStats.amount += amount;
+                    } else {
+                        未确定项目数++;
+                        未确定金额 += amount;
+                    }
+                    if (!parkDeterminationStats[park]) {
+                        parkDeterminationStats[park] = {total: 0, determined: 0};
+                    }
                     parkDeterminationStats[park].total++;
                     if (hasDate) parkDeterminationStats[park].determined++;
-                }});
-            }}
-            
-            // 各园区分类项目统计
-            const parkAnalysis = {{}};
-            validData.forEach(d => {{
-                const park = d.园区 || '未知';
-                if (!parkAnalysis[park]) {{
-                    parkAnalysis[park] = {{
-                        total: 0,
-                        level1: 0,
-                        hq: 0,
-                        major: 0,
-                        majorCount: 0
-                    }};
-                }}
-                const amount = parseFloat(d.拟定金额) || 0;
-                parkAnalysis[park].total += amount;
-                
-                // 一级项目识别：支持多种格式（一级、1级、一级项目、1等）
-                const levelStr = String(d.项目分级 || '').trim();
-                let isLevel1 = false;
-                // 字符串匹配：包含"一级"或"1级"
-                if (levelStr && (levelStr.includes('一级') || levelStr.includes('1级'))) {{
-                    isLevel1 = true;
-                }}
-                // 数字匹配：如果是数字1
-                if (!isLevel1) {{
-                    const levelNum = parseFloat(levelStr);
-                    if (!isNaN(levelNum) && levelNum === 1) {{
-                        isLevel1 = true;
-                    }}
-                }}
-                if (isLevel1) {{
-                    parkAnalysis[park].level1 += amount;
-                }}
-                
-                const hqFocus = String(d.总部重点关注项目 || '').trim();
-                if (hqFocus === '是' || hqFocus.toLowerCase() === 'yes') {{
-                    parkAnalysis[park].hq += amount;
-                }}
+                }
                 
-                if (amount >= 200) {{
-                    parkAnalysis[park].major += amount;
-                    parkAnalysis[park].majorCount++;
-                }}
-            }});
+                if (hasProfSubcontract) {
+                    const subcontract = d[profSubcontractCol] || '未分类';
+                    if (!profSubcontractStats[subcontract]) {
+                        profSubcontractStats[subcontract] = {count: 0, amount: 0};
+                    }
+                    profSubcontractStats[subcontract].count++;
+                    profSubcontractStats[subcontract].amount += amount;
+                    // 交叉统计过滤掉"其它系统"分类
+                    if (!d[OTHER_PROF]) {
+                        const prof = d.专业 || '未分类';
+                        const key = prof + '|' + subcontract;
+                        if (!crossStats[key]) {
+                            crossStats[key] = {prof: prof, subcontract: subcontract, count: 0, amount: 0};
+                        }
+                        crossStats[key].count++;
+                        crossStats[key].amount += amount;
+                    }
+                }
+            });
+            regionOrder.forEach(id => {
+                const region = groupNames.所属区域[id];
+                regionStats[region] = {count: regionCounts[id], amount: regionAmounts[id], parkCount: regionParkCounts[id]};
+                regionParkStats[region] = {};
+            });
+            regionParkCells.forEach((cell, cellKey) => {
+                const region = groupNames.所属区域[Math.floor(cellKey / parkGroupCount)];
+                regionParkStats[region][groupNames.园区[cellKey % parkGroupCount]] = cell;
+            });
+            const diff = totalAmount - budgetTotal;
             
-            let html = `
-                <div class="section">
+            // 映射：一级->一类，二级->二类，三级->三类
+            const levelMapping = {'一级': '一类', '二级': '二类', '三级': '三类'};
+            const levelStatsMapped = {};
+            Object.keys(levelStats).forEach(level => {
+                const mappedLevel = levelMapping[level] || level;
+                if (!levelStatsMapped[mappedLevel]) {
+                    levelStatsMapped[mappedLevel] = {count: 0, amount: 0};
+                }
+                levelStatsMapped[mappedLevel].count += levelStats[level].count;
+                levelStatsMapped[mappedLevel].amount += levelStats[level].amount;
+            });
+            
+            // 各表格与图表共用的排序结果，每次渲染只排序一次
+            const parkKeysByAmount = Object.keys(parkStats).sort((a, b) => parkStats[b].amount - parkStats[a].amount);
+            const regionKeysByCount = Object.keys(regionStats).sort((a, b) => regionStats[b].count - regionStats[a].count);
+            const parkKeysByTotal = Object.keys(parkAnalysis).sort((a, b) => parkAnalysis[b].total - parkAnalysis[a].total);
+            const sortedMonths = [];
+            for (let idx = minMonth; idx <= maxMonth; idx++) {
+                const monthStats = monthlyByIdx.get(idx);
+                if (!monthStats) continue;
+                const month = monthKeyOf(idx);
+                sortedMonths.push(month);
+                monthlyStats[month] = monthStats;
+            }
+            const profSubcontractKeysByAmount = Object.keys(profSubcontractStats).sort((a, b) => profSubcontractStats[b].amount - profSubcontractStats[a].amount);
+            
+            const overviewHTML = `
                     <h2>📊 项目数量与费用统计</h2>
                     <div class="metrics">
                         <div class="metric">
                             <div class="metric-label">项目总数</div>
-                            <div class="metric-value">${{formatNumber(totalCount)}}</div>
+                            <div class="metric-value">${formatNumber(totalCount)}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">总金额（万元）</div>
-                            <div class="metric-value">${{formatCurrency(totalAmount)}}</div>
+                            <div class="metric-value">${formatCurrency(totalAmount)}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">预算系统合计（万元）</div>
-                            <div class="metric-value">${{budgetTotal > 0 ? formatCurrency(budgetTotal) : '未找到'}}</div>
+                            <div class="metric-value">${budgetTotal > 0 ? formatCurrency(budgetTotal) : '未找到'}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">差值（万元）</div>
-                            <div class="metric-value" style="color: ${{diff !== 0 ? (diff > 0 ? '#d32f2f' : '#388e3c') : '#666'}};">${{formatCurrency(diff)}}</div>
+                            <div class="metric-value" style="color: ${diff !== 0 ? (diff > 0 ? '#d32f2f' : '#388e3c') : '#666'};">${formatCurrency(diff)}</div>
                         </div>
                     </div>
                     
@@ -3311,18 +3686,18 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>园区</th><th>项目数</th><th>金额合计（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(parkStats).sort((a, b) => parkStats[b].amount - parkStats[a].amount).map(park => `
+                                ${parkKeysByAmount.map(park => `
                                     <tr>
-                                        <td>${{park}}</td>
-                                        <td>${{parkStats[park].count}}</td>
-                                        <td>${{formatCurrency(parkStats[park].amount)}}</td>
+                                        <td>${park}</td>
+                                        <td>${parkStats[park].count}</td>
+                                        <td>${formatCurrency(parkStats[park].amount)}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
                     
-                    ${{Object.keys(regionStats).length > 0 ? `
+                    ${Object.keys(regionStats).length > 0 ? `
                     <h3>按所属区域统计</h3>
                     <div class="data-table-container">
                         <table>
@@ -3330,34 +3705,25 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>所属区域</th><th>项目数</th><th>金额合计（万元）</th><th>园区数</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(regionStats).sort((a, b) => regionStats[b].count - regionStats[a].count).map(region => `
+                                ${regionKeysByCount.map(region => `
                                     <tr>
-                                        <td>${{region}}</td>
-                                        <td>${{regionStats[region].count}}</td>
-                                        <td>${{formatCurrency(regionStats[region].amount)}}</td>
-                                        <td>${{regionStats[region].parks.size}}</td>
+                                        <td>${region}</td>
+                                        <td>${regionStats[region].count}</td>
+                                        <td>${formatCurrency(regionStats[region].amount)}</td>
+                                        <td>${regionStats[region].parkCount}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
                     
                     <h4>各区域下园区明细</h4>
-                    ${{Object.keys(regionStats).sort((a, b) => regionStats[b].count - regionStats[a].count).map(region => {{
-                        const regionData = validData.filter(d => d.所属区域 === region);
-                        const parkStatsInRegion = {{}};
-                        regionData.forEach(d => {{
-                            const park = d.园区 || '未知';
-                            if (!parkStatsInRegion[park]) {{
-                                parkStatsInRegion[park] = {{count: 0, amount: 0}};
-                            }}
-                            parkStatsInRegion[park].count++;
-                            parkStatsInRegion[park].amount += parseFloat(d.拟定金额) || 0;
-                        }});
+                    ${regionKeysByCount.map(region => {
+                        const parkStatsInRegion = regionParkStats[region] || {};
                         return `
                             <div class="expander">
                                 <div class="expander-header" onclick="toggleExpander(this)">
-                                    <span><strong>${{region}}</strong>（${{Object.keys(parkStatsInRegion).length}}个园区，${{regionStats[region].count}}个项目，${{formatCurrency(regionStats[region].amount)}}万元）</span>
+                                    <span><strong>${region}</strong>（${Object.keys(parkStatsInRegion).length}个园区，${regionStats[region].count}个项目，${formatCurrency(regionStats[region].amount)}万元）</span>
                                     <span class="expander-icon">▶</span>
                                 </div>
                                 <div class="expander-content">
@@ -3367,22 +3733,24 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                                 <tr><th>园区</th><th>项目数</th><th>金额合计（万元）</th></tr>
                                             </thead>
                                             <tbody>
-                                                ${{Object.keys(parkStatsInRegion).sort((a, b) => parkStatsInRegion[b].amount - parkStatsInRegion[a].amount).map(park => `
+                                                ${Object.keys(parkStatsInRegion).sort((a, b) => parkStatsInRegion[b].amount - parkStatsInRegion[a].amount).map(park => `
                                                     <tr>
-                                                        <td>${{park}}</td>
-                                                        <td>${{parkStatsInRegion[park].count}}</td>
-                                                        <td>${{formatCurrency(parkStatsInRegion[park].amount)}}</td>
+                                                        <td>${park}</td>
+                                                        <td>${parkStatsInRegion[park].count}</td>
+                                                        <td>${formatCurrency(parkStatsInRegion[park].amount)}</td>
                                                     </tr>
-                                                `).join('')}}
+                                                `).join('')}
                                             </tbody>
                                         </table>
                                     </div>
                                 </div>
                             </div>
                         `;
-                    }}).join('')}}
-                    ` : ''}}
-                    
+                    }).join('')}
+                    ` : ''}
+            `;
+            
+            const levelHTML = `
                     <h3>📈 项目分级占比统计</h3>
                     <div class="data-table-container">
                         <table>
@@ -3390,21 +3758,21 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>项目类别</th><th>项目数</th><th>项目数占比(%)</th><th>金额合计（万元）</th><th>金额占比(%)</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(levelStatsMapped).map(level => {{
+                                ${Object.keys(levelStatsMapped).map(level => {
                                     const count = levelStatsMapped[level].count;
                                     const amount = levelStatsMapped[level].amount;
                                     const countPercent = totalCount > 0 ? (count / totalCount * 100).toFixed(2) : 0;
                                     const amountPercent = totalAmount > 0 ? (amount / totalAmount * 100).toFixed(2) : 0;
                                     return `
                                         <tr>
-                                            <td>${{level}}</td>
-                                            <td>${{count}}</td>
-                                            <td>${{countPercent}}%</td>
-                                            <td>${{formatCurrency(amount)}}</td>
-                                            <td>${{amountPercent}}%</td>
+                                            <td>${level}</td>
+                                            <td>${count}</td>
+                                            <td>${countPercent}%</td>
+                                            <td>${formatCurrency(amount)}</td>
+                                            <td>${amountPercent}%</td>
                                         </tr>
                                     `;
-                                }}).join('')}}
+                                }).join('')}
                             </tbody>
                         </table>
                     </div>
@@ -3415,8 +3783,9 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                     <div class="chart-container">
                         <div id="chart-level-amount"></div>
                     </div>
-                    
-                    ${{(validData[0] && (validData[0].专业分包 || validData[0].专业细分)) ? `
+            `;
+            
+            const profHTML = hasProfSubcontract ? `
                     <h3>📦 按专业分包统计</h3>
                     <div class="data-table-container">
                         <table>
@@ -3424,34 +3793,20 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>专业分包</th><th>项目数</th><th>项目数占比(%)</th><th>金额合计（万元）</th><th>金额占比(%)</th></tr>
                             </thead>
                             <tbody>
-                                ${{(() => {{
-                                    const profSubcontractCol = validData[0].专业分包 ? '专业分包' : '专业细分';
-                                    const profSubcontractStats = {{}};
-                                    validData.forEach(d => {{
-                                        const val = d[profSubcontractCol] || '未分类';
-                                        if (!profSubcontractStats[val]) {{
-                                            profSubcontractStats[val] = {{count: 0, amount: 0}};
-                                        }}
-                                        profSubcontractStats[val].count++;
-                                        profSubcontractStats[val].amount += parseFloat(d.拟定金额) || 0;
-                                    }});
-                                    const totalCount = validData.length;
-                                    const totalAmount = validData.reduce((sum, d) => sum + (parseFloat(d.拟定金额) || 0), 0);
-                                    return Object.keys(profSubcontractStats).sort((a, b) => profSubcontractStats[b].amount - profSubcontractStats[a].amount).map(key => {{
-                                        const stats = profSubcontractStats[key];
-                                        const countPercent = totalCount > 0 ? (stats.count / totalCount * 100).toFixed(2) : 0;
-                                        const amountPercent = totalAmount > 0 ? (stats.amount / totalAmount * 100).toFixed(2) : 0;
-                                        return `
+                                ${profSubcontractKeysByAmount.map(key => {
+                                    const stats = profSubcontractStats[key];
+                                    const countPercent = totalCount > 0 ? (stats.count / totalCount * 100).toFixed(2) : 0;
+                                    const amountPercent = totalAmount > 0 ? (stats.amount / totalAmount * 100).toFixed(2) : 0;
+                                    return `
                                             <tr>
-                                                <td>${{key || '未分类'}}</td>
-                                                <td>${{stats.count}}</td>
-                                                <td>${{countPercent}}%</td>
-                                                <td>${{formatCurrency(stats.amount)}}</td>
-                                                <td>${{amountPercent}}%</td>
+                                                <td>${key || '未分类'}</td>
+                                                <td>${stats.count}</td>
+                                                <td>${countPercent}%</td>
+                                                <td>${formatCurrency(stats.amount)}</td>
+                                                <td>${amountPercent}%</td>
                                             </tr>
                                         `;
-                                    }}).join('');
-                                }})()}}
+                                }).join('')}
                             </tbody>
                         </table>
                     </div>
@@ -3470,60 +3825,49 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>专业</th><th>专业分包</th><th>项目数</th><th>金额合计（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{(() => {{
-                                    const profSubcontractCol = validData[0].专业分包 ? '专业分包' : '专业细分';
-                                    const crossStats = {{}};
-                                    validData.forEach(d => {{
-                                        const prof = d.专业 || '未分类';
-                                        const subcontract = d[profSubcontractCol] || '未分类';
-                                        // 过滤掉"其它系统"分类
-                                        if (prof === '其它系统' || prof === '其他系统') return;
-                                        const key = prof + '|' + subcontract;
-                                        if (!crossStats[key]) {{
-                                            crossStats[key] = {{prof: prof, subcontract: subcontract, count: 0, amount: 0}};
-                                        }}
-                                        crossStats[key].count++;
-                                        crossStats[key].amount += parseFloat(d.拟定金额) || 0;
-                                    }});
-                                    return Object.keys(crossStats).sort((a, b) => crossStats[b].amount - crossStats[a].amount).map(key => {{
-                                        const stats = crossStats[key];
-                                        return `
+                                ${(() => {
+                                    const keys = Object.keys(crossStats).sort((a, b) => crossStats[b].amount - crossStats[a].amount);
+                                    const rows = new Array(keys.length);
+                                    for (let i = 0; i < keys.length; i++) {
+                                        const stats = crossStats[keys[i]];
+                                        rows[i] = `
                                             <tr>
-                                                <td>${{stats.prof || '未分类'}}</td>
-                                                <td>${{stats.subcontract || '未分类'}}</td>
-                                                <td>${{stats.count}}</td>
-                                                <td>${{formatCurrency(stats.amount)}}</td>
+                                                <td>${stats.prof || '未分类'}</td>
+                                                <td>${stats.subcontract || '未分类'}</td>
+                                                <td>${stats.count}</td>
+                                                <td>${formatCurrency(stats.amount)}</td>
                                             </tr>
                                         `;
-                                    }}).join('');
-                                }})()}}
+                                    }
+                                    return rows.join('');
+                                })()}
                             </tbody>
                         </table>
                     </div>
-                    ` : ''}}
-                    
-                    ${{implCol ? `
+            ` : '';
+            
+            const implHTML = implCol ? `
                     <h3>🔧 项目实施状态分析</h3>
                     <div class="metrics">
                         <div class="metric">
                             <div class="metric-label">已实施项目数</div>
-                            <div class="metric-value">${{已实施项目.length}}</div>
+                            <div class="metric-value">${已实施项目数}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">已实施金额（万元）</div>
-                            <div class="metric-value">${{formatCurrency(已实施项目.reduce((sum, d) => sum + (parseFloat(d.拟定金额) || 0), 0))}}</div>
+                            <div class="metric-value">${formatCurrency(已实施金额)}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">未实施项目数</div>
-                            <div class="metric-value">${{未实施项目.length}}</div>
+                            <div class="metric-value">${未实施项目数}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">未实施金额（万元）</div>
-                            <div class="metric-value">${{formatCurrency(未实施项目.reduce((sum, d) => sum + (parseFloat(d.拟定金额) || 0), 0))}}</div>
+                            <div class="metric-value">${formatCurrency(未实施金额)}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">实施率</div>
-                            <div class="metric-value">${{validData.length > 0 ? (已实施项目.length / validData.length * 100).toFixed(1) : 0}}%</div>
+                            <div class="metric-value">${validData.length > 0 ? (已实施项目数 / validData.length * 100).toFixed(1) : 0}%</div>
                         </div>
                     </div>
                     
@@ -3534,30 +3878,30 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>园区</th><th>总项目数</th><th>已实施数</th><th>未实施数</th><th>总金额（万元）</th><th>已实施金额（万元）</th><th>实施率(%)</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(parkImplStats).sort((a, b) => parkImplStats[b].amount - parkImplStats[a].amount).map(park => {{
+                                ${Object.keys(parkImplStats).sort((a, b) => parkImplStats[b].amount - parkImplStats[a].amount).map(park => {
                                     const stats = parkImplStats[park];
                                     const rate = stats.total > 0 ? (stats.implemented / stats.total * 100).toFixed(1) : 0;
                                     return `
                                         <tr>
-                                            <td>${{park}}</td>
-                                            <td>${{stats.total}}</td>
-                                            <td>${{stats.implemented}}</td>
-                                            <td>${{stats.total - stats.implemented}}</td>
-                                            <td>${{formatCurrency(stats.amount)}}</td>
-                                            <td>${{formatCurrency(stats.implAmount)}}</td>
-                                            <td>${{rate}}%</td>
+                                            <td>${park}</td>
+                                            <td>${stats.total}</td>
+                                            <td>${stats.implemented}</td>
+                                            <td>${stats.total - stats.implemented}</td>
+                                            <td>${formatCurrency(stats.amount)}</td>
+                                            <td>${formatCurrency(stats.implAmount)}</td>
+                                            <td>${rate}%</td>
                                         </tr>
                                     `;
-                                }}).join('')}}
+                                }).join('')}
                             </tbody>
                         </table>
                     </div>
-                    ` : '<div class="info-box">未找到实施日期列，无法进行实施状态分析。</div>'
-                    }}
-                    
+            ` : '<div class="info-box">未找到实施日期列，无法进行实施状态分析。</div>';
+            
+            const parkHTML = `
                     <h3>🏢 各园区分类项目统计</h3>
                     
-                    ${{(() => {{
+                    ${(() => {
                         const totalLevel1 = Object.values(parkAnalysis).reduce((sum, s) => sum + s.level1, 0);
                         const totalHq = Object.values(parkAnalysis).reduce((sum, s) => sum + s.hq, 0);
                         const totalMajor = Object.values(parkAnalysis).reduce((sum, s) => sum + s.major, 0);
@@ -3566,23 +3910,23 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                             <div class="metrics">
                                 <div class="metric">
                                     <div class="metric-label">一级项目总金额</div>
-                                    <div class="metric-value">${{formatCurrency(totalLevel1)}} 万元</div>
+                                    <div class="metric-value">${formatCurrency(totalLevel1)} 万元</div>
                                 </div>
                                 <div class="metric">
                                     <div class="metric-label">总部项目总金额</div>
-                                    <div class="metric-value">${{formatCurrency(totalHq)}} 万元</div>
+                                    <div class="metric-value">${formatCurrency(totalHq)} 万元</div>
                                 </div>
                                 <div class="metric">
                                     <div class="metric-label">重大改造项目总金额</div>
-                                    <div class="metric-value">${{formatCurrency(totalMajor)}} 万元</div>
+                                    <div class="metric-value">${formatCurrency(totalMajor)} 万元</div>
                                 </div>
                                 <div class="metric">
                                     <div class="metric-label">所有项目总金额</div>
-                                    <div class="metric-value">${{formatCurrency(totalAll)}} 万元</div>
+                                    <div class="metric-value">${formatCurrency(totalAll)} 万元</div>
                                 </div>
                             </div>
                         `;
-                    }})()}}
+                    })()}
                     
                     <div class="data-table-container">
                         <table>
@@ -3590,25 +3934,33 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>园区</th><th>一级项目金额（万元）</th><th>一级项目占比(%)</th><th>总部项目金额（万元）</th><th>总部项目占比(%)</th><th>重大改造项目数</th><th>重大改造项目金额（万元）</th><th>重大改造项目占比(%)</th><th>总金额（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(parkAnalysis).sort((a, b) => parkAnalysis[b].total - parkAnalysis[a].total).map(park => {{
-                                    const stats = parkAnalysis[park];
-                                    const level1Percent = stats.total > 0 ? (stats.level1 / stats.total * 100).toFixed(2) : 0;
-                                    const hqPercent = stats.total > 0 ? (stats.hq / stats.total * 100).toFixed(2) : 0;
-                                    const majorPercent = stats.total > 0 ? (stats.major / stats.total * 100).toFixed(2) : 0;
-                                    return `
+                                ${(() => {
+                                    const rows = new Array(parkKeysByTotal.length);
+                                    for (let i = 0; i < parkKeysByTotal.length; i++) {
+                                        const park = parkKeysByTotal[i];
+                                        const stats = parkAnalysis[park];
+                                        // 同一行三个占比共用一次倒数
+                                        const hasTotal = stats.total > 0;
+                                        const inv = hasTotal ? 100 / stats.total : 0;
+                                        const level1Percent = hasTotal ? (stats.level1 * inv).toFixed(2) : 0;
+                                        const hqPercent = hasTotal ? (stats.hq * inv).toFixed(2) : 0;
+                                        const majorPercent = hasTotal ? (stats.major * inv).toFixed(2) : 0;
+                                        rows[i] = `
                                         <tr>
-                                            <td>${{park}}</td>
-                                            <td>${{formatCurrency(stats.level1)}}</td>
-                                            <td>${{level1Percent}}%</td>
-                                            <td>${{formatCurrency(stats.hq)}}</td>
-                                            <td>${{hqPercent}}%</td>
-                                            <td>${{stats.majorCount}}</td>
-                                            <td>${{formatCurrency(stats.major)}}</td>
-                                            <td>${{majorPercent}}%</td>
-                                            <td>${{formatCurrency(stats.total)}}</td>
+                                            <td>${park}</td>
+                                            <td>${formatCurrency(stats.level1)}</td>
+                                            <td>${level1Percent}%</td>
+                                            <td>${formatCurrency(stats.hq)}</td>
+                                            <td>${hqPercent}%</td>
+                                            <td>${stats.majorCount}</td>
+                                            <td>${formatCurrency(stats.major)}</td>
+                                            <td>${majorPercent}%</td>
+                                            <td>${formatCurrency(stats.total)}</td>
                                         </tr>
                                     `;
-                                }}).join('')}}
+                                    }
+                                    return rows.join('');
+                                })()}
                             </tbody>
                         </table>
                     </div>
@@ -3636,25 +3988,26 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                     <div class="chart-container">
                         <div id="chart-park-major-count"></div>
                     </div>
-                    
-                    ${{立项Col ? `
+            `;
+            
+            const determinationHTML = 立项Col ? `
                     <h3>✅ 项目确定状态分析</h3>
                     <div class="metrics">
                         <div class="metric">
                             <div class="metric-label">已确定项目数（有立项日期）</div>
-                            <div class="metric-value">${{确定项目.length}}</div>
+                            <div class="metric-value">${确定项目数}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">已确定金额合计（万元）</div>
-                            <div class="metric-value">${{formatCurrency(确定项目.reduce((sum, d) => sum + (parseFloat(d.拟定金额) || 0), 0))}}</div>
+                            <div class="metric-value">${formatCurrency(确定金额)}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">未确定项目数（无立项日期）</div>
-                            <div class="metric-value">${{未确定项目.length}}</div>
+                            <div class="metric-value">${未确定项目数}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">未确定金额合计（万元）</div>
-                            <div class="metric-value">${{formatCurrency(未确定项目.reduce((sum, d) => sum + (parseFloat(d.拟定金额) || 0), 0))}}</div>
+                            <div class="metric-value">${formatCurrency(未确定金额)}</div>
                         </div>
                     </div>
                     
@@ -3665,24 +4018,24 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>园区</th><th>总项目数</th><th>已确定数</th><th>未确定数</th><th>确定率(%)</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(parkDeterminationStats).map(park => {{
+                                ${Object.keys(parkDeterminationStats).map(park => {
                                     const stats = parkDeterminationStats[park];
                                     const rate = stats.total > 0 ? (stats.determined / stats.total * 100).toFixed(1) : 0;
                                     return `
                                         <tr>
-                                            <td>${{park}}</td>
-                                            <td>${{stats.total}}</td>
-                                            <td>${{stats.determined}}</td>
-                                            <td>${{stats.total - stats.determined}}</td>
-                                            <td>${{rate}}%</td>
+                                            <td>${park}</td>
+                                            <td>${stats.total}</td>
+                                            <td>${stats.determined}</td>
+                                            <td>${stats.total - stats.determined}</td>
+                                            <td>${rate}%</td>
                                         </tr>
                                     `;
-                                }}).join('')}}
+                                }).join('')}
                             </tbody>
                         </table>
                     </div>
                     
-                    ${{Object.keys(monthlyStats).length > 0 ? `
+                    ${Object.keys(monthlyStats).length > 0 ? `
                     <h3>📅 按月份统计立项</h3>
                     <div class="data-table-container">
                         <table>
@@ -3690,13 +4043,13 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>立项月份</th><th>立项项目数</th><th>立项金额（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(monthlyStats).sort().map(month => `
+                                ${sortedMonths.map(month => `
                                     <tr>
-                                        <td>${{month}}</td>
-                                        <td>${{monthlyStats[month].count}}</td>
-                                        <td>${{formatCurrency(monthlyStats[month].amount)}}</td>
+                                        <td>${month}</td>
+                                        <td>${monthlyStats[month].count}</td>
+                                        <td>${formatCurrency(monthlyStats[month].amount)}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
@@ -3708,501 +4061,449 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                         <div id="chart-monthly-amount"></div>
                     </div>
                     ` : ''
-                    }}
-                    ` : '<div class="info-box">未找到立项日期列，无法进行确定/未确定项目分析。</div>'
-                    }}
-                </div>
-            `;
+                    }
+            ` : '<div class="info-box">未找到立项日期列，无法进行确定/未确定项目分析。</div>';
             
-            container.innerHTML = html;
+            renderSections(0, container, {
+                overview: overviewHTML,
+                level: levelHTML,
+                prof: profHTML,
+                impl: implHTML,
+                park: parkHTML,
+                determination: determinationHTML,
+            });
             
-            // 渲染图表
-            setTimeout(() => {{
+            // 渲染图表：先准备各图数据，图表进入视口后再逐个绘制
+            setTimeout(() => {
+                const charts = [];
                 const levelLabels = Object.keys(levelStatsMapped);
                 const levelCounts = levelLabels.map(l => levelStatsMapped[l].count);
                 const levelAmounts = levelLabels.map(l => levelStatsMapped[l].amount);
                 
-                Plotly.newPlot('chart-level-count', [{{
+                charts.push(['chart-level-count', id => Plotly.react(id, [{
                     values: levelCounts,
                     labels: levelLabels,
                     type: 'pie',
                     textinfo: 'label+percent+value',
                     textposition: 'outside',
-                    marker: {{colors: ['#FF6B6B', '#4ECDC4', '#45B7D1']}}
-                }}], {{
+                    marker: {colors: ['#FF6B6B', '#4ECDC4', '#45B7D1']}
+                }], {
                     title: '项目数量占比',
                     showlegend: true
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
-                Plotly.newPlot('chart-level-amount', [{{
+                charts.push(['chart-level-amount', id => Plotly.react(id, [{
                     values: levelAmounts,
                     labels: levelLabels,
                     type: 'pie',
                     textinfo: 'label+percent+value',
                     textposition: 'outside',
-                    marker: {{colors: ['#FF6B6B', '#4ECDC4', '#45B7D1']}}
-                }}], {{
+                    marker: {colors: ['#FF6B6B', '#4ECDC4', '#45B7D1']}
+                }], {
                     title: '项目金额占比',
                     showlegend: true
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
                 // 各园区分类项目图表
-                const parkLabels = Object.keys(parkAnalysis).sort((a, b) => parkAnalysis[b].total - parkAnalysis[a].total);
-                const level1Amounts = parkLabels.map(p => parkAnalysis[p].level1);
-                const hqAmounts = parkLabels.map(p => parkAnalysis[p].hq);
-                const majorAmounts = parkLabels.map(p => parkAnalysis[p].major);
-                const majorCounts = parkLabels.map(p => parkAnalysis[p].majorCount);
-                const level1Percents = parkLabels.map(p => parkAnalysis[p].total > 0 ? (parkAnalysis[p].level1 / parkAnalysis[p].total * 100).toFixed(2) : 0);
-                const hqPercents = parkLabels.map(p => parkAnalysis[p].total > 0 ? (parkAnalysis[p].hq / parkAnalysis[p].total * 100).toFixed(2) : 0);
-                const majorPercents = parkLabels.map(p => parkAnalysis[p].total > 0 ? (parkAnalysis[p].major / parkAnalysis[p].total * 100).toFixed(2) : 0);
+                const parkLabels = parkKeysByTotal;
+                // 各序列在一次遍历中按园区填充
+                const parkCount = parkLabels.length;
+                const level1Amounts = new Array(parkCount);
+                const hqAmounts = new Array(parkCount);
+                const majorAmounts = new Array(parkCount);
+                const majorCounts = new Array(parkCount);
+                const level1Percents = new Array(parkCount);
+                const hqPercents = new Array(parkCount);
+                const majorPercents = new Array(parkCount);
+                // 柱形标注文字同一遍历生成：金额全量、仅正值、正值带「万」三种写法
+                const level1Texts = new Array(parkCount);
+                const hqTexts = new Array(parkCount);
+                const majorTexts = new Array(parkCount);
+                const level1PosTexts = new Array(parkCount);
+                const hqPosTexts = new Array(parkCount);
+                const majorPosTexts = new Array(parkCount);
+                const level1WanTexts = new Array(parkCount);
+                const hqWanTexts = new Array(parkCount);
+                const majorWanTexts = new Array(parkCount);
+                const majorCountTexts = new Array(parkCount);
+                // 极值在同一遍历中求出，避免展开参数
+                let maxAmount = -Infinity;
+                let maxCount = -Infinity;
+                let maxTotal = -Infinity;
+                let minTotal = Infinity;
+                for (let i = 0; i < parkCount; i++) {
+                    const stats = parkAnalysis[parkLabels[i]];
+                    level1Amounts[i] = stats.level1;
+                    hqAmounts[i] = stats.hq;
+                    majorAmounts[i] = stats.major;
+                    majorCounts[i] = stats.majorCount;
+                    const hasTotal = stats.total > 0;
+                    const inv = hasTotal ? 100 / stats.total : 0;
+                    level1Percents[i] = hasTotal ? (stats.level1 * inv).toFixed(2) : 0;
+                    hqPercents[i] = hasTotal ? (stats.hq * inv).toFixed(2) : 0;
+                    majorPercents[i] = hasTotal ? (stats.major * inv).toFixed(2) : 0;
+                    level1Texts[i] = formatCurrency(stats.level1);
+                    hqTexts[i] = formatCurrency(stats.hq);
+                    majorTexts[i] = formatCurrency(stats.major);
+                    level1PosTexts[i] = stats.level1 > 0 ? level1Texts[i] : '';
+                    hqPosTexts[i] = stats.hq > 0 ? hqTexts[i] : '';
+                    majorPosTexts[i] = stats.major > 0 ? majorTexts[i] : '';
+                    level1WanTexts[i] = stats.level1 > 0 ? level1Texts[i] + '万' : '';
+                    hqWanTexts[i] = stats.hq > 0 ? hqTexts[i] + '万' : '';
+                    majorWanTexts[i] = stats.major > 0 ? majorTexts[i] + '万' : '';
+                    majorCountTexts[i] = stats.majorCount > 0 ? stats.majorCount + '个' : '';
+                    if (stats.level1 > maxAmount) maxAmount = stats.level1;
+                    if (stats.hq > maxAmount) maxAmount = stats.hq;
+                    if (stats.major > maxAmount) maxAmount = stats.major;
+                    if (stats.majorCount > maxCount) maxCount = stats.majorCount;
+                    if (stats.total > maxTotal) maxTotal = stats.total;
+                    if (hasTotal && stats.total < minTotal) minTotal = stats.total;
+                }
                 
                 // 复杂整合图表（多Y轴）
-                const maxAmount = Math.max(...level1Amounts, ...hqAmounts, ...majorAmounts);
-                const maxCount = Math.max(...majorCounts);
                 const scaleFactor = maxCount > 0 && maxAmount > 0 ? maxAmount / (maxCount * 50) : 1;
                 const scaledCounts = majorCounts.map(c => c * scaleFactor);
                 
-                Plotly.newPlot('chart-park-combined', [
+                charts.push(['chart-park-combined', id => Plotly.react(id, hoverOnlyBarText([
                     // 一级项目金额
-                    {{
+                    {
                         x: parkLabels,
                         y: level1Amounts,
                         type: 'bar',
                         name: '一级项目金额（万元）',
-                        marker: {{color: '#5470c6', line: {{color: '#3a5a9c', width: 1}}}},
-                        text: level1Amounts.map(a => a > 0 ? formatCurrency(a) + '万' : ''),
+                        marker: {color: '#5470c6', line: {color: '#3a5a9c', width: 1}},
+                        text: level1WanTexts,
                         textposition: 'outside',
                         yaxis: 'y'
-                    }},
+                    },
                     // 总部项目金额
-                    {{
+                    {
                         x: parkLabels,
                         y: hqAmounts,
                         type: 'bar',
                         name: '总部项目金额（万元）',
-                        marker: {{color: '#91cc75', line: {{color: '#6fa85a', width: 1}}}},
-                        text: hqAmounts.map(a => a > 0 ? formatCurrency(a) + '万' : ''),
+                        marker: {color: '#91cc75', line: {color: '#6fa85a', width: 1}},
+                        text: hqWanTexts,
                         textposition: 'outside',
                         yaxis: 'y'
-                    }},
+                    },
                     // 重大改造项目金额
-                    {{
+                    {
                         x: parkLabels,
                         y: majorAmounts,
                         type: 'bar',
                         name: '重大改造项目金额（万元）',
-                        marker: {{color: '#fac858', line: {{color: '#d4a84a', width: 1}}}},
-                        text: majorAmounts.map(a => a > 0 ? formatCurrency(a) + '万' : ''),
+                        marker: {color: '#fac858', line: {color: '#d4a84a', width: 1}},
+                        text: majorWanTexts,
                         textposition: 'outside',
                         yaxis: 'y'
-                    }},
+                    },
                     // 重大改造项目数量（缩放后）
-                    {{
+                    {
                         x: parkLabels,
                         y: scaledCounts,
                         type: 'bar',
                         name: '重大改造项目数（个）',
-                        marker: {{color: '#73c0de', line: {{color: '#4a9bc0', width: 1.5}}}},
-                        text: majorCounts.map(c => c > 0 ? c + '个' : ''),
+                        marker: {color: '#73c0de', line: {color: '#4a9bc0', width: 1.5}},
+                        text: majorCountTexts,
                         textposition: 'inside',
                         opacity: 0.85,
                         yaxis: 'y'
-                    }},
+                    },
                     // 一级项目占比
-                    {{
+                    {
                         x: parkLabels,
                         y: level1Percents,
                         type: 'scatter',
                         mode: 'lines+markers',
                         name: '一级项目占比（%）',
-                        marker: {{color: '#ee6666', size: 10, line: {{width: 2, color: 'white'}}, symbol: 'circle'}},
-                        line: {{color: '#ee6666', width: 3}},
+                        marker: {color: '#ee6666', size: 10, line: {width: 2, color: 'white'}, symbol: 'circle'},
+                        line: {color: '#ee6666', width: 3},
                         yaxis: 'y2'
-                    }},
+                    },
                     // 总部项目占比
-                    {{
+                    {
                         x: parkLabels,
                         y: hqPercents,
                         type: 'scatter',
                         mode: 'lines+markers',
                         name: '总部项目占比（%）',
-                        marker: {{color: '#ff9800', size: 10, line: {{width: 2, color: 'white'}}, symbol: 'square'}},
-                        line: {{color: '#ff9800', width: 3, dash: 'dash'}},
+                        marker: {color: '#ff9800', size: 10, line: {width: 2, color: 'white'}, symbol: 'square'},
+                        line: {color: '#ff9800', width: 3, dash: 'dash'},
                         yaxis: 'y2'
-                    }},
+                    },
                     // 重大改造项目占比
-                    {{
+                    {
                         x: parkLabels,
                         y: majorPercents,
                         type: 'scatter',
                         mode: 'lines+markers',
                         name: '重大改造项目占比（%）',
-                        marker: {{color: '#9c27b0', size: 10, line: {{width: 2, color: 'white'}}, symbol: 'diamond'}},
-                        line: {{color: '#9c27b0', width: 3, dash: 'dot'}},
+                        marker: {color: '#9c27b0', size: 10, line: {width: 2, color: 'white'}, symbol: 'diamond'},
+                        line: {color: '#9c27b0', width: 3, dash: 'dot'},
                         yaxis: 'y2'
-                    }}
-                ], {{
+                    }
+                ]), {
                     title: '各园区分类项目统计（金额、项目数与占比）',
-                    xaxis: {{tickangle: -45, title: '园区'}},
-                    yaxis: {{title: '金额（万元）', side: 'left'}},
-                    yaxis2: {{title: '占比（%）', side: 'right', overlaying: 'y', range: [0, 105]}},
+                    xaxis: {tickangle: -45, title: '园区'},
+                    yaxis: {title: '金额（万元）', side: 'left'},
+                    yaxis2: {title: '占比（%）', side: 'right', overlaying: 'y', range: [0, 105]},
                     barmode: 'group',
                     height: 700,
                     showlegend: true,
-                    legend: {{orientation: 'h', yanchor: 'bottom', y: -0.18, xanchor: 'center', x: 0.5}}
-                }}, {{displayModeBar: false}});
+                    legend: {orientation: 'h', yanchor: 'bottom', y: -0.18, xanchor: 'center', x: 0.5}
+                }, {displayModeBar: false})]);
                 
                 // 对数刻度图表
-                const maxTotal = Math.max(...parkLabels.map(p => parkAnalysis[p].total));
-                const minTotal = Math.min(...parkLabels.filter(p => parkAnalysis[p].total > 0).map(p => parkAnalysis[p].total));
                 let tickVals = null;
                 let tickTexts = null;
-                if (maxTotal > 0 && minTotal > 0 && maxTotal > minTotal * 2) {{
+                if (maxTotal > 0 && minTotal > 0 && maxTotal > minTotal * 2) {
                     const logMin = Math.log10(Math.max(1, minTotal));
                     const logMax = Math.log10(maxTotal);
                     tickVals = [];
                     tickTexts = [];
-                    for (let exp = Math.floor(logMin); exp <= Math.ceil(logMax); exp++) {{
-                        for (let mult of [1, 2, 5]) {{
+                    // 按指数、倍数 1/2/5 递增生成，刻度本身即升序且不重复，无需再去重排序
+                    for (let exp = Math.floor(logMin); exp <= Math.ceil(logMax); exp++) {
+                        for (let mult of [1, 2, 5]) {
                             const val = mult * Math.pow(10, exp);
-                            if (val >= Math.max(1, minTotal * 0.5) && val <= maxTotal * 1.5) {{
+                            if (val >= Math.max(1, minTotal * 0.5) && val <= maxTotal * 1.5) {
                                 tickVals.push(val);
-                                if (val >= 1000) {{
+                                if (val >= 1000) {
                                     tickTexts.push((val / 1000).toFixed(1) + '千');
-                                }} else if (val >= 100) {{
+                                } else if (val >= 100) {
                                     tickTexts.push(Math.floor(val).toString());
-                                }} else {{
+                                } else {
                                     tickTexts.push(val.toString());
-                                }}
-                            }}
-                        }}
-                    }}
-                    // 去重并排序
-                    const pairs = Array.from(new Set(tickVals.map((v, i) => [v, tickTexts[i]]))).sort((a, b) => a[0] - b[0]);
-                    tickVals = pairs.map(p => p[0]);
-                    tickTexts = pairs.map(p => p[1]);
-                }}
+                                }
+                            }
+                        }
+                    }
+                }
                 
-                Plotly.newPlot('chart-park-log-scale', [
-                    {{
+                charts.push(['chart-park-log-scale', id => Plotly.react(id, hoverOnlyBarText([
+                    {
                         x: parkLabels,
                         y: level1Amounts,
                         type: 'bar',
                         name: '一级项目金额（万元）',
-                        marker: {{color: '#5470c6', line: {{color: '#3a5a9c', width: 1}}}},
-                        text: level1Amounts.map(a => a > 0 ? formatCurrency(a) : ''),
+                        marker: {color: '#5470c6', line: {color: '#3a5a9c', width: 1}},
+                        text: level1PosTexts,
                         textposition: 'outside'
-                    }},
-                    {{
+                    },
+                    {
                         x: parkLabels,
                         y: hqAmounts,
                         type: 'bar',
                         name: '总部项目金额（万元）',
-                        marker: {{color: '#91cc75', line: {{color: '#6fa85a', width: 1}}}},
-                        text: hqAmounts.map(a => a > 0 ? formatCurrency(a) : ''),
+                        marker: {color: '#91cc75', line: {color: '#6fa85a', width: 1}},
+                        text: hqPosTexts,
                         textposition: 'outside'
-                    }},
-                    {{
+                    },
+                    {
                         x: parkLabels,
                         y: majorAmounts,
                         type: 'bar',
                         name: '重大改造项目金额（万元）',
-                        marker: {{color: '#fac858', line: {{color: '#d4a84a', width: 1}}}},
-                        text: majorAmounts.map(a => a > 0 ? formatCurrency(a) : ''),
+                        marker: {color: '#fac858', line: {color: '#d4a84a', width: 1}},
+                        text: majorPosTexts,
                         textposition: 'outside'
-                    }}
-                ], {{
+                    }
+                ]), {
                     title: '各园区分类项目金额统计（对数刻度，保证小金额园区可见性）',
-                    xaxis: {{tickangle: -45, title: '园区'}},
-                    yaxis: {{
+                    xaxis: {tickangle: -45, title: '园区'},
+                    yaxis: {
                         title: '金额（万元，对数刻度）',
                         type: 'log',
                         tickvals: tickVals,
                         ticktext: tickTexts
-                    }},
+                    },
                     barmode: 'group',
                     height: 600,
                     showlegend: true,
-                    legend: {{orientation: 'h', yanchor: 'bottom', y: -0.15, xanchor: 'center', x: 0.5}}
-                }}, {{displayModeBar: false}});
+                    legend: {orientation: 'h', yanchor: 'bottom', y: -0.15, xanchor: 'center', x: 0.5}
+                }, {displayModeBar: false})]);
                 
-                Plotly.newPlot('chart-park-level1', [{{
+                charts.push(['chart-park-level1', id => Plotly.react(id, hoverOnlyBarText([{
                     x: parkLabels,
                     y: level1Amounts,
                     type: 'bar',
-                    text: level1Amounts.map(a => formatCurrency(a)),
+                    text: level1Texts,
                     textposition: 'outside',
-                    marker: {{color: '#FF6B6B'}}
-                }}], {{
+                    marker: {color: '#FF6B6B'}
+                }]), {
                     title: '各园区一级项目金额（万元）',
-                    xaxis: {{tickangle: -45}},
-                    yaxis: {{title: '金额（万元）'}},
+                    xaxis: {tickangle: -45},
+                    yaxis: {title: '金额（万元）'},
                     showlegend: false,
                     height: 350
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
-                Plotly.newPlot('chart-park-hq', [{{
+                charts.push(['chart-park-hq', id => Plotly.react(id, hoverOnlyBarText([{
                     x: parkLabels,
                     y: hqAmounts,
                     type: 'bar',
-                    text: hqAmounts.map(a => formatCurrency(a)),
+                    text: hqTexts,
                     textposition: 'outside',
-                    marker: {{color: '#4ECDC4'}}
-                }}], {{
+                    marker: {color: '#4ECDC4'}
+                }]), {
                     title: '各园区总部项目金额（万元）',
-                    xaxis: {{tickangle: -45}},
-                    yaxis: {{title: '金额（万元）'}},
+                    xaxis: {tickangle: -45},
+                    yaxis: {title: '金额（万元）'},
                     showlegend: false,
                     height: 350
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
-                Plotly.newPlot('chart-park-major-amount', [{{
+                charts.push(['chart-park-major-amount', id => Plotly.react(id, hoverOnlyBarText([{
                     x: parkLabels,
                     y: majorAmounts,
                     type: 'bar',
-                    text: majorAmounts.map(a => formatCurrency(a)),
+                    text: majorTexts,
                     textposition: 'outside',
-                    marker: {{color: '#45B7D1'}}
-                }}], {{
+                    marker: {color: '#45B7D1'}
+                }]), {
                     title: '各园区重大改造项目金额（万元，≥200万）',
-                    xaxis: {{tickangle: -45}},
-                    yaxis: {{title: '金额（万元）'}},
+                    xaxis: {tickangle: -45},
+                    yaxis: {title: '金额（万元）'},
                     showlegend: false,
                     height: 350
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
-                Plotly.newPlot('chart-park-major-count', [{{
+                charts.push(['chart-park-major-count', id => Plotly.react(id, hoverOnlyBarText([{
                     x: parkLabels,
                     y: majorCounts,
                     type: 'bar',
                     text: majorCounts,
                     textposition: 'outside',
-                    marker: {{color: '#9a60b4'}}
-                }}], {{
+                    marker: {color: '#9a60b4'}
+                }]), {
                     title: '各园区重大改造项目数量（≥200万）',
-                    xaxis: {{tickangle: -45}},
-                    yaxis: {{title: '项目数'}},
+                    xaxis: {tickangle: -45},
+                    yaxis: {title: '项目数'},
                     showlegend: false,
                     height: 350
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
                 // 按月份统计图表
-                if (Object.keys(monthlyStats).length > 0) {{
-                    const months = Object.keys(monthlyStats).sort();
+                if (Object.keys(monthlyStats).length > 0) {
+                    const months = sortedMonths;
                     const monthlyCounts = months.map(m => monthlyStats[m].count);
                     const monthlyAmounts = months.map(m => monthlyStats[m].amount);
                     
-                    Plotly.newPlot('chart-monthly-count', [{{
+                    charts.push(['chart-monthly-count', id => Plotly.react(id, [{
                         x: months,
                         y: monthlyCounts,
                         type: 'bar',
                         text: monthlyCounts,
                         textposition: 'outside',
-                        marker: {{color: '#5470c6'}}
-                    }}], {{
+                        marker: {color: '#5470c6'}
+                    }], {
                         title: '每月立项项目数',
-                        xaxis: {{tickangle: -45}},
-                        yaxis: {{title: '项目数'}},
+                        xaxis: {tickangle: -45},
+                        yaxis: {title: '项目数'},
                         showlegend: false,
                         height: 350
-                    }}, {{displayModeBar: false}});
+                    }, {displayModeBar: false})]);
                     
-                    Plotly.newPlot('chart-monthly-amount', [{{
+                    charts.push(['chart-monthly-amount', id => Plotly.react(id, [{
                         x: months,
                         y: monthlyAmounts,
                         type: 'bar',
                         text: monthlyAmounts.map(a => formatCurrency(a)),
                         textposition: 'outside',
-                        marker: {{color: '#91cc75'}}
-                    }}], {{
+                        marker: {color: '#91cc75'}
+                    }], {
                         title: '每月立项金额（万元）',
-                        xaxis: {{tickangle: -45}},
-                        yaxis: {{title: '金额（万元）'}},
+                        xaxis: {tickangle: -45},
+                        yaxis: {title: '金额（万元）'},
                         showlegend: false,
                         height: 350
-                    }}, {{displayModeBar: false}});
-                }}
+                    }, {displayModeBar: false})]);
+                }
                 
                 // 专业分包统计图表
-                if (validData[0] && (validData[0].专业分包 || validData[0].专业细分)) {{
-                    const profSubcontractCol = validData[0].专业分包 ? '专业分包' : '专业细分';
-                    const profSubcontractStats = {{}};
-                    validData.forEach(d => {{
-                        const val = d[profSubcontractCol] || '未分类';
-                        if (!profSubcontractStats[val]) {{
-                            profSubcontractStats[val] = {{count: 0, amount: 0}};
-                        }}
-                        profSubcontractStats[val].count++;
-                        profSubcontractStats[val].amount += parseFloat(d.拟定金额) || 0;
-                    }});
-                    
-                    const profSubcontractLabels = Object.keys(profSubcontractStats).sort((a, b) => profSubcontractStats[b].amount - profSubcontractStats[a].amount);
+                if (hasProfSubcontract) {
+                    const profSubcontractLabels = profSubcontractKeysByAmount;
                     const profSubcontractCounts = profSubcontractLabels.map(l => profSubcontractStats[l].count);
                     const profSubcontractAmounts = profSubcontractLabels.map(l => profSubcontractStats[l].amount);
                     
                     const colors = ['#5470c6', '#91cc75', '#fac858', '#ee6666', '#73c0de', '#3ba272', '#fc8452', '#9a60b4'];
                     
-                    Plotly.newPlot('chart-prof-subcontract-count', [{{
+                    charts.push(['chart-prof-subcontract-count', id => Plotly.react(id, [{
                         values: profSubcontractCounts,
                         labels: profSubcontractLabels,
                         type: 'pie',
                         textinfo: 'label+percent+value',
                         textposition: 'outside',
-                        marker: {{colors: colors.slice(0, profSubcontractLabels.length)}}
-                    }}], {{
+                        marker: {colors: colors.slice(0, profSubcontractLabels.length)}
+                    }], {
                         title: '专业分包项目数占比',
                         showlegend: true
-                    }}, {{displayModeBar: false}});
+                    }, {displayModeBar: false})]);
                     
-                    Plotly.newPlot('chart-prof-subcontract-amount', [{{
+                    charts.push(['chart-prof-subcontract-amount', id => Plotly.react(id, [{
                         values: profSubcontractAmounts,
                         labels: profSubcontractLabels,
                         type: 'pie',
                         textinfo: 'label+percent+value',
                         textposition: 'outside',
-                        marker: {{colors: colors.slice(0, profSubcontractLabels.length)}}
-                    }}], {{
+                        marker: {colors: colors.slice(0, profSubcontractLabels.length)}
+                    }], {
                         title: '专业分包金额占比',
                         showlegend: true
-                    }}, {{displayModeBar: false}});
-                }}
-            }}, 100);
-        }}
+                    }, {displayModeBar: false})]);
+                }
+                drawChartsWhenVisible(0, charts);
+            }, 100);
+        }
         
         // 标签页1: 统计
-        function renderTab1() {{
+        function renderTab1() {
             const validData = getValidProjects(filteredData);
             const container = document.getElementById('tab-1');
             
-            if (validData.length === 0) {{
+            if (validData.length === 0) {
                 container.innerHTML = '<div class="warning-box">当前筛选条件下暂无数据。</div>';
                 return;
-            }}
-            
-            // 按专业统计（过滤掉"其它系统"）
-            const profStats = {{}};
-            validData.forEach(d => {{
-                const prof = d.专业 || '未分类';
-                // 过滤掉"其它系统"分类
-                if (prof === '其它系统' || prof === '其他系统') return;
-                if (!profStats[prof]) {{
-                    profStats[prof] = {{count: 0, amount: 0}};
-                }}
-                profStats[prof].count++;
-                profStats[prof].amount += parseFloat(d.拟定金额) || 0;
-            }});
-            
-            // 按项目分级统计金额
-            const levelAmountStats = {{}};
-            validData.forEach(d => {{
-                const level = d.项目分级 || '未分类';
-                if (!levelAmountStats[level]) {{
-                    levelAmountStats[level] = 0;
-                }}
-                levelAmountStats[level] += parseFloat(d.拟定金额) || 0;
-            }});
-            
-            // 按园区统计金额
-            const parkAmountStats = {{}};
-            validData.forEach(d => {{
-                const park = d.园区 || '未知';
-                if (!parkAmountStats[park]) {{
-                    parkAmountStats[park] = 0;
-                }}
-                parkAmountStats[park] += parseFloat(d.拟定金额) || 0;
-            }});
-            
-            // 按城市统计金额
-            const cityAmountStats = {{}};
-            validData.forEach(d => {{
-                const city = d.城市 || '其他';
-                if (city !== '其他') {{
-                    if (!cityAmountStats[city]) {{
-                        cityAmountStats[city] = 0;
-                    }}
-                    cityAmountStats[city] += parseFloat(d.拟定金额) || 0;
-                }}
-            }});
+            }
             
-            // 按区域统计金额
-            const regionAmountStats = {{}};
-            validData.forEach(d => {{
-                const region = d.所属区域 || '其他';
-                if (region !== '其他') {{
-                    if (!regionAmountStats[region]) {{
-                        regionAmountStats[region] = 0;
-                    }}
-                    regionAmountStats[region] += parseFloat(d.拟定金额) || 0;
-                }}
-            }});
+            // 专业、分级、园区、城市、区域统计：由各园区预聚合结果合并
+            const {profStats, levelAmountStats, parkAmountStats, cityAmountStats, regionAmountStats, regionDetailedStats, regionParkDetails} = aggregateParkDetails();
             
             // 按专业分包统计（如果存在）
             const hasProfSubcontract = validData[0] && (validData[0].专业分包 || validData[0].专业细分);
             const profSubcontractCol = hasProfSubcontract ? (validData[0].专业分包 ? '专业分包' : '专业细分') : null;
-            const profSubcontractStats = {{}};
-            if (hasProfSubcontract) {{
-                validData.forEach(d => {{
+            const profSubcontractStats = {};
+            if (hasProfSubcontract) {
+                validData.forEach(d => {
                     const val = d[profSubcontractCol] || '未分类';
-                    if (!profSubcontractStats[val]) {{
-                        profSubcontractStats[val] = {{count: 0, amount: 0}};
-                    }}
+                    if (!profSubcontractStats[val]) {
+                        profSubcontractStats[val] = {count: 0, amount: 0};
+                    }
                     profSubcontractStats[val].count++;
-                    profSubcontractStats[val].amount += parseFloat(d.拟定金额) || 0;
-                }});
-            }}
-            
-            // 按区域统计（详细统计，包含项目数、金额、园区数）
-            const regionDetailedStats = {{}};
-            validData.forEach(d => {{
-                const region = d.所属区域 || '其他';
-                if (region !== '其他') {{
-                    if (!regionDetailedStats[region]) {{
-                        regionDetailedStats[region] = {{count: 0, amount: 0, parks: new Set()}};
-                    }}
-                    regionDetailedStats[region].count++;
-                    regionDetailedStats[region].amount += parseFloat(d.拟定金额) || 0;
-                    if (d.园区) regionDetailedStats[region].parks.add(d.园区);
-                }}
-            }});
-            
-            // 按区域下各园区统计
-            const regionParkDetails = {{}};
-            Object.keys(regionDetailedStats).forEach(region => {{
-                const regionData = validData.filter(d => d.所属区域 === region);
-                const parkStatsInRegion = {{}};
-                regionData.forEach(d => {{
-                    const park = d.园区 || '未知';
-                    if (!parkStatsInRegion[park]) {{
-                        parkStatsInRegion[park] = {{count: 0, amount: 0}};
-                    }}
-                    parkStatsInRegion[park].count++;
-                    parkStatsInRegion[park].amount += parseFloat(d.拟定金额) || 0;
-                }});
-                regionParkDetails[region] = parkStatsInRegion;
-            }});
+                    profSubcontractStats[val].amount += d[AMOUNT];
+                });
+            }
             
-            let html = `
-                <div class="section">
-                    ${{Object.keys(regionDetailedStats).length > 0 ? `
+            const regionHTML = Object.keys(regionDetailedStats).length > 0 ? `
                     <h2>📊 按区域统计分析</h2>
                     
                     <h3>各区域项目统计</h3>
                     <div class="metrics">
                         <div class="metric">
                             <div class="metric-label">总区域数</div>
-                            <div class="metric-value">${{Object.keys(regionDetailedStats).length}}</div>
+                            <div class="metric-value">${Object.keys(regionDetailedStats).length}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">总项目数</div>
-                            <div class="metric-value">${{formatNumber(Object.values(regionDetailedStats).reduce((sum, r) => sum + r.count, 0))}}</div>
+                            <div class="metric-value">${formatNumber(Object.values(regionDetailedStats).reduce((sum, r) => sum + r.count, 0))}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">总金额（万元）</div>
-                            <div class="metric-value">${{formatCurrency(Object.values(regionDetailedStats).reduce((sum, r) => sum + r.amount, 0))}}</div>
+                            <div class="metric-value">${formatCurrency(Object.values(regionDetailedStats).reduce((sum, r) => sum + r.amount, 0))}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">总园区数</div>
-                            <div class="metric-value">${{formatNumber(Object.values(regionDetailedStats).reduce((sum, r) => sum + r.parks.size, 0))}}</div>
+                            <div class="metric-value">${formatNumber(Object.values(regionDetailedStats).reduce((sum, r) => sum + r.parkCount, 0))}</div>
                         </div>
                     </div>
                     
@@ -4212,29 +4513,29 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>所属区域</th><th>项目数</th><th>金额合计（万元）</th><th>园区数</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(regionDetailedStats).sort((a, b) => regionDetailedStats[b].count - regionDetailedStats[a].count).map(region => {{
+                                ${Object.keys(regionDetailedStats).sort((a, b) => regionDetailedStats[b].count - regionDetailedStats[a].count).map(region => {
                                     const stats = regionDetailedStats[region];
                                     return `
                                         <tr>
-                                            <td>${{region}}</td>
-                                            <td>${{stats.count}}</td>
-                                            <td>${{formatCurrency(stats.amount)}}</td>
-                                            <td>${{stats.parks.size}}</td>
+                                            <td>${region}</td>
+                                            <td>${stats.count}</td>
+                                            <td>${formatCurrency(stats.amount)}</td>
+                                            <td>${stats.parkCount}</td>
                                         </tr>
                                     `;
-                                }}).join('')}}
+                                }).join('')}
                             </tbody>
                         </table>
                     </div>
                     
                     <h3>各区域下园区明细</h3>
-                    ${{Object.keys(regionDetailedStats).sort((a, b) => regionDetailedStats[b].count - regionDetailedStats[a].count).map(region => {{
+                    ${Object.keys(regionDetailedStats).sort((a, b) => regionDetailedStats[b].count - regionDetailedStats[a].count).map(region => {
                         const stats = regionDetailedStats[region];
                         const parkDetails = regionParkDetails[region];
                         return `
                             <div class="expander">
                                 <div class="expander-header" onclick="toggleExpander(this)">
-                                    <span><strong>${{region}}</strong>（${{Object.keys(parkDetails).length}}个园区，${{stats.count}}个项目，${{formatCurrency(stats.amount)}}万元）</span>
+                                    <span><strong>${region}</strong>（${Object.keys(parkDetails).length}个园区，${stats.count}个项目，${formatCurrency(stats.amount)}万元）</span>
                                     <span class="expander-icon">▶</span>
                                 </div>
                                 <div class="expander-content">
@@ -4244,24 +4545,26 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                                 <tr><th>园区</th><th>项目数</th><th>金额合计（万元）</th></tr>
                                             </thead>
                                             <tbody>
-                                                ${{Object.keys(parkDetails).sort((a, b) => parkDetails[b].amount - parkDetails[a].amount).map(park => `
+                                                ${Object.keys(parkDetails).sort((a, b) => parkDetails[b].amount - parkDetails[a].amount).map(park => `
                                                     <tr>
-                                                        <td>${{park}}</td>
-                                                        <td>${{parkDetails[park].count}}</td>
-                                                        <td>${{formatCurrency(parkDetails[park].amount)}}</td>
+                                                        <td>${park}</td>
+                                                        <td>${parkDetails[park].count}</td>
+                                                        <td>${formatCurrency(parkDetails[park].amount)}</td>
                                                     </tr>
-                                                `).join('')}}
+                                                `).join('')}
                                             </tbody>
                                         </table>
                                     </div>
                                 </div>
                             </div>
                         `;
-                    }}).join('')}}
+                    }).join('')}
                     
                     <hr style="margin: 30px 0;"/>
-                    ` : ''}}
-                    
+            ` : '';
+            
+            // 图表区只随专业分包列有无变化，通常原样保留，图表就地更新
+            const chartsHTML = `
                     <h2>📊 图表统计</h2>
                     
                     <h3>按专业 · 项目数</h3>
@@ -4294,7 +4597,7 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                         <div id="chart-prof-amount"></div>
                     </div>
                     
-                    ${{hasProfSubcontract ? `
+                    ${hasProfSubcontract ? `
                     <h3>按专业分包 · 项目数</h3>
                     <div class="chart-container">
                         <div id="chart-prof-subcontract-count-tab1"></div>
@@ -4304,189 +4607,190 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                     <div class="chart-container">
                         <div id="chart-prof-subcontract-amount-tab1"></div>
                     </div>
-                    ` : ''}}
-                </div>
+                    ` : ''}
             `;
             
-            container.innerHTML = html;
+            renderSections(1, container, {region: regionHTML, charts: chartsHTML});
             
             // 渲染图表
-            setTimeout(() => {{
+            setTimeout(() => {
+                const charts = [];
                 // 按专业项目数
                 const profLabels = Object.keys(profStats).sort((a, b) => profStats[b].count - profStats[a].count);
                 const profCounts = profLabels.map(p => profStats[p].count);
-                Plotly.newPlot('chart-prof-count', [{{
+                charts.push(['chart-prof-count', id => Plotly.react(id, [{
                     x: profLabels,
                     y: profCounts,
                     type: 'bar',
-                    marker: {{color: profCounts, colorscale: 'Blues'}},
+                    marker: {color: profCounts, colorscale: 'Blues'},
                     text: profCounts,
                     textposition: 'outside'
-                }}], {{
-                    xaxis: {{tickangle: -45}},
-                    yaxis: {{title: '项目数'}},
+                }], {
+                    xaxis: {tickangle: -45},
+                    yaxis: {title: '项目数'},
                     showlegend: false,
-                    margin: {{t: 20, b: 80}}
-                }}, {{displayModeBar: false}});
+                    margin: {t: 20, b: 80}
+                }, {displayModeBar: false})]);
                 
                 // 按项目分级金额占比
                 const levelLabels = Object.keys(levelAmountStats);
                 const levelAmounts = levelLabels.map(l => levelAmountStats[l]);
-                Plotly.newPlot('chart-level-amount-pie', [{{
+                charts.push(['chart-level-amount-pie', id => Plotly.react(id, [{
                     values: levelAmounts,
                     labels: levelLabels,
                     type: 'pie',
                     hole: 0.35,
                     textinfo: 'label+percent+value',
                     textposition: 'outside',
-                    texttemplate: '%{{label}}<br>%{{percent}}<br>%{{value:,.0f}}万元'
-                }}], {{
+                    texttemplate: '%{label}<br>%{percent}<br>%{value:,.0f}万元'
+                }], {
                     showlegend: true,
-                    legend: {{orientation: 'h', yanchor: 'bottom', y: -0.2}}
-                }}, {{displayModeBar: false}});
+                    legend: {orientation: 'h', yanchor: 'bottom', y: -0.2}
+                }, {displayModeBar: false})]);
                 
                 // 按园区金额
                 const parkLabels = Object.keys(parkAmountStats).sort((a, b) => parkAmountStats[b] - parkAmountStats[a]).slice(0, 20);
                 const parkAmounts = parkLabels.map(p => parkAmountStats[p]);
-                Plotly.newPlot('chart-park-amount', [{{
+                charts.push(['chart-park-amount', id => Plotly.react(id, [{
                     x: parkLabels,
                     y: parkAmounts,
                     type: 'bar',
-                    marker: {{color: parkAmounts, colorscale: 'Blues'}},
+                    marker: {color: parkAmounts, colorscale: 'Blues'},
                     text: parkAmounts.map(a => formatCurrency(a)),
                     textposition: 'outside'
-                }}], {{
-                    xaxis: {{tickangle: -45}},
-                    yaxis: {{title: '金额（万元）'}},
+                }], {
+                    xaxis: {tickangle: -45},
+                    yaxis: {title: '金额（万元）'},
                     showlegend: false,
-                    margin: {{t: 20, b: 80}}
-                }}, {{displayModeBar: false}});
+                    margin: {t: 20, b: 80}
+                }, {displayModeBar: false})]);
                 
                 // 按城市金额
                 const cityLabels = Object.keys(cityAmountStats).sort((a, b) => cityAmountStats[b] - cityAmountStats[a]);
                 const cityAmounts = cityLabels.map(c => cityAmountStats[c]);
-                if (cityLabels.length > 0) {{
-                    Plotly.newPlot('chart-city-amount', [{{
+                if (cityLabels.length > 0) {
+                    charts.push(['chart-city-amount', id => Plotly.react(id, [{
                         x: cityLabels,
                         y: cityAmounts,
                         type: 'bar',
-                        marker: {{color: cityAmounts, colorscale: 'Teal'}},
+                        marker: {color: cityAmounts, colorscale: 'Teal'},
                         text: cityAmounts.map(a => formatCurrency(a)),
                         textposition: 'outside'
-                    }}], {{
-                        xaxis: {{tickangle: -45}},
-                        yaxis: {{title: '金额（万元）'}},
+                    }], {
+                        xaxis: {tickangle: -45},
+                        yaxis: {title: '金额（万元）'},
                         showlegend: false,
-                        margin: {{t: 20, b: 80}}
-                    }}, {{displayModeBar: false}});
-                }}
+                        margin: {t: 20, b: 80}
+                    }, {displayModeBar: false})]);
+                }
                 
                 // 按区域金额
                 const regionLabels = Object.keys(regionAmountStats).sort((a, b) => regionAmountStats[b] - regionAmountStats[a]);
                 const regionAmounts = regionLabels.map(r => regionAmountStats[r]);
-                if (regionLabels.length > 0) {{
-                    Plotly.newPlot('chart-region-amount', [{{
+                if (regionLabels.length > 0) {
+                    charts.push(['chart-region-amount', id => Plotly.react(id, [{
                         values: regionAmounts,
                         labels: regionLabels,
                         type: 'pie',
                         hole: 0.4,
                         textinfo: 'label+percent+value',
                         textposition: 'outside',
-                        texttemplate: '%{{label}}<br>%{{percent}}<br>%{{value:,.0f}}万元',
-                        marker: {{colors: ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']}}
-                    }}], {{
+                        texttemplate: '%{label}<br>%{percent}<br>%{value:,.0f}万元',
+                        marker: {colors: ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']}
+                    }], {
                         showlegend: true,
-                        legend: {{orientation: 'h', yanchor: 'bottom', y: -0.15}}
-                    }}, {{displayModeBar: false}});
-                }}
+                        legend: {orientation: 'h', yanchor: 'bottom', y: -0.15}
+                    }, {displayModeBar: false})]);
+                }
                 
                 // 按专业金额
                 const profAmountLabels = Object.keys(profStats).sort((a, b) => profStats[b].amount - profStats[a].amount);
                 const profAmounts = profAmountLabels.map(p => profStats[p].amount);
-                Plotly.newPlot('chart-prof-amount', [{{
+                charts.push(['chart-prof-amount', id => Plotly.react(id, [{
                     x: profAmountLabels,
                     y: profAmounts,
                     type: 'bar',
-                    marker: {{color: profAmounts, colorscale: 'Viridis'}},
+                    marker: {color: profAmounts, colorscale: 'Viridis'},
                     text: profAmounts.map(a => formatCurrency(a)),
                     textposition: 'outside'
-                }}], {{
-                    xaxis: {{tickangle: -45}},
-                    yaxis: {{title: '金额（万元）'}},
+                }], {
+                    xaxis: {tickangle: -45},
+                    yaxis: {title: '金额（万元）'},
                     showlegend: false,
-                    margin: {{t: 20, b: 80}}
-                }}, {{displayModeBar: false}});
+                    margin: {t: 20, b: 80}
+                }, {displayModeBar: false})]);
                 
                 // 按专业分包统计图表
-                if (hasProfSubcontract) {{
+                if (hasProfSubcontract) {
                     const profSubcontractLabels = Object.keys(profSubcontractStats).sort((a, b) => profSubcontractStats[b].amount - profSubcontractStats[a].amount);
                     const profSubcontractCounts = profSubcontractLabels.map(l => profSubcontractStats[l].count);
                     const profSubcontractAmounts = profSubcontractLabels.map(l => profSubcontractStats[l].amount);
                     const colors = ['#5470c6', '#91cc75', '#fac858', '#ee6666', '#73c0de', '#3ba272', '#fc8452', '#9a60b4'];
                     
-                    Plotly.newPlot('chart-prof-subcontract-count-tab1', [{{
+                    charts.push(['chart-prof-subcontract-count-tab1', id => Plotly.react(id, [{
                         x: profSubcontractLabels,
                         y: profSubcontractCounts,
                         type: 'bar',
-                        marker: {{color: profSubcontractCounts, colorscale: 'Blues'}},
+                        marker: {color: profSubcontractCounts, colorscale: 'Blues'},
                         text: profSubcontractCounts,
                         textposition: 'outside'
-                    }}], {{
+                    }], {
                         title: '按专业分包 · 项目数',
-                        xaxis: {{tickangle: -45}},
-                        yaxis: {{title: '项目数'}},
+                        xaxis: {tickangle: -45},
+                        yaxis: {title: '项目数'},
                         showlegend: false,
-                        margin: {{t: 20, b: 80}},
+                        margin: {t: 20, b: 80},
                         height: 400
-                    }}, {{displayModeBar: false}});
+                    }, {displayModeBar: false})]);
                     
-                    Plotly.newPlot('chart-prof-subcontract-amount-tab1', [{{
+                    charts.push(['chart-prof-subcontract-amount-tab1', id => Plotly.react(id, [{
                         values: profSubcontractAmounts,
                         labels: profSubcontractLabels,
                         type: 'pie',
                         hole: 0.35,
                         textinfo: 'label+percent+value',
                         textposition: 'outside',
-                        texttemplate: '%{{label}}<br>%{{percent}}<br>%{{value:,.0f}}万元',
-                        marker: {{colors: colors.slice(0, profSubcontractLabels.length)}}
-                    }}], {{
+                        texttemplate: '%{label}<br>%{percent}<br>%{value:,.0f}万元',
+                        marker: {colors: colors.slice(0, profSubcontractLabels.length)}
+                    }], {
                         title: '按专业分包 · 金额占比',
                         showlegend: true,
-                        legend: {{orientation: 'h', yanchor: 'bottom', y: -0.2}}
-                    }}, {{displayModeBar: false}});
-                }}
-            }}, 100);
-        }}
+                        legend: {orientation: 'h', yanchor: 'bottom', y: -0.2}
+                    }, {displayModeBar: false})]);
+                }
+                drawChartsWhenVisible(1, charts);
+            }, 100);
+        }
         
         // 标签页2: 地区分析
-        function renderTab2() {{
+        function renderTab2() {
             const validData = getValidProjects(filteredData);
             const container = document.getElementById('tab-2');
             
-            if (validData.length === 0) {{
+            if (validData.length === 0) {
                 container.innerHTML = '<div class="warning-box">当前筛选条件下暂无数据。</div>';
                 return;
-            }}
+            }
             
             // 按区域统计
-            const regionStats = {{}};
-            validData.forEach(d => {{
+            const regionStats = {};
+            validData.forEach(d => {
                 const region = d.所属区域 || '其他';
-                if (region !== '其他') {{
-                    if (!regionStats[region]) {{
-                        regionStats[region] = {{
+                if (region !== '其他') {
+                    if (!regionStats[region]) {
+                        regionStats[region] = {
                             count: 0,
                             amount: 0,
                             parks: new Set(),
                             cities: new Set()
-                        }};
-                    }}
+                        };
+                    }
                     regionStats[region].count++;
-                    regionStats[region].amount += parseFloat(d.拟定金额) || 0;
+                    regionStats[region].amount += d[AMOUNT];
                     if (d.园区) regionStats[region].parks.add(d.园区);
                     if (d.城市) regionStats[region].cities.add(d.城市);
-                }}
-            }});
+                }
+            });
             
             let html = `
                 <div class="section">
@@ -4496,23 +4800,23 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                     <div class="metrics">
                         <div class="metric">
                             <div class="metric-label">总区域数</div>
-                            <div class="metric-value">${{Object.keys(regionStats).length}}</div>
+                            <div class="metric-value">${Object.keys(regionStats).length}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">总项目数</div>
-                            <div class="metric-value">${{formatNumber(Object.values(regionStats).reduce((sum, r) => sum + r.count, 0))}}</div>
+                            <div class="metric-value">${formatNumber(Object.values(regionStats).reduce((sum, r) => sum + r.count, 0))}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">总金额（万元）</div>
-                            <div class="metric-value">${{formatCurrency(Object.values(regionStats).reduce((sum, r) => sum + r.amount, 0))}}</div>
+                            <div class="metric-value">${formatCurrency(Object.values(regionStats).reduce((sum, r) => sum + r.amount, 0))}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">总园区数</div>
-                            <div class="metric-value">${{formatNumber(Object.values(regionStats).reduce((sum, r) => sum + r.parks.size, 0))}}</div>
+                            <div class="metric-value">${formatNumber(Object.values(regionStats).reduce((sum, r) => sum + r.parks.size, 0))}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">总城市数</div>
-                            <div class="metric-value">${{formatNumber(Object.values(regionStats).reduce((sum, r) => sum + r.cities.size, 0))}}</div>
+                            <div class="metric-value">${formatNumber(Object.values(regionStats).reduce((sum, r) => sum + r.cities.size, 0))}</div>
                         </div>
                     </div>
                     
@@ -4523,20 +4827,20 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>所属区域</th><th>项目数</th><th>金额合计（万元）</th><th>平均项目金额（万元）</th><th>园区数</th><th>城市数</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(regionStats).sort((a, b) => regionStats[b].count - regionStats[a].count).map(region => {{
+                                ${Object.keys(regionStats).sort((a, b) => regionStats[b].count - regionStats[a].count).map(region => {
                                     const stats = regionStats[region];
                                     const avgAmount = stats.count > 0 ? (stats.amount / stats.count).toFixed(2) : 0;
                                     return `
                                         <tr>
-                                            <td>${{region}}</td>
-                                            <td>${{stats.count}}</td>
-                                            <td>${{formatCurrency(stats.amount)}}</td>
-                                            <td>${{avgAmount}}</td>
-                                            <td>${{stats.parks.size}}</td>
-                                            <td>${{stats.cities.size}}</td>
+                                            <td>${region}</td>
+                                            <td>${stats.count}</td>
+                                            <td>${formatCurrency(stats.amount)}</td>
+                                            <td>${avgAmount}</td>
+                                            <td>${stats.parks.size}</td>
+                                            <td>${stats.cities.size}</td>
                                         </tr>
                                     `;
-                                }}).join('')}}
+                                }).join('')}
                             </tbody>
                         </table>
                     </div>
@@ -4558,80 +4862,62 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                     </div>
                     
                     <h3>🔍 各区域详细分析</h3>
-                    ${{Object.keys(regionStats).sort((a, b) => regionStats[b].count - regionStats[a].count).map(region => {{
+                    ${Object.keys(regionStats).sort((a, b) => regionStats[b].count - regionStats[a].count).map(region => {
                         const stats = regionStats[region];
                         const regionData = validData.filter(d => d.所属区域 === region);
                         
                         // 按园区统计
-                        const parkStatsInRegion = {{}};
-                        regionData.forEach(d => {{
-                            const park = d.园区 || '未知';
-                            if (!parkStatsInRegion[park]) {{
-                                parkStatsInRegion[park] = {{count: 0, amount: 0}};
-                            }}
-                            parkStatsInRegion[park].count++;
-                            parkStatsInRegion[park].amount += parseFloat(d.拟定金额) || 0;
-                        }});
+                        const parkStatsInRegion = groupStats(regionData, '园区');
                         
                         // 按专业统计（过滤掉"其它系统"）
-                        const profStatsInRegion = {{}};
-                        regionData.forEach(d => {{
-                            const prof = d.专业 || '未分类';
-                            // 过滤掉"其它系统"分类
-                            if (prof === '其它系统' || prof === '其他系统') return;
-                            if (!profStatsInRegion[prof]) {{
-                                profStatsInRegion[prof] = {{count: 0, amount: 0}};
-                            }}
-                            profStatsInRegion[prof].count++;
-                            profStatsInRegion[prof].amount += parseFloat(d.拟定金额) || 0;
-                        }});
+                        const profStatsInRegion = groupStats(regionData, '专业', skipOtherProf);
                         
                         // 按城市统计
-                        const cityStatsInRegion = {{}};
-                        regionData.forEach(d => {{
+                        const cityStatsInRegion = {};
+                        regionData.forEach(d => {
                             const city = d.城市 || '未知';
-                            if (!cityStatsInRegion[city]) {{
-                                cityStatsInRegion[city] = {{count: 0, amount: 0, parks: new Set()}};
-                            }}
+                            if (!cityStatsInRegion[city]) {
+                                cityStatsInRegion[city] = {count: 0, amount: 0, parks: new Set()};
+                            }
                             cityStatsInRegion[city].count++;
-                            cityStatsInRegion[city].amount += parseFloat(d.拟定金额) || 0;
+                            cityStatsInRegion[city].amount += d[AMOUNT];
                             if (d.园区) cityStatsInRegion[city].parks.add(d.园区);
-                        }});
+                        });
                         
                         // 按项目分级统计
-                        const levelStatsInRegion = {{}};
-                        regionData.forEach(d => {{
+                        const levelStatsInRegion = {};
+                        regionData.forEach(d => {
                             const level = d.项目分级 || '未分类';
-                            if (!levelStatsInRegion[level]) {{
-                                levelStatsInRegion[level] = {{count: 0, amount: 0}};
-                            }}
+                            if (!levelStatsInRegion[level]) {
+                                levelStatsInRegion[level] = {count: 0, amount: 0};
+                            }
                             levelStatsInRegion[level].count++;
-                            levelStatsInRegion[level].amount += parseFloat(d.拟定金额) || 0;
-                        }});
+                            levelStatsInRegion[level].amount += d[AMOUNT];
+                        });
                         
                         return `
                             <div class="expander">
                                 <div class="expander-header" onclick="toggleExpander(this)">
-                                    <span><strong>${{region}}</strong> - ${{stats.parks.size}}个园区，${{stats.count}}个项目，${{formatCurrency(stats.amount)}}万元</span>
+                                    <span><strong>${region}</strong> - ${stats.parks.size}个园区，${stats.count}个项目，${formatCurrency(stats.amount)}万元</span>
                                     <span class="expander-icon">▶</span>
                                 </div>
                                 <div class="expander-content">
                                     <div class="metrics">
                                         <div class="metric">
                                             <div class="metric-label">项目数</div>
-                                            <div class="metric-value">${{stats.count}}</div>
+                                            <div class="metric-value">${stats.count}</div>
                                         </div>
                                         <div class="metric">
                                             <div class="metric-label">金额合计（万元）</div>
-                                            <div class="metric-value">${{formatCurrency(stats.amount)}}</div>
+                                            <div class="metric-value">${formatCurrency(stats.amount)}</div>
                                         </div>
                                         <div class="metric">
                                             <div class="metric-label">园区数</div>
-                                            <div class="metric-value">${{stats.parks.size}}</div>
+                                            <div class="metric-value">${stats.parks.size}</div>
                                         </div>
                                         <div class="metric">
                                             <div class="metric-label">城市数</div>
-                                            <div class="metric-value">${{stats.cities.size}}</div>
+                                            <div class="metric-value">${stats.cities.size}</div>
                                         </div>
                                     </div>
                                     
@@ -4642,13 +4928,13 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                                 <tr><th>园区</th><th>项目数</th><th>金额合计（万元）</th></tr>
                                             </thead>
                                             <tbody>
-                                                ${{Object.keys(parkStatsInRegion).sort((a, b) => parkStatsInRegion[b].amount - parkStatsInRegion[a].amount).map(park => `
+                                                ${Object.keys(parkStatsInRegion).sort((a, b) => parkStatsInRegion[b].amount - parkStatsInRegion[a].amount).map(park => `
                                                     <tr>
-                                                        <td>${{park}}</td>
-                                                        <td>${{parkStatsInRegion[park].count}}</td>
-                                                        <td>${{formatCurrency(parkStatsInRegion[park].amount)}}</td>
+                                                        <td>${park}</td>
+                                                        <td>${parkStatsInRegion[park].count}</td>
+                                                        <td>${formatCurrency(parkStatsInRegion[park].amount)}</td>
                                                     </tr>
-                                                `).join('')}}
+                                                `).join('')}
                                             </tbody>
                                         </table>
                                     </div>
@@ -4660,14 +4946,14 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                                 <tr><th>城市</th><th>项目数</th><th>金额合计（万元）</th><th>园区数</th></tr>
                                             </thead>
                                             <tbody>
-                                                ${{Object.keys(cityStatsInRegion).sort((a, b) => cityStatsInRegion[b].count - cityStatsInRegion[a].count).map(city => `
+                                                ${Object.keys(cityStatsInRegion).sort((a, b) => cityStatsInRegion[b].count - cityStatsInRegion[a].count).map(city => `
                                                     <tr>
-                                                        <td>${{city}}</td>
-                                                        <td>${{cityStatsInRegion[city].count}}</td>
-                                                        <td>${{formatCurrency(cityStatsInRegion[city].amount)}}</td>
-                                                        <td>${{cityStatsInRegion[city].parks.size}}</td>
+                                                        <td>${city}</td>
+                                                        <td>${cityStatsInRegion[city].count}</td>
+                                                        <td>${formatCurrency(cityStatsInRegion[city].amount)}</td>
+                                                        <td>${cityStatsInRegion[city].parks.size}</td>
                                                     </tr>
-                                                `).join('')}}
+                                                `).join('')}
                                             </tbody>
                                         </table>
                                     </div>
@@ -4679,13 +4965,13 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                                 <tr><th>专业</th><th>项目数</th><th>金额合计（万元）</th></tr>
                                             </thead>
                                             <tbody>
-                                                ${{Object.keys(profStatsInRegion).sort((a, b) => profStatsInRegion[b].amount - profStatsInRegion[a].amount).map(prof => `
+                                                ${Object.keys(profStatsInRegion).sort((a, b) => profStatsInRegion[b].amount - profStatsInRegion[a].amount).map(prof => `
                                                     <tr>
-                                                        <td>${{prof}}</td>
-                                                        <td>${{profStatsInRegion[prof].count}}</td>
-                                                        <td>${{formatCurrency(profStatsInRegion[prof].amount)}}</td>
+                                                        <td>${prof}</td>
+                                                        <td>${profStatsInRegion[prof].count}</td>
+                                                        <td>${formatCurrency(profStatsInRegion[prof].amount)}</td>
                                                     </tr>
-                                                `).join('')}}
+                                                `).join('')}
                                             </tbody>
                                         </table>
                                     </div>
@@ -4697,13 +4983,13 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                                 <tr><th>项目分级</th><th>项目数</th><th>金额合计（万元）</th></tr>
                                             </thead>
                                             <tbody>
-                                                ${{Object.keys(levelStatsInRegion).sort((a, b) => levelStatsInRegion[b].count - levelStatsInRegion[a].count).map(level => `
+                                                ${Object.keys(levelStatsInRegion).sort((a, b) => levelStatsInRegion[b].count - levelStatsInRegion[a].count).map(level => `
                                                     <tr>
-                                                        <td>${{level || '未分类'}}</td>
-                                                        <td>${{levelStatsInRegion[level].count}}</td>
-                                                        <td>${{formatCurrency(levelStatsInRegion[level].amount)}}</td>
+                                                        <td>${level || '未分类'}</td>
+                                                        <td>${levelStatsInRegion[level].count}</td>
+                                                        <td>${formatCurrency(levelStatsInRegion[level].amount)}</td>
                                                     </tr>
-                                                `).join('')}}
+                                                `).join('')}
                                             </tbody>
                                         </table>
                                     </div>
@@ -4712,164 +4998,148 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                     <div class="data-table-container">
                                         <table>
                                             <thead>
-                                                <tr><th>园区</th><th>城市</th><th>序号</th><th>项目分级</th>${{regionData[0] && regionData[0].项目分类 ? '<th>项目分类</th>' : ''}}<th>专业</th><th>项目名称</th><th>拟定金额</th></tr>
+                                                <tr><th>园区</th><th>城市</th><th>序号</th><th>项目分级</th>${regionData[0] && regionData[0].项目分类 ? '<th>项目分类</th>' : ''}<th>专业</th><th>项目名称</th><th>拟定金额</th></tr>
                                             </thead>
                                             <tbody>
-                                                ${{regionData.slice(0, 20).map(d => `
+                                                ${regionData.slice(0, 20).map(d => `
                                                     <tr>
-                                                        <td>${{getValue(d, '园区')}}</td>
-                                                        <td>${{getValue(d, '城市')}}</td>
-                                                        <td>${{getValue(d, '序号')}}</td>
-                                                        <td>${{getValue(d, '项目分级')}}</td>
-                                                        ${{d.项目分类 ? `<td>${{getValue(d, '项目分类')}}</td>` : ''}}
-                                                        <td>${{getValue(d, '专业')}}</td>
-                                                        <td>${{getValue(d, '项目名称')}}</td>
-                                                        <td>${{formatCurrency(getValue(d, '拟定金额'))}}</td>
+                                                        <td>${getValue(d, '园区')}</td>
+                                                        <td>${getValue(d, '城市')}</td>
+                                                        <td>${getValue(d, '序号')}</td>
+                                                        <td>${getValue(d, '项目分级')}</td>
+                                                        ${d.项目分类 ? `<td>${getValue(d, '项目分类')}</td>` : ''}
+                                                        <td>${getValue(d, '专业')}</td>
+                                                        <td>${getValue(d, '项目名称')}</td>
+                                                        <td>${formatCurrency(getValue(d, '拟定金额'))}</td>
                                                     </tr>
-                                                `).join('')}}
+                                                `).join('')}
                                             </tbody>
                                         </table>
                                     </div>
-                                    ${{regionData.length > 20 ? `<p style="color: #666; font-size: 12px; margin-top: 10px;">共 ${{regionData.length}} 条项目，仅显示前20条。可在「全部项目」Tab 中查看完整列表。</p>` : ''}}
+                                    ${regionData.length > 20 ? `<p style="color: #666; font-size: 12px; margin-top: 10px;">共 ${regionData.length} 条项目，仅显示前20条。可在「全部项目」Tab 中查看完整列表。</p>` : ''}
                                 </div>
                             </div>
                         `;
-                    }}).join('')}}
+                    }).join('')}
                 </div>
             `;
             
             container.innerHTML = html;
             
             // 渲染区域对比图表
-            setTimeout(() => {{
+            setTimeout(() => {
+                const charts = [];
                 const regionLabels = Object.keys(regionStats).sort((a, b) => regionStats[b].count - regionStats[a].count);
                 const regionCounts = regionLabels.map(r => regionStats[r].count);
                 const regionAmounts = regionLabels.map(r => regionStats[r].amount);
                 const colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8'];
                 
                 // 第一个子图：项目数柱状图
-                Plotly.newPlot('chart-region-count-bar', [{{
+                charts.push(['chart-region-count-bar', id => Plotly.react(id, [{
                     x: regionLabels,
                     y: regionCounts,
                     type: 'bar',
-                    marker: {{color: colors.slice(0, regionLabels.length)}},
+                    marker: {color: colors.slice(0, regionLabels.length)},
                     text: regionCounts,
                     textposition: 'outside'
-                }}], {{
+                }], {
                     title: '各区域项目数对比',
-                    xaxis: {{title: '所属区域', tickangle: 0}},
-                    yaxis: {{title: '项目数'}},
+                    xaxis: {title: '所属区域', tickangle: 0},
+                    yaxis: {title: '项目数'},
                     showlegend: false,
                     height: 350
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
                 // 第二个子图：金额柱状图
-                Plotly.newPlot('chart-region-amount-bar', [{{
+                charts.push(['chart-region-amount-bar', id => Plotly.react(id, [{
                     x: regionLabels,
                     y: regionAmounts,
                     type: 'bar',
-                    marker: {{color: colors.slice(0, regionLabels.length)}},
+                    marker: {color: colors.slice(0, regionLabels.length)},
                     text: regionAmounts.map(a => formatCurrency(a)),
                     textposition: 'outside'
-                }}], {{
+                }], {
                     title: '各区域金额对比（万元）',
-                    xaxis: {{title: '所属区域', tickangle: 0}},
-                    yaxis: {{title: '金额（万元）'}},
+                    xaxis: {title: '所属区域', tickangle: 0},
+                    yaxis: {title: '金额（万元）'},
                     showlegend: false,
                     height: 350
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
                 // 第三个子图：金额分布饼图
-                Plotly.newPlot('chart-region-amount-pie', [{{
+                charts.push(['chart-region-amount-pie', id => Plotly.react(id, [{
                     values: regionAmounts,
                     labels: regionLabels,
                     type: 'pie',
                     hole: 0.4,
                     textinfo: 'label+percent+value',
-                    texttemplate: '%{{label}}<br>%{{percent}}<br>%{{value:,.0f}}万元',
-                    marker: {{colors: colors.slice(0, regionLabels.length)}}
-                }}], {{
+                    texttemplate: '%{label}<br>%{percent}<br>%{value:,.0f}万元',
+                    marker: {colors: colors.slice(0, regionLabels.length)}
+                }], {
                     title: '各区域金额分布（万元）',
                     showlegend: true,
                     height: 350
-                }}, {{displayModeBar: false}});
+                }, {displayModeBar: false})]);
                 
                 // 第四个子图：项目数分布饼图
-                Plotly.newPlot('chart-region-count-pie', [{{
+                charts.push(['chart-region-count-pie', id => Plotly.react(id, [{
                     values: regionCounts,
                     labels: regionLabels,
                     type: 'pie',
                     hole: 0.4,
                     textinfo: 'label+percent+value',
-                    texttemplate: '%{{label}}<br>%{{percent}}<br>%{{value}}项',
-                    marker: {{colors: colors.slice(0, regionLabels.length)}}
-                }}], {{
+                    texttemplate: '%{label}<br>%{percent}<br>%{value}项',
+                    marker: {colors: colors.slice(0, regionLabels.length)}
+                }], {
                     title: '各区域项目数分布',
                     showlegend: true,
                     height: 350
-                }}, {{displayModeBar: false}});
-            }}, 100);
-        }}
+                }, {displayModeBar: false})]);
+                drawChartsWhenVisible(2, charts);
+            }, 100);
+        }
         
         // 标签页3: 各园区分级分类
-        function renderTab3() {{
+        function renderTab3() {
             const validData = getValidProjects(filteredData);
             const container = document.getElementById('tab-3');
             
-            if (validData.length === 0) {{
+            if (validData.length === 0) {
                 container.innerHTML = '<div class="warning-box">当前筛选条件下暂无数据。</div>';
                 return;
-            }}
+            }
             
             // 按分级统计
-            const levelStats = {{}};
-            validData.forEach(d => {{
+            const levelStats = {};
+            validData.forEach(d => {
                 const level = d.项目分级 || '未分类';
-                if (!levelStats[level]) {{
-                    levelStats[level] = {{count: 0, amount: 0}};
-                }}
+                if (!levelStats[level]) {
+                    levelStats[level] = {count: 0, amount: 0};
+                }
                 levelStats[level].count++;
-                levelStats[level].amount += parseFloat(d.拟定金额) || 0;
-            }});
+                levelStats[level].amount += d[AMOUNT];
+            });
             
             // 按专业统计（过滤掉"其它系统"）
-            const profStats = {{}};
-            validData.forEach(d => {{
-                const prof = d.专业 || '未分类';
-                // 过滤掉"其它系统"分类
-                if (prof === '其它系统' || prof === '其他系统') return;
-                if (!profStats[prof]) {{
-                    profStats[prof] = {{count: 0, amount: 0}};
-                }}
-                profStats[prof].count++;
-                profStats[prof].amount += parseFloat(d.拟定金额) || 0;
-            }});
+            const profStats = groupStats(validData, '专业', skipOtherProf);
             
             // 按园区统计
-            const parkStats = {{}};
-            validData.forEach(d => {{
-                const park = d.园区 || '未知';
-                if (!parkStats[park]) {{
-                    parkStats[park] = {{count: 0, amount: 0}};
-                }}
-                parkStats[park].count++;
-                parkStats[park].amount += parseFloat(d.拟定金额) || 0;
-            }});
+            const {parkStats} = aggregateParks();
             
             // 按专业分包统计（如果存在）
             const hasProfSubcontract = validData[0] && (validData[0].专业分包 || validData[0].专业细分);
             const profSubcontractCol = hasProfSubcontract ? (validData[0].专业分包 ? '专业分包' : '专业细分') : null;
-            const profSubcontractStats = {{}};
-            if (hasProfSubcontract) {{
-                validData.forEach(d => {{
+            const profSubcontractStats = {};
+            if (hasProfSubcontract) {
+                validData.forEach(d => {
                     const val = d[profSubcontractCol] || '未分类';
-                    if (!profSubcontractStats[val]) {{
-                        profSubcontractStats[val] = {{count: 0, amount: 0}};
-                    }}
+                    if (!profSubcontractStats[val]) {
+                        profSubcontractStats[val] = {count: 0, amount: 0};
+                    }
                     profSubcontractStats[val].count++;
-                    profSubcontractStats[val].amount += parseFloat(d.拟定金额) || 0;
-                }});
-            }}
+                    profSubcontractStats[val].amount += d[AMOUNT];
+                });
+            }
             
             let html = `
                 <div class="section">
@@ -4882,13 +5152,13 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>项目分级</th><th>项目数</th><th>金额合计（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(levelStats).map(level => `
+                                ${Object.keys(levelStats).map(level => `
                                     <tr>
-                                        <td>${{level || '未分类'}}</td>
-                                        <td>${{levelStats[level].count}}</td>
-                                        <td>${{formatCurrency(levelStats[level].amount)}}</td>
+                                        <td>${level || '未分类'}</td>
+                                        <td>${levelStats[level].count}</td>
+                                        <td>${formatCurrency(levelStats[level].amount)}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
@@ -4900,18 +5170,18 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>专业</th><th>项目数</th><th>金额合计（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(profStats).map(prof => `
+                                ${Object.keys(profStats).map(prof => `
                                     <tr>
-                                        <td>${{prof || '未分类'}}</td>
-                                        <td>${{profStats[prof].count}}</td>
-                                        <td>${{formatCurrency(profStats[prof].amount)}}</td>
+                                        <td>${prof || '未分类'}</td>
+                                        <td>${profStats[prof].count}</td>
+                                        <td>${formatCurrency(profStats[prof].amount)}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
                     
-                    ${{hasProfSubcontract ? `
+                    ${hasProfSubcontract ? `
                     <h3>按专业分包</h3>
                     <div class="data-table-container">
                         <table>
@@ -4919,17 +5189,17 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>专业分包</th><th>项目数</th><th>金额合计（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(profSubcontractStats).sort((a, b) => profSubcontractStats[b].amount - profSubcontractStats[a].amount).map(key => `
+                                ${Object.keys(profSubcontractStats).sort((a, b) => profSubcontractStats[b].amount - profSubcontractStats[a].amount).map(key => `
                                     <tr>
-                                        <td>${{key || '未分类'}}</td>
-                                        <td>${{profSubcontractStats[key].count}}</td>
-                                        <td>${{formatCurrency(profSubcontractStats[key].amount)}}</td>
+                                        <td>${key || '未分类'}</td>
+                                        <td>${profSubcontractStats[key].count}</td>
+                                        <td>${formatCurrency(profSubcontractStats[key].amount)}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
-                    ` : ''}}
+                    ` : ''}
                     
                     <h3>按园区</h3>
                     <div class="data-table-container">
@@ -4938,13 +5208,13 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>园区</th><th>项目数</th><th>金额合计（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(parkStats).sort((a, b) => parkStats[b].amount - parkStats[a].amount).map(park => `
+                                ${Object.keys(parkStats).sort((a, b) => parkStats[b].amount - parkStats[a].amount).map(park => `
                                     <tr>
-                                        <td>${{park}}</td>
-                                        <td>${{parkStats[park].count}}</td>
-                                        <td>${{formatCurrency(parkStats[park].amount)}}</td>
+                                        <td>${park}</td>
+                                        <td>${parkStats[park].count}</td>
+                                        <td>${formatCurrency(parkStats[park].amount)}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
@@ -4955,34 +5225,34 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                             <strong>按分级筛选：</strong>
                             <select id="level-filter-tab3" multiple style="padding: 5px; min-width: 150px;" onchange="filterTab3()">
                                 <option value="">全部</option>
-                                ${{Object.keys(levelStats).map(level => `
-                                    <option value="${{level}}">${{level || '未分类'}}</option>
-                                `).join('')}}
+                                ${Object.keys(levelStats).map(level => `
+                                    <option value="${level}">${level || '未分类'}</option>
+                                `).join('')}
                             </select>
                         </label>
                         <label style="display: inline-block; margin-right: 15px;">
                             <strong>按专业筛选：</strong>
                             <select id="prof-filter-tab3" multiple style="padding: 5px; min-width: 150px;" onchange="filterTab3()">
                                 <option value="">全部</option>
-                                ${{Object.keys(profStats).map(prof => `
-                                    <option value="${{prof}}">${{prof || '未分类'}}</option>
-                                `).join('')}}
+                                ${Object.keys(profStats).map(prof => `
+                                    <option value="${prof}">${prof || '未分类'}</option>
+                                `).join('')}
                             </select>
                         </label>
-                        ${{hasProfSubcontract ? `
+                        ${hasProfSubcontract ? `
                         <label style="display: inline-block;">
                             <strong>按专业分包筛选：</strong>
                             <select id="prof-subcontract-filter-tab3" multiple style="padding: 5px; min-width: 150px;" onchange="filterTab3()">
                                 <option value="">全部</option>
-                                ${{Object.keys(profSubcontractStats).map(key => `
-                                    <option value="${{key}}">${{key || '未分类'}}</option>
-                                `).join('')}}
+                                ${Object.keys(profSubcontractStats).map(key => `
+                                    <option value="${key}">${key || '未分类'}</option>
+                                `).join('')}
                             </select>
                         </label>
-                        ` : ''}}
+                        ` : ''}
                     </div>
                     <div class="info-box">
-                        <p id="filter-count-tab3">共 ${{validData.length}} 条项目</p>
+                        <p id="filter-count-tab3">共 ${validData.length} 条项目</p>
                     </div>
                     <div class="data-table-container">
                         <table id="detail-table-tab3">
@@ -4991,35 +5261,35 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                     <th>园区</th>
                                     <th>序号</th>
                                     <th>项目分级</th>
-                                    ${{validData[0] && validData[0].项目分类 ? '<th>项目分类</th>' : ''}}
+                                    ${validData[0] && validData[0].项目分类 ? '<th>项目分类</th>' : ''}
                                     <th>专业</th>
-                                    ${{hasProfSubcontract ? '<th>专业分包</th>' : ''}}
+                                    ${hasProfSubcontract ? '<th>专业分包</th>' : ''}
                                     <th>项目名称</th>
                                     <th>拟定金额</th>
-                                    ${{validData[0] && validData[0].拟定承建组织 ? '<th>拟定承建组织</th>' : ''}}
-                                    ${{validData[0] && validData[0].需求立项 ? '<th>需求立项</th>' : ''}}
-                                    ${{validData[0] && (validData[0].验收 || validData[0]['验收(社区需求完成交付)']) ? '<th>验收</th>' : ''}}
+                                    ${validData[0] && validData[0].拟定承建组织 ? '<th>拟定承建组织</th>' : ''}
+                                    ${validData[0] && validData[0].需求立项 ? '<th>需求立项</th>' : ''}
+                                    ${validData[0] && (validData[0].验收 || validData[0]['验收(社区需求完成交付)']) ? '<th>验收</th>' : ''}
                                 </tr>
                             </thead>
                             <tbody>
-                                ${{validData.map(d => {{
+                                ${validData.map(d => {
                                     const profSubcontractVal = hasProfSubcontract ? (getValue(d, profSubcontractCol) || '') : '';
                                     return `
-                                    <tr data-level="${{getValue(d, '项目分级')}}" data-prof="${{getValue(d, '专业')}}" ${{hasProfSubcontract ? `data-prof-subcontract="${{profSubcontractVal}}"` : ''}}>
-                                        <td>${{getValue(d, '园区')}}</td>
-                                        <td>${{getValue(d, '序号')}}</td>
-                                        <td>${{getValue(d, '项目分级')}}</td>
-                                        ${{d.项目分类 ? `<td>${{getValue(d, '项目分类')}}</td>` : ''}}
-                                        <td>${{getValue(d, '专业')}}</td>
-                                        ${{hasProfSubcontract ? `<td>${{profSubcontractVal || '未分类'}}</td>` : ''}}
-                                        <td>${{getValue(d, '项目名称')}}</td>
-                                        <td>${{formatCurrency(getValue(d, '拟定金额'))}}</td>
-                                        ${{d.拟定承建组织 ? `<td>${{getValue(d, '拟定承建组织')}}</td>` : ''}}
-                                        ${{d.需求立项 ? `<td>${{getValue(d, '需求立项')}}</td>` : ''}}
-                                        ${{(d.验收 || d['验收(社区需求完成交付)']) ? `<td>${{getValue(d, '验收(社区需求完成交付)') || getValue(d, '验收')}}</td>` : ''}}
+                                    <tr data-level="${getValue(d, '项目分级')}" data-prof="${getValue(d, '专业')}" ${hasProfSubcontract ? `data-prof-subcontract="${profSubcontractVal}"` : ''}>
+                                        <td>${getValue(d, '园区')}</td>
+                                        <td>${getValue(d, '序号')}</td>
+                                        <td>${getValue(d, '项目分级')}</td>
+                                        ${d.项目分类 ? `<td>${getValue(d, '项目分类')}</td>` : ''}
+                                        <td>${getValue(d, '专业')}</td>
+                                        ${hasProfSubcontract ? `<td>${profSubcontractVal || '未分类'}</td>` : ''}
+                                        <td>${getValue(d, '项目名称')}</td>
+                                        <td>${formatCurrency(getValue(d, '拟定金额'))}</td>
+                                        ${d.拟定承建组织 ? `<td>${getValue(d, '拟定承建组织')}</td>` : ''}
+                                        ${d.需求立项 ? `<td>${getValue(d, '需求立项')}</td>` : ''}
+                                        ${(d.验收 || d['验收(社区需求完成交付)']) ? `<td>${getValue(d, '验收(社区需求完成交付)') || getValue(d, '验收')}</td>` : ''}
                                     </tr>
                                     `;
-                                }}).join('')}}
+                                }).join('')}
                             </tbody>
                         </table>
                     </div>
@@ -5027,10 +5297,10 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
             `;
             
             container.innerHTML = html;
-        }}
+        }
         
         // 标签页3的筛选功能
-        function filterTab3() {{
+        function filterTab3() {
             const levelFilter = Array.from(document.getElementById('level-filter-tab3').selectedOptions).map(opt => opt.value).filter(v => v);
             const profFilter = Array.from(document.getElementById('prof-filter-tab3').selectedOptions).map(opt => opt.value).filter(v => v);
             const profSubcontractFilterEl = document.getElementById('prof-subcontract-filter-tab3');
@@ -5039,7 +5309,7 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
             const rows = document.querySelectorAll('#detail-table-tab3 tbody tr');
             let visibleCount = 0;
             
-            rows.forEach(row => {{
+            rows.forEach(row => {
                 const level = row.getAttribute('data-level') || '';
                 const prof = row.getAttribute('data-prof') || '';
                 const profSubcontract = row.getAttribute('data-prof-subcontract') || '';
@@ -5048,85 +5318,74 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                 const profMatch = profFilter.length === 0 || profFilter.includes(prof);
                 const profSubcontractMatch = profSubcontractFilter.length === 0 || profSubcontractFilter.includes(profSubcontract);
                 
-                if (levelMatch && profMatch && profSubcontractMatch) {{
+                if (levelMatch && profMatch && profSubcontractMatch) {
                     row.style.display = '';
                     visibleCount++;
-                }} else {{
+                } else {
                     row.style.display = 'none';
-                }}
-            }});
+                }
+            });
             
-            document.getElementById('filter-count-tab3').textContent = `共 ${{visibleCount}} 条项目`;
-        }}
+            document.getElementById('filter-count-tab3').textContent = `共 ${visibleCount} 条项目`;
+        }
         
         // 标签页4: 总部视图
-        function renderTab4() {{
+        function renderTab4() {
             const validData = getValidProjects(filteredData);
             const container = document.getElementById('tab-4');
             
-            if (validData.length === 0) {{
+            if (validData.length === 0) {
                 container.innerHTML = '<div class="warning-box">当前筛选条件下暂无数据。</div>';
                 return;
-            }}
+            }
             
             // 稳定需求判断：需求已立项（需求立项日期有效）且非无效日期
             const stableData = validData.filter(d => isStableRequirement(d));
             
             // 按园区统计稳定需求
-            const stableParkStats = {{}};
-            stableData.forEach(d => {{
+            const stableParkStats = {};
+            let stableAmount = 0;
+            stableData.forEach(d => {
+                stableAmount += d[AMOUNT];
                 const park = d.园区 || '未知';
-                if (!stableParkStats[park]) {{
-                    stableParkStats[park] = {{count: 0, amount: 0}};
-                }}
+                if (!stableParkStats[park]) {
+                    stableParkStats[park] = {count: 0, amount: 0};
+                }
                 stableParkStats[park].count++;
-                stableParkStats[park].amount += parseFloat(d.拟定金额) || 0;
-            }});
+                stableParkStats[park].amount += d[AMOUNT];
+            });
             
             // 查找验收列和实施列
-            let acceptCol = null;
-            let implCol = null;
-            for (let key in validData[0]) {{
-                if (!acceptCol && (key.includes('验收') || key === '验收(社区需求完成交付)')) {{
-                    acceptCol = key;
-                }}
-                if (!implCol && key.includes('实施') && !key.toLowerCase().includes('时间')) {{
-                    implCol = key;
-                }}
-            }}
+            const acceptCol = COLS.accept;
+            const implCol = COLS.impl;
             
             // 施工进展与验收时间预告
-            const previewData = validData.map(d => {{
-                const preview = {{
+            const previewData = validData.map(d => {
+                const preview = {
                     园区: d.园区 || '',
                     序号: d.序号 || '',
                     项目名称: d.项目名称 || '',
-                    拟定金额: parseFloat(d.拟定金额) || 0,
+                    拟定金额: d[AMOUNT],
                     拟定承建组织: d.拟定承建组织 || '',
                     实施时间: implCol ? (d[implCol] || '') : '',
-                    验收时间: acceptCol ? (d[acceptCol] || '') : ''
-                }};
+                    验收时间: acceptCol ? (d[acceptCol] || '') : '',
+                    [DAYS.accept]: d[DAYS.accept]
+                };
                 
-                // 判断验收日期是否有效
-                const acceptDateStr = preview.验收时间;
-                preview.验收有效 = false;
-                if (acceptDateStr && acceptDateStr !== null && acceptDateStr !== '') {{
-                    const str = String(acceptDateStr).trim();
-                    if (str && !str.startsWith('-') && !str.includes('1900')) {{
-                        preview.验收有效 = true;
-                    }}
-                }}
+                // 判断验收日期是否有效：非空、非「-」开头、非 1900 占位
+                const acceptStr = String(preview.验收时间).trim();
+                preview.验收有效 = acceptStr !== '' && !acceptStr.startsWith('-') && !acceptStr.includes('1900');
                 
                 return preview;
-            }});
+            });
             
-            const acceptPreview = previewData.filter(d => d.验收有效).sort((a, b) => {{
-                const dateA = parseDate(a.验收时间);
-                const dateB = parseDate(b.验收时间);
-                if (!dateA) return 1;
-                if (!dateB) return -1;
-                return dateA - dateB;
-            }});
+            const acceptPreview = previewData.filter(d => d.验收有效).sort((a, b) => {
+                const dayA = a[DAYS.accept];
+                const dayB = b[DAYS.accept];
+                if (!(dayA >= 0)) return 1;
+                if (!(dayB >= 0)) return -1;
+                return dayA - dayB;
+            });
             
             let html = `
                 <div class="section">
@@ -5136,11 +5395,11 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                     <div class="metrics">
                         <div class="metric">
                             <div class="metric-label">稳定需求项目数</div>
-                            <div class="metric-value">${{stableData.length}}</div>
+                            <div class="metric-value">${stableData.length}</div>
                         </div>
                         <div class="metric">
                             <div class="metric-label">稳定需求金额合计（万元）</div>
-                            <div class="metric-value">${{formatCurrency(stableData.reduce((sum, d) => sum + (parseFloat(d.拟定金额) || 0), 0))}}</div>
+                            <div class="metric-value">${formatCurrency(stableAmount)}</div>
                         </div>
                     </div>
                     
@@ -5150,13 +5409,13 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 <tr><th>园区</th><th>稳定需求数量</th><th>稳定需求金额（万元）</th></tr>
                             </thead>
                             <tbody>
-                                ${{Object.keys(stableParkStats).sort((a, b) => stableParkStats[b].amount - stableParkStats[a].amount).map(park => `
+                                ${Object.keys(stableParkStats).sort((a, b) => stableParkStats[b].amount - stableParkStats[a].amount).map(park => `
                                     <tr>
-                                        <td>${{park}}</td>
-                                        <td>${{stableParkStats[park].count}}</td>
-                                        <td>${{formatCurrency(stableParkStats[park].amount)}}</td>
+                                        <td>${park}</td>
+                                        <td>${stableParkStats[park].count}</td>
+                                        <td>${formatCurrency(stableParkStats[park].amount)}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
@@ -5176,23 +5435,23 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 </tr>
                             </thead>
                             <tbody>
-                                ${{previewData.map(d => `
-                                    <tr style="background-color: ${{d.验收有效 ? '#e8f5e9' : ''}}">
-                                        <td>${{d.园区}}</td>
-                                        <td>${{d.序号}}</td>
-                                        <td>${{d.项目名称}}</td>
-                                        <td>${{formatCurrency(d.拟定金额)}}</td>
-                                        <td>${{d.拟定承建组织}}</td>
-                                        <td>${{d.实施时间}}</td>
-                                        <td>${{d.验收时间}}</td>
+                                ${previewData.map(d => `
+                                    <tr style="background-color: ${d.验收有效 ? '#e8f5e9' : ''}">
+                                        <td>${d.园区}</td>
+                                        <td>${d.序号}</td>
+                                        <td>${d.项目名称}</td>
+                                        <td>${formatCurrency(d.拟定金额)}</td>
+                                        <td>${d.拟定承建组织}</td>
+                                        <td>${d.实施时间}</td>
+                                        <td>${d.验收时间}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
                     
                     <h4>验收时间预告（仅含有效日期）</h4>
-                    ${{acceptPreview.length > 0 ? `
+                    ${acceptPreview.length > 0 ? `
                     <div class="data-table-container">
                         <table>
                             <thead>
@@ -5207,73 +5466,83 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
                                 </tr>
                             </thead>
                             <tbody>
-                                ${{acceptPreview.map(d => `
+                                ${acceptPreview.map(d => `
                                     <tr>
-                                        <td>${{d.园区}}</td>
-                                        <td>${{d.序号}}</td>
-                                        <td>${{d.项目名称}}</td>
-                                        <td>${{formatCurrency(d.拟定金额)}}</td>
-                                        <td>${{d.拟定承建组织}}</td>
-                                        <td>${{d.实施时间}}</td>
-                                        <td>${{d.验收时间}}</td>
+                                        <td>${d.园区}</td>
+                                        <td>${d.序号}</td>
+                                        <td>${d.项目名称}</td>
+                                        <td>${formatCurrency(d.拟定金额)}</td>
+                                        <td>${d.拟定承建组织}</td>
+                                        <td>${d.实施时间}</td>
+                                        <td>${d.验收时间}</td>
                                     </tr>
-                                `).join('')}}
+                                `).join('')}
                             </tbody>
                         </table>
                     </div>
                     ` : '<div class="info-box">暂无有效验收日期，请在一线填报「验收(社区需求完成交付)」节点。</div>'
-                    }}
+                    }
                 </div>
             `;
             
             container.innerHTML = html;
-        }}
+        }
         
         // 标签页5: 全部项目
-        function renderTab5() {{
+        function renderTab5() {
             const validData = getValidProjects(filteredData);
             const container = document.getElementById('tab-5');
             
-            if (validData.length === 0) {{
+            if (validData.length === 0) {
                 container.innerHTML = '<div class="warning-box">当前筛选条件下暂无数据。</div>';
                 return;
-            }}
+            }
             
             // 获取所有列
             const columns = new Set();
-            validData.forEach(d => {{
+            validData.forEach(d => {
                 Object.keys(d).forEach(k => columns.add(k));
-            }});
+            });
             const columnList = ['园区', '所属区域', '城市', ...Array.from(columns).filter(c => !['园区', '所属区域', '城市'].includes(c))];
             
+            // 明细表行数多：按行预分配数组、单元格复用同一数组逐个填充，最后各 join 一次
+            const isAmountCol = columnList.map(col => col.includes('金额'));
+            const bodyRows = new Array(validData.length);
+            const cells = new Array(columnList.length);
+            for (let i = 0; i < validData.length; i++) {
+                const d = validData[i];
+                for (let j = 0; j < columnList.length; j++) {
+                    const val = getValue(d, columnList[j]);
+                    if (isValidNumber(val) && isAmountCol[j]) {
+                        cells[j] = `<td>${formatCurrency(val)}</td>`;
+                    } else if (isValidNumber(val)) {
+                        cells[j] = `<td>${formatNumber(val)}</td>`;
+                    } else {
+                        cells[j] = `<td>${String(val).substring(0, 50)}</td>`;
+                    }
+                }
+                bodyRows[i] = `
+                                    <tr>
+                                        ${cells.join('')}
+                                    </tr>
+                                `;
+            }
+            
             let html = `
                 <div class="section">
                     <h2>📑 全部项目清单</h2>
                     <div class="info-box">
-                        <p>共 ${{validData.length}} 条项目，以下列出所有项目明细。</p>
+                        <p>共 ${validData.length} 条项目，以下列出所有项目明细。</p>
                     </div>
                     <div class="data-table-container" style="overflow-x: auto;">
                         <table style="font-size: 11px;">
                             <thead>
                                 <tr>
-                                    ${{columnList.map(col => `<th>${{col}}</th>`).join('')}}
+                                    ${columnList.map(col => `<th>${col}</th>`).join('')}
                                 </tr>
                             </thead>
                             <tbody>
-                                ${{validData.map(d => `
-                                    <tr>
-                                        ${{columnList.map(col => {{
-                                            const val = getValue(d, col);
-                                            if (isValidNumber(val) && (col.includes('金额') || col.includes('金额'))) {{
-                                                return `<td>${{formatCurrency(val)}}</td>`;
-                                            }} else if (isValidNumber(val)) {{
-                                                return `<td>${{formatNumber(val)}}</td>`;
-                                            }} else {{
-                                                return `<td>${{String(val).substring(0, 50)}}</td>`;
-                                            }}
-                                        }}).join('')}}
-                                    </tr>
-                                `).join('')}}
+                                ${bodyRows.join('')}
                             </tbody>
                         </table>
                     </div>
@@ -5281,20 +5550,252 @@ def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
             `;
             
             container.innerHTML = html;
-        }}
+        }
         
         // 展开/收起功能
-        function toggleExpander(header) {{
+        function toggleExpander(header) {
             header.classList.toggle('active');
             const content = header.nextElementSibling;
             content.classList.toggle('active');
-        }}
+        }
         
-        // 初始化渲染
-        renderAllTabs();
+        // 初始化渲染：数据就绪后再渲染
+        dataReady.then(data => {
+            allData = data;
+            allData.forEach((d, i) => {
+                const idxs = byPark.get(d.园区);
+                if (idxs) idxs.push(i);
+                else byPark.set(d.园区, [i]);
+            });
+            filteredData = [...allData];
+            filteredIdx = Int32Array.from(allData, (_, i) => i);
+            renderAllTabs();
+        }).catch(err => {
+            document.getElementById('tab-0').innerHTML =
+                '<div class="warning-box">数据加载失败：' + err.message + '（请使用新版浏览器打开）</div>';
+        });
     </script>
 </body>
 </html>'''
+_HTML_PARTS = re.split(r"__(?:PARK_OPTIONS|DATA_SOURCE|PARKS_JSON|PARK_AGG|COLS)__", _INTERACTIVE_HTML_TEMPLATE)
+# 数据 JSON 超过该长度时压缩嵌入
+_HTML_GZIP_MIN_CHARS = 1 << 20
+
+
+# JS parseFloat 可识别的前缀：前导空白（含 BOM）后的 Infinity 或十进制数（仅 ASCII 数字）
+_JS_FLOAT_PREFIX = r"^[\s\ufeff]*([+-]?(?:Infinity|(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?))"
+
+
+def _js_parse_float(values: list) -> tuple[np.ndarray, np.ndarray]:
+    """按 JS parseFloat 口径解析导出列取值，返回 (数值数组, 是否为字符串)，无法解析为 NaN。"""
+    # 按不同取值解析一次再按编码展开；空值编码为 -1，落到末尾追加的 NaN
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    s = pd.Series(uniques, dtype=object)
+    is_str = s.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    out = s.where(~is_str).astype("float64").to_numpy(copy=True)
+    if is_str.any():
+        strs = s[is_str]
+        # 纯数字文本整列向量化转换，只有转换失败或非有限值（如 "12元"、"inf"）再按前缀正则解析
+        parsed = pd.to_numeric(strs, errors="coerce").to_numpy(dtype="float64", copy=True)
+        slow = ~np.isfinite(parsed)
+        if slow.any():
+            parsed[slow] = pd.to_numeric(
+                strs[slow].str.extract(_JS_FLOAT_PREFIX, expand=False), errors="coerce"
+            ).to_numpy(dtype="float64")
+        # to_numeric 把 "-0" 读成整数 0，按 JS 口径补回负零
+        zero = parsed == 0
+        if zero.any():
+            parsed[zero] = np.where(strs[zero].str.match(r"[\s\ufeff]*-"), -0.0, 0.0)
+        out[is_str] = parsed
+    return np.append(out, np.nan)[codes], np.append(is_str, False)[codes]
+
+
+def _js_number_str(v: float) -> str:
+    """数值按 JS Number#toString 口径转字符串：最短有效数字，指数 ≥ 21 或 < -6 时用科学计数法。"""
+    if np.isinf(v):
+        return "Infinity" if v > 0 else "-Infinity"
+    sign = "-" if v < 0 else ""
+    _, digits, exp = Decimal(repr(abs(v))).normalize().as_tuple()
+    d = "".join(map(str, digits))
+    k, n = len(d), len(d) + exp
+    if k <= n <= 21:
+        return sign + d + "0" * (n - k)
+    if 0 < n <= 21:
+        return sign + d[:n] + "." + d[n:]
+    if -6 < n <= 0:
+        return sign + "0." + "0" * -n + d
+    e = n - 1
+    return sign + d[0] + ("." + d[1:] if k > 1 else "") + "e" + ("+" if e > 0 else "-") + str(abs(e))
+
+
+def _js_key(v) -> str:
+    """值在页面端作对象键时的字符串（同 JS String(v)）；假值（空、0、NaN、false）返回空串。"""
+    if v is None or v is False or v == "" or v == 0 or v != v:
+        return ""
+    if v is True:
+        return "true"
+    if isinstance(v, (int, float, np.integer, np.floating)):
+        # JSON 数值在页面端均为双精度
+        return _js_number_str(float(v))
+    return str(v)
+
+
+def _逐值转换(values, fn, missing) -> np.ndarray:
+    """整列按值去重后转换：每个不同值只调用一次 fn，空值（None/NaN）取 missing。"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return np.array([fn(v) for v in uniques] + [missing], dtype=object)[codes]
+
+
+def _园区分组明细(codes: np.ndarray, k: int, keys: np.ndarray, amt: np.ndarray, pos: np.ndarray) -> list:
+    """园区下再按 keys 分组：每个园区 {键: [项目数, 金额, 首次出现行号]}，键按首次出现顺序。"""
+    key_codes, key_uniques = pd.factorize(keys)
+    m = max(len(key_uniques), 1)
+    # (园区, 键) 组合编码后同样按首次出现顺序 factorize，bincount 顺序累加
+    group_codes, groups = pd.factorize(codes.astype(np.int64) * m + key_codes)
+    count = np.bincount(group_codes, minlength=len(groups))
+    total = np.bincount(group_codes, weights=amt, minlength=len(groups))
+    _, first = np.unique(group_codes, return_index=True)
+    out = [{} for _ in range(k)]
+    for i, (park, key) in enumerate(zip(groups // m, groups % m)):
+        out[park][key_uniques[key]] = [int(count[i]), float(total[i]), int(pos[first[i]])]
+    return out
+
+
+def _园区汇总_for_html(data_columns: dict) -> dict:
+    """按交互页的统计口径预先按园区汇总有效项目：数量、金额、一级/总部关注/重大项目金额，
+    首行行号、城市与区域，以及园区内按专业（不含「其它系统」）、按项目分级的项目数与金额。"""
+    cols = dict(zip(data_columns["columns"], data_columns["data"]))
+    if "序号" not in cols or "园区" not in cols:
+        return {}
+    n = len(cols["序号"])
+    seq, seq_is_str = _js_parse_float(cols["序号"])
+    valid = ~np.isnan(seq) & (seq_is_str | (seq != 0))
+    amount, _ = _js_parse_float(cols.get("拟定金额") or [None] * n)
+    amount = np.where(np.isnan(amount), 0.0, amount)
+    # 一级项目：文本含「一级」「1级」，或数值为 1
+    level_vals = cols.get("项目分级") or [None] * n
+    level_num, _ = _js_parse_float(level_vals)
+    level1 = (level_num == 1) | _逐值转换(
+        level_vals, lambda v: isinstance(v, str) and ("一级" in v or "1级" in v), False
+    ).astype(bool)
+    hq = _逐值转换(
+        cols.get("总部重点关注项目") or [None] * n,
+        lambda v: isinstance(v, str) and (v.strip() == "是" or v.strip().lower() == "yes"),
+        False,
+    ).astype(bool)
+
+    # 园区键与页面一致：空值记为空串，页面端再归入「未知」；按首次出现顺序编码，bincount 顺序累加
+    idx = np.flatnonzero(valid)
+    parks = _逐值转换(cols["园区"], lambda p: p if isinstance(p, str) else ("" if not p else str(p)), "")
+    codes, uniques = pd.factorize(parks[idx])
+    k = len(uniques)
+    amt = amount[idx]
+    major = amt >= 200
+    count = np.bincount(codes, minlength=k)
+    总额 = np.bincount(codes, weights=amt, minlength=k)
+    一级 = np.bincount(codes, weights=np.where(level1[idx], amt, 0.0), minlength=k)
+    总部 = np.bincount(codes, weights=np.where(hq[idx], amt, 0.0), minlength=k)
+    重大 = np.bincount(codes, weights=np.where(major, amt, 0.0), minlength=k)
+    重大数 = np.bincount(codes, weights=major, minlength=k)
+    # 首次出现位置：factorize 按出现顺序编码，各园区首行即其编码首次出现处
+    _, first = np.unique(codes, return_index=True)
+    城市 = cols.get("城市") or [None] * n
+    区域 = cols.get("所属区域") or [None] * n
+    # 专业、分级键与页面一致：`值 || 默认名`
+    专业 = _逐值转换(cols.get("专业") or [None] * n, lambda v: _js_key(v) or "未分类", "未分类")[idx]
+    专业_ok = ~pd.Series(专业).isin(其它专业_SET).to_numpy()
+    专业明细 = _园区分组明细(codes[专业_ok], k, 专业[专业_ok], amt[专业_ok], idx[专业_ok])
+    分级 = _逐值转换(level_vals, lambda v: _js_key(v) or "未分类", "未分类")[idx]
+    分级明细 = _园区分组明细(codes, k, 分级, amt, idx)
+    return {
+        p: {
+            "count": int(count[i]), "amount": float(总额[i]), "level1": float(一级[i]),
+            "hq": float(总部[i]), "major": float(重大[i]), "majorCount": int(重大数[i]),
+            "first": int(idx[first[i]]), "city": 城市[idx[first[i]]], "region": 区域[idx[first[i]]],
+            "profs": 专业明细[i], "levels": 分级明细[i],
+        }
+        for i, p in enumerate(uniques)
+    }
+
+
+def _语义列_for_html(columns: list) -> dict:
+    """交互页用到的语义列名，按列顺序取首个匹配的列，缺失为 None。"""
+    def 首个(match):
+        return next((c for c in columns if match(c)), None)
+
+    return {
+        "impl": 首个(lambda c: "实施" in c and "时间" not in c.lower()),
+        "立项": 首个(lambda c: "立项" in c and not any(w in c for w in ("审核", "决策", "成本"))),
+        "需求立项": 首个(lambda c: "需求立项" in c),
+        "accept": 首个(lambda c: "验收" in c),
+    }
+
+
+def _日期天数_for_html(df: pd.DataFrame, semantic_cols: dict) -> dict:
+    """语义日期列按 _parse_timeline_dates 解析为 1970-01-01 起的天数，空值及 2000 年以前记为 -1；立项列先按园区向下填充。"""
+    days = {}
+    for role in ("impl", "立项", "需求立项", "accept"):
+        col = semantic_cols.get(role)
+        if col is None:
+            continue
+        values = df[col]
+        if role == "立项" and "序号" in df.columns:
+            # 合并单元格：按园区向下填充；与页面口径一致，园区为空值或空串的行统一归入「未知」一起填充
+            park = df["园区"]
+            values = _按园区向下填充(df.assign(园区=park.where(park.notna() & park.ne(""), "未知")), col).fillna(values)
+        dates = _parse_timeline_dates(values).to_numpy(dtype="datetime64[ns]")
+        valid = ~np.isnat(dates) & (dates >= np.datetime64("2000-01-01"))
+        days[role] = np.where(valid, dates.astype("datetime64[D]").astype("int64"), -1).tolist()
+    return days
+
+
+def _js_data_source(json_text: str) -> str:
+    """数据载入表达式（得到 Promise）：小数据直接嵌入字面量，大数据 gzip+base64 嵌入、浏览器端解压。"""
+    if len(json_text) < _HTML_GZIP_MIN_CHARS:
+        return "Promise.resolve(" + _js_safe(json_text) + ")"
+    blob = base64.b64encode(gzip.compress(json_text.encode("utf-8"), mtime=0)).decode("ascii")
+    return 'inflateJSON("' + blob + '")'
+
+
+def generate_interactive_html(df: pd.DataFrame, 园区选择: list) -> str:
+    """生成完全交互式的HTML文件，包含所有数据和交互功能，效果与运行程序一致"""
+    # 准备数据：将DataFrame转换为JSON格式
+    # 过滤汇总行
+    df_clean = _去除汇总行(df) if "序号" in df.columns else df
+    
+    # 添加城市和区域列
+    df_with_location = _add_城市和区域列(df_clean)
+    
+    # 转换为JSON（处理NaN值）：按列整体转换，以列式结构嵌入
+    data_columns = _df_to_json_columns(df_with_location)
+    semantic_cols = _语义列_for_html(data_columns["columns"])
+    data_columns["days"] = _日期天数_for_html(df_with_location, semantic_cols)
+    
+    # 获取所有园区列表
+    parks_list = sorted([p for p in df_with_location["园区"].dropna().unique().tolist() 
+                        if p and str(p).strip() and str(p) != "未知园区"])
+    
+    # 默认选中的园区：集合判断成员，选项 HTML 在模板外一次拼好
+    default_parks = frozenset(园区选择 if 园区选择 and len(园区选择) > 0 else parks_list)
+    park_options_html = ''.join(
+        f'<option value="{p}" {"selected" if p in default_parks else ""}>{p}</option>' for p in parks_list
+    )
+    
+    # 序列化JSON数据：JSON 本身即合法的 JS 字面量，直接嵌入脚本；数据量大时压缩嵌入
+    data_source = _js_data_source(_json_dumps(data_columns))
+    parks_json = _js_embed(parks_list)
+    park_agg_json = _js_embed(_园区汇总_for_html(data_columns))
+    cols_json = _js_embed(semantic_cols)
+    
+    # 生成HTML
+    html_content = "".join((
+        _HTML_PARTS[0], park_options_html,
+        _HTML_PARTS[1], data_source,
+        _HTML_PARTS[2], parks_json,
+        _HTML_PARTS[3], park_agg_json,
+        _HTML_PARTS[4], cols_json,
+        _HTML_PARTS[5],
+    ))
     
     return html_content
 
@@ -5388,6 +5889,36 @@ def _answer_with_deepseek(api_key: str | None, question: str, df: pd.DataFrame)
         return f"调用 DeepSeek 接口失败：{e}"
 
 
+_地图统计_KEYS = ("所属区域", "城市", "园区", "专业", "项目分级")
+
+
+@st.cache_data(show_spinner=False)
+def _compute_地图统计汇总(sub: pd.DataFrame) -> dict:
+    """按区域×城市×园区×专业×分级只扫描明细一次，各维度汇总都由这张小表再聚合得到。"""
+    keys = [c for c in _地图统计_KEYS if c in sub.columns]
+    base = sub.groupby(keys, dropna=False, observed=True).agg(
+        项目数=("序号", "count"),
+        金额合计=("拟定金额", "sum"),
+    ).reset_index()
+    stats = {"base": base}
+    if "所属区域" in base.columns:
+        stats["by_region"] = base.groupby("所属区域", dropna=False, observed=True).agg(
+            项目数=("项目数", "sum"),
+            金额合计=("金额合计", "sum"),
+            园区数=("园区", "nunique"),
+        ).reset_index()
+        stats["region_park"] = base.groupby(["所属区域", "园区"], dropna=False, observed=True).agg(
+            项目数=("项目数", "sum"),
+            金额合计=("金额合计", "sum"),
+        ).reset_index()
+    return stats
+
+
+def _按维度汇总(base: pd.DataFrame, col: str, **agg) -> pd.DataFrame:
+    """在 _compute_地图统计汇总 的小表上按单一维度再聚合。"""
+    return base.groupby(col, dropna=False, observed=True).agg(**agg).reset_index()
+
+
 def render_地图与统计(df: pd.DataFrame, 园区选择: list):
     """地图与统计 Tab：中国地图 + 按专业/分级/园区/区域图表。"""
     df_with_location = _add_城市和区域列(df)
@@ -5415,15 +5946,13 @@ def render_地图与统计(df: pd.DataFrame, 园区选择: list):
     st.markdown("---")
     st.subheader("数据统计")
     st.markdown("### 📊 按区域统计分析")
+    map_stats = _compute_地图统计汇总(sub)
+    base = map_stats["base"]
     
     # 区域统计表格
     if "所属区域" in sub.columns:
         st.markdown("#### 各区域项目统计")
-        by_region = sub.groupby("所属区域", dropna=False).agg(
-            项目数=("序号", "count"),
-            金额合计=("拟定金额", "sum"),
-            园区数=("园区", "nunique"),
-        ).reset_index()
+        by_region = map_stats["by_region"]
         by_region = by_region[by_region["所属区域"] != "其他"].sort_values("项目数", ascending=False)
         by_region["金额合计"] = by_region["金额合计"].round(2)
         
@@ -5441,16 +5970,7 @@ def render_地图与统计(df: pd.DataFrame, 园区选择: list):
         
         # 区域下各园区明细
         st.markdown("#### 各区域下园区明细")
-        for region in by_region["所属区域"].unique():
-            region_df = sub[sub["所属区域"] == region]
-            parks_in_region = region_df.groupby("园区", dropna=False).agg(
-                项目数=("序号", "count"),
-                金额合计=("拟定金额", "sum"),
-            ).reset_index().sort_values("项目数", ascending=False)
-            parks_in_region["金额合计"] = parks_in_region["金额合计"].round(2)
-            
-            with st.expander(f"📌 {region}（{len(parks_in_region)}个园区，{int(parks_in_region['项目数'].sum())}个项目，{parks_in_region['金额合计'].sum():,.0f}万元）"):
-                st.dataframe(parks_in_region, use_container_width=True, hide_index=True)
+        _render_区域园区明细(map_stats["region_park"], by_region["所属区域"].unique(), key="map_region_detail")
         
         st.markdown("---")
     
@@ -5468,7 +5988,7 @@ def render_地图与统计(df: pd.DataFrame, 园区选择: list):
     c1, c2 = st.columns(2)
     with c1:
         st.markdown("**按专业 · 项目数**")
-        by_prof = sub.groupby("专业", dropna=False).agg(项目数=("序号", "count")).reset_index().sort_values("项目数", ascending=False)
+        by_prof = _按维度汇总(base, "专业", 项目数=("项目数", "sum")).sort_values("项目数", ascending=False)
         # 过滤掉"其它系统"分类
         by_prof = by_prof[~by_prof["专业"].isin(["其它系统", "其他系统"])]
         if not by_prof.empty:
@@ -5481,10 +6001,11 @@ def render_地图与统计(df: pd.DataFrame, 园区选择: list):
             st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
     with c2:
         st.markdown("**按项目分级 · 金额占比**")
-        by_level = sub.groupby("项目分级", dropna=False).agg(
-            项目数=("序号", "count"),
-            金额合计=("拟定金额", "sum")
-        ).reset_index().sort_values("金额合计", ascending=False)
+        by_level = _按维度汇总(
+            base, "项目分级",
+            项目数=("项目数", "sum"),
+            金额合计=("金额合计", "sum"),
+        ).sort_values("金额合计", ascending=False)
         if not by_level.empty:
             colors = (CHART_COLORS_PIE * (1 + len(by_level) // len(CHART_COLORS_PIE)))[: len(by_level)]
             fig = px.pie(
@@ -5509,7 +6030,7 @@ def render_地图与统计(df: pd.DataFrame, 园区选择: list):
     c3, c4 = st.columns(2)
     with c3:
         st.markdown("**按园区 · 金额（万元）**")
-        by_park = sub.groupby("园区", dropna=False).agg(金额合计=("拟定金额", "sum")).reset_index().sort_values("金额合计", ascending=False)
+        by_park = _按维度汇总(base, "园区", 金额合计=("金额合计", "sum")).sort_values("金额合计", ascending=False)
         if not by_park.empty:
             by_park["金额合计"] = by_park["金额合计"].round(2)
             fig = px.bar(
@@ -5521,7 +6042,7 @@ def render_地图与统计(df: pd.DataFrame, 园区选择: list):
             st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
     with c4:
         st.markdown("**按城市 · 金额（万元）**")
-        by_city = sub.groupby("城市", dropna=False).agg(金额合计=("拟定金额", "sum")).reset_index()
+        by_city = _按维度汇总(base, "城市", 金额合计=("金额合计", "sum"))
         by_city = by_city[by_city["城市"] != "其他"].sort_values("金额合计", ascending=False)
         if not by_city.empty:
             by_city["金额合计"] = by_city["金额合计"].round(2)
@@ -5534,7 +6055,7 @@ def render_地图与统计(df: pd.DataFrame, 园区选择: list):
             st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
     st.markdown("**按专业 · 金额合计（万元）**")
-    by_prof_m = sub.groupby("专业", dropna=False).agg(金额=("拟定金额", "sum")).reset_index().sort_values("金额", ascending=False)
+    by_prof_m = _按维度汇总(base, "专业", 金额=("金额合计", "sum")).sort_values("金额", ascending=False)
     # 过滤掉"其它系统"分类
     by_prof_m = by_prof_m[~by_prof_m["专业"].isin(["其它系统", "其他系统"])]
     if not by_prof_m.empty:
@@ -1,8 +1,19 @@
 # -*- coding: utf-8 -*-
 """养老社区改良改造进度表 CSV/XLSX 解析与多园区数据加载。"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 
+try:
+    from pyarrow import ArrowInvalid
+    PYARROW_AVAILABLE = True
+    # pyarrow 解析失败时回退 C 引擎，其它异常照常抛出
+    _PYARROW_PARSE_ERRORS = (ArrowInvalid, pd.errors.ParserError)
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # 表头第二行（时间节点列名）
 TIMELINE_COLS = [
     "需求立项", "需求审核", "规划设计方案", "成本核算", "项目决策",
@@ -16,6 +27,17 @@ PARK_TOKENS = ["燕园", "蜀园", "吴园", "粤园", "申园", "楚园", "鹭
                "赣园", "苏园", "甬园", "豫园", "渝园", "徽园", "鹏园", "瓯园", "福园", "儒园", "津园", "滇园"]
 
 
+def _read_csv_fast(path, **kwargs) -> pd.DataFrame:
+    """优先用 pyarrow 引擎解析（多线程，快数倍）；未安装或遇到不规则行时回退默认 C 引擎。
+    pyarrow 会把日期字符串推断成 date 对象，调用方须传 dtype=str，保证两种引擎列类型一致。"""
+    if PYARROW_AVAILABLE:
+        try:
+            return pd.read_csv(path, engine="pyarrow", **kwargs)
+        except _PYARROW_PARSE_ERRORS:
+            pass
+    return pd.read_csv(path, **kwargs)
+
+
 def _read_first_two_lines(path: str):
     """读取前两行，优先 utf-8-sig，失败则尝试 gbk。"""
     for enc in ("utf-8-sig", "utf-8", "gbk", "gb2312"):
@@ -201,9 +223,9 @@ def _load_flat_progress_csv(path: Path) -> pd.DataFrame:
             "项目分级", "项目分类", "拟定承建组织", "总部重点关注项目",
             "专业", "专业分包", "项目名称", "备注说明", "拟定金额",
         ]
-        df = pd.read_csv(
+        df = _read_csv_fast(
             path, header=None, skiprows=2, encoding=encoding,
-            low_memory=False, dtype=str, keep_default_na=False,
+            dtype=str, keep_default_na=False,
         )
         # 只保留前 14 列，按位置赋列名，不依赖 CSV 列数
         n = min(14, df.shape[1])
@@ -322,6 +344,7 @@ def load_single_csv(path: str, 园区名: str = None) -> pd.DataFrame:
     # 列名去 BOM、首尾空格，便于匹配「序号」
     names = [str(x).strip().strip("\ufeff") for x in names]
     # 列数对齐：CSV 可能有多余逗号
+    # 此处依赖 C 引擎的类型推断（数值列为数值、日期列保持字符串），不走 pyarrow
     df = pd.read_csv(path, header=None, skiprows=2, encoding=encoding)
     if df.shape[1] > len(names):
         df = df.iloc[:, : len(names)]
@@ -406,18 +429,56 @@ def load_uploaded(path: str, filename: str = "", 园区名: str = None) -> pd.Da
     raise ValueError(f"不支持的文件格式：{suffix}，请上传 .csv 或 .xlsx")
 
 
+# 目录加载的单文件缓存：路径 -> (mtime_ns, 文件大小, DataFrame)，文件被修改后仅该文件重新解析；解析失败不缓存
+_DIR_FILE_CACHE: dict = {}
+# 多个 Streamlit 会话线程共用该缓存，读写均需持锁
+_DIR_FILE_CACHE_LOCK = threading.Lock()
+
+
+def _load_csv_or_none(path: Path):
+    """线程池任务：解析失败返回 None，与原先逐个 try/continue 的行为一致。"""
+    try:
+        return load_single_csv(str(path))
+    except Exception:
+        return None
+
+
 def load_from_directory(dir_path: str, pattern: str = "*.csv") -> pd.DataFrame:
-    """从目录加载所有匹配的 CSV，合并为多园区一张表。"""
+    """从目录加载所有匹配的 CSV，合并为多园区一张表（多文件并行解析，未改动的文件复用上次结果）。"""
     dir_path = Path(dir_path)
     if not dir_path.is_dir():
         return pd.DataFrame()
-    frames = []
-    for f in dir_path.glob(pattern):
+    fingerprints = {}
+    for f in sorted(dir_path.glob(pattern)):
         try:
-            df = load_single_csv(str(f))
-            frames.append(df)
-        except Exception:
+            stat = f.stat()
+        except OSError:
             continue
+        fingerprints[str(f)] = (stat.st_mtime_ns, stat.st_size)
+    frames = {}
+    with _DIR_FILE_CACHE_LOCK:
+        # 本目录中已删除或改名的文件移出缓存，避免旧 DataFrame 常驻内存
+        stale = [p for p in _DIR_FILE_CACHE
+                 if p not in fingerprints and Path(p).parent == dir_path and Path(p).match(pattern)]
+        for p in stale:
+            del _DIR_FILE_CACHE[p]
+        for p, fp in fingerprints.items():
+            hit = _DIR_FILE_CACHE.get(p)
+            if hit is not None and hit[:2] == fp:
+                frames[p] = hit[2]
+    todo = [p for p in fingerprints if p not in frames]
+    if todo:
+        # 解析在锁外进行；pandas C 解析器会释放 GIL，文件级并行用线程即可
+        workers = min(8, os.cpu_count() or 1, len(todo))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            parsed = list(zip(todo, executor.map(_load_csv_or_none, map(Path, todo))))
+        with _DIR_FILE_CACHE_LOCK:
+            for p, df in parsed:
+                frames[p] = df
+                if df is not None:
+                    _DIR_FILE_CACHE[p] = fingerprints[p] + (df,)
+    frames = [frames[p] for p in fingerprints]
+    frames = [df for df in frames if df is not None]
     if not frames:
         return pd.DataFrame()
     return pd.concat(frames, ignore_index=True)
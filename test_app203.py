@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""app203 数据处理回归测试（需安装 streamlit 等应用依赖）"""
+import math
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+app203 = pytest.importorskip("app203")
+
+
+def test_canonicalize_df_keeps_duplicate_known_columns():
+    # 多个「验收(社区…)」表头会统一重命名为「验收」，重复列名不应导致规范化失败
+    df = pd.DataFrame(
+        [[1, "燕园", "外墙油漆", 12.5, "2024-05-01", "2024-06-01"]],
+        columns=["序号", "园区", "项目名称", "拟定金额", "验收", "验收"],
+    )
+    out = app203._canonicalize_df(df)
+    assert list(out.columns[:4]) == ["序号", "园区", "项目名称", "拟定金额"]
+    assert "验收" in out.columns
+    assert len(out) == 1
+
+
+# 期望值取自 Node.js 中 parseFloat(s) 的结果
+@pytest.mark.parametrize("text, expected", [
+    ("+1.5", 1.5), (".5", 0.5), ("-.5e3", -500.0), ("1e3", 1000.0), ("1E-2", 0.01),
+    ("1e", 1.0), ("1.e2", 100.0), ("5.", 5.0), ("12元", 12.0), ("1,000", 1.0), ("0x10", 0.0),
+    ("Infinity", math.inf), ("+Infinity", math.inf), ("-Infinity", -math.inf), ("1e400", math.inf),
+    ("  3.7 ", 3.7), ("\t\n42", 42.0), ("\u30007", 7.0), ("\ufeff8", 8.0),
+    ("9007199254740993", 9007199254740992.0), ("12345678901234567890", 12345678901234567000.0),
+])
+def test_js_parse_float_matches_js(text, expected):
+    values, is_str = app203._js_parse_float([text])
+    assert values[0] == expected
+    assert is_str[0]
+
+
+@pytest.mark.parametrize("text", ["", " ", "inf", "nan", "-", ".", "+.e1", "abc", "１２"])
+def test_js_parse_float_nan_like_js(text):
+    values, _ = app203._js_parse_float([text])
+    assert np.isnan(values[0])
+
+
+def test_js_parse_float_negative_zero_and_non_strings():
+    values, is_str = app203._js_parse_float(["-0", 3, 2.5, None])
+    assert values[0] == 0 and np.signbit(values[0])
+    assert values[1:3].tolist() == [3.0, 2.5]
+    assert np.isnan(values[3])
+    assert is_str.tolist() == [True, False, False, False]
+
+
+# 期望值取自 Node.js 中 v ? String(v) : "" 的结果
+@pytest.mark.parametrize("value, expected", [
+    (1, "1"), (3.0, "3"), (1.5, "1.5"), (-2.25, "-2.25"), (0.1, "0.1"),
+    (1e20, "100000000000000000000"), (1e21, "1e+21"), (1.5e21, "1.5e+21"),
+    (12345678901234567890, "12345678901234567000"), (9007199254740993, "9007199254740992"),
+    (1e-6, "0.000001"), (1e-7, "1e-7"), (1.5e-7, "1.5e-7"), (123e-20, "1.23e-18"),
+    (-0.000001234, "-0.000001234"), (math.inf, "Infinity"), (-math.inf, "-Infinity"),
+    ("电气", "电气"), (True, "true"),
+    (None, ""), ("", ""), (0, ""), (-0.0, ""), (math.nan, ""), (False, ""),
+])
+def test_js_key_matches_js_string(value, expected):
+    assert app203._js_key(value) == expected
+
+
+def _parse_float_ref(v):
+    """测试用的逐值 parseFloat（仅覆盖下方样例用到的写法）。"""
+    m = re.match(r"\s*([+-]?(?:\d+\.?\d*|\.\d+))", str(v)) if v is not None else None
+    return float(m.group(1)) if m else math.nan
+
+
+def _park_agg_reference(cols: dict) -> dict:
+    """按原页面逐行统计口径计算各园区汇总，作为预聚合结果的对照。"""
+    out = {}
+    for i, seq in enumerate(cols["序号"]):
+        if not seq or math.isnan(_parse_float_ref(seq)):
+            continue
+        park = cols["园区"][i] or ""
+        amount = _parse_float_ref(cols["拟定金额"][i])
+        amount = 0.0 if math.isnan(amount) else amount
+        level = str(cols["项目分级"][i] or "").strip()
+        level1 = "一级" in level or "1级" in level or _parse_float_ref(level) == 1
+        hq = str(cols["总部重点关注项目"][i] or "").strip()
+        agg = out.setdefault(park, {
+            "count": 0, "amount": 0.0, "level1": 0.0, "hq": 0.0, "major": 0.0, "majorCount": 0,
+            "first": i, "city": cols["城市"][i], "region": cols["所属区域"][i], "profs": {}, "levels": {},
+        })
+        agg["count"] += 1
+        agg["amount"] += amount
+        agg["level1"] += amount if level1 else 0.0
+        agg["hq"] += amount if hq in ("是", "yes", "Yes") else 0.0
+        if amount >= 200:
+            agg["major"] += amount
+            agg["majorCount"] += 1
+        prof = cols["专业"][i] or "未分类"
+        if prof not in ("其它系统", "其他系统"):
+            stats = agg["profs"].setdefault(prof, [0, 0.0, i])
+            stats[0] += 1
+            stats[1] += amount
+        stats = agg["levels"].setdefault(str(cols["项目分级"][i] or "") or "未分类", [0, 0.0, i])
+        stats[0] += 1
+        stats[1] += amount
+    return out
+
+
+def test_park_agg_matches_row_level_aggregation():
+    rng = np.random.default_rng(3)
+    n = 300
+    cols = {
+        "序号": [str(i) if i % 3 else i for i in range(1, n - 2)] + ["合计", None, 0],
+        "园区": rng.choice(["燕园", "蜀园", "", None, "申园"], n).tolist(),
+        "城市": rng.choice(["北京", "成都", None], n).tolist(),
+        "所属区域": rng.choice(["华北", "西南", None], n).tolist(),
+        "项目分级": rng.choice(["一级", "二级", "1级项目", "1", "", None], n).tolist(),
+        "总部重点关注项目": rng.choice(["是", " yes ", "否", None], n).tolist(),
+        "专业": rng.choice(["电气", "土建", "其它系统", "", None], n).tolist(),
+        "拟定金额": rng.choice(["12.5", "230", "88万", "", None, 560], n).tolist(),
+    }
+    got = app203._园区汇总_for_html({"columns": list(cols), "data": list(cols.values())})
+    want = _park_agg_reference(cols)
+    assert list(got) == list(want)
+    for park, agg in want.items():
+        for key in ("profs", "levels"):
+            assert list(got[park][key]) == list(agg[key])
+            for name, (count, amount, first) in agg[key].items():
+                assert got[park][key][name] == [count, pytest.approx(amount), first]
+        for key in ("count", "majorCount", "first", "city", "region"):
+            assert got[park][key] == agg[key]
+        for key in ("amount", "level1", "hq", "major"):
+            assert got[park][key] == pytest.approx(agg[key])
+
+
+def test_parse_timeline_dates_mixed_inputs():
+    s = pd.Series([
+        45000, "45000", 45000.7, "2024-05-01", "2024/5/1", " 2024-05-01 ", datetime(2024, 1, 2),
+        "1900-01-01", 2, 0, -14, 100001, "", None, "abc", "2999-01-01",
+    ], dtype=object)
+    got = app203._parse_timeline_dates(s)
+    want = [pd.Timestamp("2023-03-15")] * 3 + [pd.Timestamp("2024-05-01")] * 3 + [pd.Timestamp("2024-01-02")]
+    assert got.iloc[:7].tolist() == want
+    # 1900 年占位、Excel 序列号范围外、空值、无法解析及超出可表示范围的日期均为 NaT
+    assert got.iloc[7:].isna().all()
+    assert got.index.equals(s.index)
+
+
+def test_parse_timeline_dates_datetime_column_drops_1900():
+    s = pd.Series(pd.to_datetime(["1900-01-06", "2024-05-01", None]))
+    assert app203._parse_timeline_dates(s).tolist()[1] == pd.Timestamp("2024-05-01")
+    assert app203._parse_timeline_dates(s).iloc[[0, 2]].isna().all()
+
+
+_DATE_STRINGS = ["2024-05-01", "2024/5/3", "2024-05-01 08:30:00", "bad"]
+
+
+def test_parse_date_strings_without_ciso8601(monkeypatch):
+    monkeypatch.setattr(app203, "CISO8601_AVAILABLE", False)
+    got = app203._parse_date_strings(pd.Index(_DATE_STRINGS))
+    assert got[:3].tolist() == [
+        pd.Timestamp("2024-05-01"), pd.Timestamp("2024-05-03"), pd.Timestamp("2024-05-01 08:30"),
+    ]
+    assert pd.isna(got[3])
+
+
+def test_parse_date_strings_falls_back_per_value(monkeypatch):
+    # 快速路径解析失败的取值（非 ISO 写法、无效文本）逐个回退 pd.to_datetime，结果与整列慢速解析一致
+    class _IsoOnly:
+        @staticmethod
+        def parse_datetime(v):
+            return datetime.fromisoformat(v)
+
+    monkeypatch.setattr(app203, "ciso8601", _IsoOnly, raising=False)
+    monkeypatch.setattr(app203, "CISO8601_AVAILABLE", True)
+    fast = app203._parse_date_strings(pd.Index(_DATE_STRINGS))
+    monkeypatch.setattr(app203, "CISO8601_AVAILABLE", False)
+    slow = app203._parse_date_strings(pd.Index(_DATE_STRINGS))
+    assert fast.equals(slow)
+
+
+def test_parse_date_strings_with_ciso8601(monkeypatch):
+    pytest.importorskip("ciso8601")
+    fast = app203._parse_date_strings(pd.Index(_DATE_STRINGS))
+    monkeypatch.setattr(app203, "CISO8601_AVAILABLE", False)
+    assert fast.equals(app203._parse_date_strings(pd.Index(_DATE_STRINGS)))
+
+
+def test_年月字符串_nat_to_nan():
+    dates = pd.Series(pd.to_datetime(["2024-05-03", None, "2023-12-31", "2024-05-20"]), index=[3, 1, 2, 0])
+    got = app203._年月字符串(dates)
+    assert got.index.equals(dates.index)
+    assert got.iloc[[0, 2, 3]].tolist() == ["2024-05", "2023-12", "2024-05"]
+    assert pd.isna(got.iloc[1])
+
+
+@pytest.mark.parametrize("序号", [[1, 2, 3, 4, 5, 6], [1, 3, 2, 4, 6, 5]], ids=["monotonic", "unsorted"])
+def test_按园区向下填充_within_park_by_序号(序号):
+    df = pd.DataFrame({
+        "园区": ["燕园", "蜀园", "燕园", "蜀园", "燕园", "蜀园"],
+        "序号": 序号,
+        "立项": ["2024-01-01", "", None, "2024-02-01", "", None],
+    })
+    got = app203._按园区向下填充(df, "立项")
+    assert got.index.equals(df.index)
+    # 按序号排列后在各自园区内向下填充，不跨园区；园区内首个空值保持为空
+    order = df.sort_values(["园区", "序号"])
+    want = order["立项"].mask(order["立项"].eq("")).groupby(order["园区"]).ffill().reindex(df.index)
+    pd.testing.assert_series_equal(got, want, check_names=False)
+    assert pd.isna(got.iloc[1])
+
+
+def test_按园区向下填充_paths_agree():
+    rng = np.random.default_rng(5)
+    n = 200
+    df = pd.DataFrame({
+        "园区": rng.choice(["燕园", "蜀园", "申园"], n),
+        "序号": np.arange(1, n + 1),
+        "立项": rng.choice(["2024-01-01", "2024-03-05", "", None], n),
+    })
+    sorted_fill = app203._按园区向下填充(df, "立项")
+    shuffled = df.sample(frac=1, random_state=0)
+    pd.testing.assert_series_equal(app203._按园区向下填充(shuffled, "立项").reindex(df.index), sorted_fill)
+
+
+def test_sum_by_park_codes_matches_groupby():
+    parks = pd.Series(["燕园", "蜀园", None, "燕园", "申园", "蜀园", "燕园"])
+    impl = np.array([True, False, True, False, True, True, True])
+    amount = np.array([10.0, 20.5, 99.0, 3.25, 0.0, 4.0, 1.0])
+    got = app203._sum_by_park_codes(parks, impl, amount)
+    frame = pd.DataFrame({"园区": parks, "impl": impl, "amt": amount}).dropna(subset=["园区"])
+    g = frame.groupby("园区")
+    assert got["园区"].tolist() == sorted(g.groups)
+    assert got["总项目数"].tolist() == g.size().tolist()
+    assert got["已实施数"].tolist() == g["impl"].sum().tolist()
+    assert got["未实施数"].tolist() == (g.size() - g["impl"].sum()).tolist()
+    assert got["总金额"].tolist() == g["amt"].sum().round(2).tolist()
+    assert got["已实施金额"].tolist() == g.apply(lambda x: x.loc[x["impl"], "amt"].sum()).round(2).tolist()
+    assert got["实施率"].tolist() == (g["impl"].mean() * 100).round(1).tolist()
+
+
+def test_sum_by_park_codes_without_parks():
+    got = app203._sum_by_park_codes(pd.Series([None, None]), np.array([True, False]), np.array([1.0, 2.0]))
+    assert got.empty
+    assert list(got.columns) == ["园区", "总项目数", "已实施数", "未实施数", "总金额", "已实施金额", "实施率"]